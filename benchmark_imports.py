@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+def measure(module: str) -> dict[str, tuple[int, int]]:
+    """
+    Imports a module in a fresh interpreter with `-X importtime`.
+
+    Returns:
+        dict: {module: (self_us, cumulative_us)} for every module imported.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr}")
+
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure the cold import time of the application packages."
+    )
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        default=["utils", "components", "main_window"],
+        help="modules to import, each in a fresh interpreter",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="runs per module, the median is kept"
+    )
+    parser.add_argument(
+        "-t", "--top", type=int, default=10, help="heaviest dependencies listed per module"
+    )
+    parser.add_argument(
+        "-o", "--output", default=None, help="write the results as json, to track over time"
+    )
+    parser.add_argument(
+        "-b",
+        "--budget",
+        type=float,
+        default=None,
+        help="fail when a module takes longer than this many milliseconds",
+    )
+    args = parser.parse_args(argv)
+
+    results = {}
+    over_budget = []
+    for module in args.modules:
+        runs = [measure(module) for _ in range(args.repeat)]
+        runs.sort(key=lambda timings: timings[module][1])
+        timings = runs[len(runs) // 2]  # median run
+        total_ms = timings[module][1] / 1000
+
+        heaviest = sorted(
+            ((name, t[0] / 1000) for name, t in timings.items()),
+            key=lambda item: item[1],
+            reverse=True,
+        )[: args.top]
+
+        print(f"{module}: {total_ms:.1f} ms ({len(timings)} modules)")
+        for name, self_ms in heaviest:
+            print(f"    {self_ms:8.1f} ms  {name}")
+
+        results[module] = {
+            "total_ms": total_ms,
+            "modules": len(timings),
+            "heaviest": dict(heaviest),
+        }
+        if args.budget is not None and total_ms > args.budget:
+            over_budget.append(module)
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if len(over_budget) > 0:
+        print(f"Over the {args.budget:.0f} ms budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
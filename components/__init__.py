@@ -1,2 +1,24 @@
-from .gl_view_widget import VBaseGLViewWidget
-from .gl_mesh_item import *
\ No newline at end of file
+import importlib
+
+# every component pulls in pyqtgraph, import them on first access
+_LAZY_ATTRIBUTES = {
+    "VBaseGLViewWidget": "gl_view_widget",
+    "VMeshItem": "gl_mesh_item",
+    "VDepthLabelItem": "gl_label_item",
+    "VTimelineStrip": "timeline_strip",
+    "VProbePlot": "probe_plot",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name, None)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # resolved once, later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,238 @@
+import numpy as np
+from pyqtgraph.opengl import GLGraphicsItem
+from PySide6 import QtCore, QtGui
+
+
+class VDepthLabelItem(GLGraphicsItem.GLGraphicsItem):
+    """
+    Draws a batch of text labels in a single pass.
+
+    All labels are rasterized once into a texture atlas. When the camera
+    moves, the label anchors are projected in one vectorized step, labels
+    overlapping on screen are culled and the survivors are blitted from the
+    atlas into an overlay. Repaints with an unchanged camera only draw the
+    overlay.
+    """
+
+    ATLAS_WIDTH = 1024
+
+    def __init__(self, parentItem=None, **kwargs) -> None:
+        super().__init__(parentItem=parentItem)
+        self.setGLOptions(kwargs.pop("glOptions", "additive"))
+
+        self.__positions = np.zeros((0, 3), dtype=float)
+        self.__labels: list[str] = []
+        self.__color = QtGui.QColor("#FFFFFF")
+        self.__font = QtGui.QFont("Helvetica", 10)
+        self.__cullOverlaps = True
+        self.__padding = 2
+
+        self.__atlas: QtGui.QImage | None = None
+        self.__rects = np.zeros((0, 4), dtype=float)  # x, y, w, h in the atlas
+
+        # labels kept for the last camera, drawn into one view-sized image
+        self.__overlayKey = None
+        self.__overlay: QtGui.QImage | None = None
+
+        self.setData(**kwargs)
+
+    # region setters
+    def setData(self, **kwargs) -> None:
+        """
+        positions   (N, 3) array of label anchors
+        labels      list of N strings
+        color       QColor or color string
+        font        QFont
+        """
+        if "positions" in kwargs:
+            self.__positions = np.asarray(kwargs["positions"], dtype=float)
+        if "labels" in kwargs:
+            self.__labels = [str(label) for label in kwargs["labels"]]
+        if "color" in kwargs:
+            self.__color = QtGui.QColor(kwargs["color"])
+        if "font" in kwargs:
+            self.__font = kwargs["font"]
+
+        if self.__positions.ndim != 2 or self.__positions.shape[1] != 3:
+            raise ValueError("positions must be of shape (N, 3)")
+        if len(self.__labels) != self.__positions.shape[0]:
+            raise ValueError("labels and positions must have the same length")
+
+        self.__buildAtlas()
+        self.__overlayKey = None
+        self.update()
+
+    def setCullOverlaps(self, value: bool) -> None:
+        self.__cullOverlaps = value
+        self.__overlayKey = None
+        self.update()
+
+    # endregion
+
+    # region getters
+    def labels(self) -> list[str]:
+        return self.__labels
+
+    def positions(self) -> np.ndarray:
+        return self.__positions
+
+    def cullOverlaps(self) -> bool:
+        return self.__cullOverlaps
+
+    # endregion
+
+    # region workers
+    def __buildAtlas(self) -> None:
+        "rasterize every label into one image using shelf packing"
+        n = len(self.__labels)
+        self.__rects = np.zeros((n, 4), dtype=float)
+        if n == 0:
+            self.__atlas = None
+            return
+
+        metrics = QtGui.QFontMetrics(self.__font)
+        height = metrics.height()
+        x, y = 0, 0
+        for i, label in enumerate(self.__labels):
+            width = metrics.horizontalAdvance(label) + self.__padding
+            if x + width > self.ATLAS_WIDTH and x > 0:
+                x, y = 0, y + height
+            self.__rects[i] = (x, y, width, height)
+            x += width
+
+        image = QtGui.QImage(
+            self.ATLAS_WIDTH,
+            int(y + height),
+            QtGui.QImage.Format.Format_ARGB32_Premultiplied,
+        )
+        image.fill(QtCore.Qt.GlobalColor.transparent)
+
+        painter = QtGui.QPainter(image)
+        painter.setPen(self.__color)
+        painter.setFont(self.__font)
+        painter.setRenderHints(
+            QtGui.QPainter.RenderHint.Antialiasing
+            | QtGui.QPainter.RenderHint.TextAntialiasing
+        )
+        for i, label in enumerate(self.__labels):
+            x, y, _, _ = self.__rects[i]
+            painter.drawText(QtCore.QPointF(x, y + metrics.ascent()), label)
+        painter.end()
+
+        self.__atlas = image
+
+    def __projection(self) -> tuple[QtCore.QRectF, np.ndarray]:
+        "the widget rect and the matrix from item to widget coordinates"
+        rect = QtCore.QRectF(self.view().rect())
+        ndc_to_viewport = QtGui.QMatrix4x4()
+        ndc_to_viewport.viewport(
+            rect.left(), rect.bottom(), rect.width(), -rect.height()
+        )
+        project = ndc_to_viewport * self.mvpMatrix()
+        return rect, np.array(project.copyDataTo(), dtype=float).reshape(4, 4)
+
+    def __project(
+        self, rect: QtCore.QRectF, m: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        "project all anchors to widget coordinates, returns (xy, visible)"
+        n = self.__positions.shape[0]
+        hom = np.ones((n, 4), dtype=float)
+        hom[:, :3] = self.__positions
+        clip = hom @ m.T
+
+        w = clip[:, 3]
+        visible = w > 1e-9
+        xy = np.zeros((n, 2), dtype=float)
+        xy[visible] = clip[visible, :2] / w[visible, np.newaxis]
+
+        # labels are anchored bottom-left, like GLTextItem
+        xy[:, 1] -= self.__rects[:, 3]
+        visible &= (xy[:, 0] + self.__rects[:, 2] >= rect.left()) & (
+            xy[:, 0] <= rect.right()
+        )
+        visible &= (xy[:, 1] + self.__rects[:, 3] >= rect.top()) & (
+            xy[:, 1] <= rect.bottom()
+        )
+        return xy, visible
+
+    def __cull(self, xy: np.ndarray, candidates: np.ndarray) -> list[int]:
+        "greedily keep labels that do not overlap an already kept label"
+        if not self.__cullOverlaps:
+            return list(candidates)
+
+        cell_w = max(float(self.__rects[:, 2].max()), 1.0)
+        cell_h = max(float(self.__rects[:, 3].max()), 1.0)
+        grid: dict[tuple[int, int], list[int]] = {}
+        kept = []
+        for i in candidates:
+            x, y = xy[i]
+            w, h = self.__rects[i, 2:]
+            cx, cy = int(x // cell_w), int(y // cell_h)
+            overlaps = False
+            for gx in (cx - 1, cx, cx + 1):
+                for gy in (cy - 1, cy, cy + 1):
+                    for j in grid.get((gx, gy), ()):
+                        ox, oy = xy[j]
+                        ow, oh = self.__rects[j, 2:]
+                        if x < ox + ow and ox < x + w and y < oy + oh and oy < y + h:
+                            overlaps = True
+                            break
+                    if overlaps:
+                        break
+                if overlaps:
+                    break
+
+            if not overlaps:
+                grid.setdefault((cx, cy), []).append(i)
+                kept.append(i)
+        return kept
+
+    def __buildOverlay(self, rect: QtCore.QRectF, m: np.ndarray) -> QtGui.QImage | None:
+        "draw the labels kept for a camera into a view-sized image"
+        xy, visible = self.__project(rect, m)
+        kept = self.__cull(xy, np.flatnonzero(visible))
+        if len(kept) == 0:
+            return None
+
+        ratio = self.view().devicePixelRatioF()
+        image = QtGui.QImage(
+            max(1, int(np.ceil(rect.width() * ratio))),
+            max(1, int(np.ceil(rect.height() * ratio))),
+            QtGui.QImage.Format.Format_ARGB32_Premultiplied,
+        )
+        image.setDevicePixelRatio(ratio)
+        image.fill(QtCore.Qt.GlobalColor.transparent)
+
+        painter = QtGui.QPainter(image)
+        for i in kept:
+            x, y, w, h = self.__rects[i]
+            painter.drawImage(
+                QtCore.QRectF(xy[i, 0] - rect.left(), xy[i, 1] - rect.top(), w, h),
+                self.__atlas,
+                QtCore.QRectF(x, y, w, h),
+            )
+        painter.end()
+        return image
+
+    # endregion
+
+    # region override
+    def paint(self) -> None:
+        if self.__atlas is None:
+            return
+        self.setupGLState()
+
+        # culling only changes with the camera, the viewport or the screen
+        rect, m = self.__projection()
+        key = (m.tobytes(), self.view().devicePixelRatioF())
+        if key != self.__overlayKey:
+            self.__overlay = self.__buildOverlay(rect, m)
+            self.__overlayKey = key
+        if self.__overlay is None:
+            return
+
+        painter = QtGui.QPainter(self.view())
+        painter.drawImage(rect.topLeft(), self.__overlay)
+        painter.end()
+
+    # endregion
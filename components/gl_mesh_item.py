@@ -1,10 +1,27 @@
+import numpy as np
 import pyqtgraph.opengl as gl
+from pyqtgraph.opengl.items.GLMeshItem import DirtyFlag
 from PySide6.QtGui import QColor
 
 
 class VMeshItem(gl.GLMeshItem):
+    """
+    GLMeshItem that takes precomputed smooth shading normals.
+
+    Extra options:
+        normals (np.ndarray): (V, 3) normals used instead of computing them
+            from the faces of every new MeshData.
+        staticGeometry (bool): when the vertex and face arrays of a new
+            MeshData are the ones already uploaded, only the colors are
+            uploaded again. Default False.
+    """
+
     def __init__(self, *args, **kwargs) -> None:
+        self.__uploaded: tuple | None = None
+        self.__edges: tuple | None = None
         super().__init__(*args, **kwargs)
+        self.opts.setdefault("normals", None)
+        self.opts.setdefault("staticGeometry", False)
 
     def setEdgeColor(self, color: QColor | tuple[float, float, float, float]) -> None:
         c = color
@@ -12,3 +29,59 @@ class VMeshItem(gl.GLMeshItem):
             c = color.getRgbF()
         self.opts.update({"edgeColor": c})
         self.update()
+
+    def geometryChanged(self):
+        "the vertex arrays were modified in place, upload them again"
+        self.__uploaded = None
+        self.__edges = None
+        self.meshDataChanged()
+
+    def __isUploaded(self, geometry: tuple) -> bool:
+        if self.__uploaded is None:
+            return False
+        return all(a is b for a, b in zip(geometry, self.__uploaded))
+
+    def parseMeshData(self) -> DirtyFlag:
+        if self.vertexes is not None:
+            return DirtyFlag(0)  # already parsed
+
+        md: gl.MeshData = self.opts["meshdata"]
+        normals: np.ndarray = self.opts.get("normals", None)
+        if (
+            md is None
+            or normals is None
+            or not self.opts["smooth"]
+            or md.hasFaceIndexedData()
+        ):
+            self.__uploaded = None
+            self.__edges = None
+            return super().parseMeshData()
+
+        dirty_bits = DirtyFlag(0)
+        self.vertexes = md.vertexes()
+        self.faces = md.faces()
+        self.normals = normals if self.opts["computeNormals"] else None
+
+        # identical arrays are already on the GPU, they are held so ids stay unique
+        geometry = (self.vertexes, self.faces, self.normals)
+        if not self.opts["staticGeometry"] or not self.__isUploaded(geometry):
+            dirty_bits |= DirtyFlag.POSITION | DirtyFlag.NORMAL | DirtyFlag.FACES
+            self.__uploaded = geometry
+
+        if md.hasVertexColor():
+            self.colors = md.vertexColors()
+            dirty_bits |= DirtyFlag.COLOR
+        elif md.hasFaceColor():
+            self.colors = md.faceColors()
+            dirty_bits |= DirtyFlag.COLOR
+
+        if self.opts["drawEdges"]:
+            if self.__edges is None or not (
+                self.__edges[0] is self.vertexes and self.__edges[1] is self.faces
+            ):
+                self.__edges = (self.vertexes, self.faces, md.edges().astype(np.uint32))
+                dirty_bits |= DirtyFlag.EDGE_VERTS | DirtyFlag.EDGES
+            self.edges = self.__edges[2]
+            self.edgeVerts = self.vertexes
+
+        return dirty_bits
@@ -1,26 +1,143 @@
+import numpy as np
 import pyqtgraph.opengl as gl
+from OpenGL import GL
 from pyqtgraph import Vector
-from PySide6.QtCore import Qt
-from utils import appColors
+from PySide6.QtCore import Qt, QSize, QThread, QTimer, QElapsedTimer, Signal
+from PySide6.QtGui import QVector3D
+from PySide6.QtOpenGL import QOpenGLFramebufferObject
+from PySide6.QtWidgets import QToolTip
+from utils import appColors, trace_span
 
 
 class VBaseGLViewWidget(gl.GLViewWidget):
+    """
+    GL view that renders on demand.
+
+    Every repaint request (camera changes, item updates) only marks the view
+    dirty. At most one repaint is scheduled per display refresh, and the next
+    one is not scheduled before the previous frame has been swapped. Camera
+    pans are accumulated and applied once per frame.
+
+    With picking enabled, hovering an item registered with `setPickTargets`
+    casts a ray against its `PickIndex` and shows the readout in a tooltip,
+    a click without a drag selects the picked cell.
+    """
+
+    onFrameStats = Signal(dict)
+    onUpdateRequested = Signal()
+    onPicked = Signal(dict)
+    onPickSelected = Signal(dict)
+
+    # False until the pacing state exists, the base constructor repaints
+    __pacing = False
+
     def __init__(self):
         super().__init__()
         self.__panSensitivity = 10
         self.__pan_active = True
         self.last_pos = None
+
+        # frame pacing
+        self.__idle = False
+        self.__dirty = False
+        self.__awaitingSwap = False
+        self.__presenting = False
+        self.__pendingPan = [0.0, 0.0, 0.0]
+        self.__clock = QElapsedTimer()
+        self.__clock.start()
+        self.__lastPresentNs = 0
+        self.__lastSwapNs = None
+        self.__frameTimer = QTimer(self)
+        self.__frameTimer.setSingleShot(True)
+        self.__frameTimer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.__frameTimer.timeout.connect(self.__presentFrame)
+        self.frameSwapped.connect(self.__onFrameSwapped)
+        self.onUpdateRequested.connect(
+            self.update, Qt.ConnectionType.QueuedConnection
+        )
+
+        # frame statistics
+        self.__frameStats = {"fps": 0.0, "frame_time_ms": 0.0, "paint_ms": 0.0}
+        self.__statsWindowNs = 0
+        self.__statsFrames = 0
+        self.__statsFrameTimeNs = 0
+        self.__statsPaintNs = 0
+        self.__pacing = True
+
+        # offscreen target of renderFrame, kept between frames of an export
+        self.__fbo: QOpenGLFramebufferObject | None = None
+
+        # picking
+        self.__pickingEnabled = False
+        self.__pickTargets: list[dict] = []
+        self.__pressPos = None
+
         self.setBackgroundColor(appColors.dark_rbg)
 
     # region setters
     def setPanSensitivity(self, value: int):
         self.__panSensitivity = value
 
+    def setPickingEnabled(self, value: bool):
+        "pick the hovered item while the mouse moves without a button pressed"
+        self.__pickingEnabled = value
+        self.setMouseTracking(value)
+        if not value:
+            QToolTip.hideText()
+
+    def setPickTargets(self, targets: list[dict]):
+        """
+        Items that can be picked, each a dict with:
+            item (GLGraphicsItem): the item hovered.
+            index (PickIndex): built from the geometry of the item.
+            readout (callable): pixel (k, j) -> dict of label: text.
+        Picks hand the whole dict back as `target`, extra keys included.
+        """
+        self.__pickTargets = list(targets)
+
+    def setIdle(self, value: bool):
+        "while idle, repaint requests are only recorded and nothing is drawn"
+        self.__idle = value
+        if value:
+            self.__frameTimer.stop()
+        elif self.__dirty:
+            self.__scheduleFrame()
+
     # endregion
     # region getters
     def panSensitivity(self):
         return self.__panSensitivity
 
+    def isIdle(self) -> bool:
+        return self.__idle
+
+    def isPickingEnabled(self) -> bool:
+        return self.__pickingEnabled
+
+    def isFramePending(self) -> bool:
+        "True while a repaint is scheduled or has not been presented yet"
+        if self.__awaitingSwap and self.__swapOverdue():
+            self.__awaitingSwap = False
+            # the swap that would have rescheduled the dirty frame never came
+            if self.__dirty and not self.__idle:
+                self.__scheduleFrame()
+        return self.__dirty or self.__awaitingSwap or self.__frameTimer.isActive()
+
+    def refreshInterval(self) -> int:
+        "display refresh interval in milliseconds"
+        screen = self.screen()
+        rate = screen.refreshRate() if screen is not None else 60.0
+        if rate <= 0:
+            rate = 60.0
+        return max(1, int(round(1000.0 / rate)))
+
+    def frameStats(self) -> dict:
+        """
+        fps, frame time (present to swap) and paint time over the last second
+        the view was drawing, pauses are left out
+        """
+        return dict(self.__frameStats)
+
     # endregion
 
     # region override
@@ -30,19 +147,36 @@ class VBaseGLViewWidget(gl.GLViewWidget):
         if event.button() == Qt.MouseButton.RightButton:
             self.__pan_active = True
             self.last_pos = event.pos()
+        elif event.button() == Qt.MouseButton.LeftButton:
+            self.__pressPos = event.position()
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.MouseButton.RightButton:
             self.__pan_active = False
+        elif event.button() == Qt.MouseButton.LeftButton and self.__pressPos is not None:
+            # a left drag orbits the camera, only a click selects
+            moved = (event.position() - self.__pressPos).manhattanLength()
+            self.__pressPos = None
+            if self.__pickingEnabled and moved < 4:
+                result = self.pick(event.position().x(), event.position().y())
+                if result is not None:
+                    self.onPickSelected.emit(result)
         super().mouseReleaseEvent(event)
 
     def mouseMoveEvent(self, event):
         if self.__pan_active and self.last_pos is not None:
             delta = event.pos() - self.last_pos
-            self.pan(delta.x(), delta.y(), 0, relative="view")
+            self.__panView(delta.x(), delta.y(), 0)
             self.last_pos = event.pos()
         super().mouseMoveEvent(event)
 
+        if self.__pickingEnabled and event.buttons() == Qt.MouseButton.NoButton:
+            self.__showPick(event)
+
+    def leaveEvent(self, event):
+        QToolTip.hideText()
+        super().leaveEvent(event)
+
     def keyPressEvent(self, event):
         # Check if the key event is a directional key (Up, Down, Left, or Right)
         if event.key() == Qt.Key.Key_Up:
@@ -54,15 +188,218 @@ class VBaseGLViewWidget(gl.GLViewWidget):
         elif event.key() == Qt.Key.Key_Right:
             self.__panView(-self.__panSensitivity, 0, 0)
 
+    def update(self, *args):
+        "coalesce repaint requests into at most one per display refresh"
+        if not self.__pacing:
+            return super().update(*args)
+
+        # items updated from worker threads, the timer lives on the GUI thread
+        if QThread.currentThread() != self.thread():
+            self.onUpdateRequested.emit()
+            return
+
+        self.__dirty = True
+        if not self.__idle and not self.__presenting:
+            self.__scheduleFrame()
+
+    def paintGL(self, *args, **kwargs):
+        start = self.__clock.nsecsElapsed()
+        with trace_span("paintGL", "gl"):
+            super().paintGL(*args, **kwargs)
+        self.__statsPaintNs += self.__clock.nsecsElapsed() - start
+
     # endregion
 
     # region items
     def __panView(self, dx, dy, dz):
-        self.pan(dx, dy, dz, "view")
+        "accumulate the pan, it is applied once when the frame is presented"
+        self.__pendingPan[0] += dx
+        self.__pendingPan[1] += dy
+        self.__pendingPan[2] += dz
+        self.update()
+
+    # endregion
+
+    # region frame pacing
+    def __scheduleFrame(self):
+        if self.__frameTimer.isActive():
+            return
+
+        if self.__awaitingSwap:
+            if not self.__swapOverdue():
+                return
+            self.__awaitingSwap = False
+
+        interval_ns = self.refreshInterval() * 1_000_000
+        now = self.__clock.nsecsElapsed()
+        last = self.__lastSwapNs if self.__lastSwapNs is not None else 0
+        delay_ms = max(0, (interval_ns - (now - last)) // 1_000_000)
+        self.__frameTimer.start(int(delay_ms))
+
+    def __swapOverdue(self) -> bool:
+        "a frame that never gets swapped (obscured widget) must not stall the view"
+        elapsed = self.__clock.nsecsElapsed() - self.__lastPresentNs
+        return elapsed > 4 * self.refreshInterval() * 1_000_000
+
+    def __presentFrame(self):
+        if self.__idle or not self.__dirty:
+            return
+
+        # suppress rescheduling while the pending camera changes are applied
+        self.__presenting = True
+        dx, dy, dz = self.__pendingPan
+        if dx != 0 or dy != 0 or dz != 0:
+            self.__pendingPan = [0.0, 0.0, 0.0]
+            self.pan(dx, dy, dz, "view")
+        self.__presenting = False
+
+        self.__dirty = False
+        self.__awaitingSwap = self.isVisible()
+        self.__lastPresentNs = self.__clock.nsecsElapsed()
+        super().update()
+
+    def __onFrameSwapped(self):
+        now = self.__clock.nsecsElapsed()
+        self.__awaitingSwap = False
+        last, self.__lastSwapNs = self.__lastSwapNs, now
+
+        if last is None or now - last > 4 * self.refreshInterval() * 1_000_000:
+            # the view was still, the pause is not frame time nor part of the window
+            self.__updateFrameStats(now if last is None else last)
+            self.__statsWindowNs = now
+        else:
+            self.__statsFrames += 1
+            # from the present, waiting for the next request is not frame time
+            self.__statsFrameTimeNs += now - max(self.__lastPresentNs, last)
+            if now - self.__statsWindowNs >= 1_000_000_000:
+                self.__updateFrameStats(now)
+
+        if self.__dirty and not self.__idle:
+            self.__scheduleFrame()
+
+    def __updateFrameStats(self, now: int):
+        frames = self.__statsFrames
+        if frames > 0:
+            self.__frameStats = {
+                "fps": frames * 1e9 / (now - self.__statsWindowNs),
+                "frame_time_ms": self.__statsFrameTimeNs / frames / 1e6,
+                "paint_ms": self.__statsPaintNs / frames / 1e6,
+            }
+            self.onFrameStats.emit(self.frameStats())
+
+        self.__statsWindowNs = now
+        self.__statsFrames = 0
+        self.__statsFrameTimeNs = 0
+        self.__statsPaintNs = 0
+
+    # endregion
+
+    # region picking
+    def pickRay(self, x: float, y: float) -> tuple[np.ndarray, np.ndarray]:
+        "world space (origin, direction) of the ray under a widget position"
+        viewport = (0, 0, self.width(), self.height())
+        mvp = self.projectionMatrix(viewport, viewport) * self.viewMatrix()
+        inverse, invertible = mvp.inverted()
+        if not invertible:
+            raise ValueError("The camera matrix is not invertible")
+
+        ndc_x = 2.0 * x / max(self.width(), 1) - 1.0
+        ndc_y = 1.0 - 2.0 * y / max(self.height(), 1)
+        near = inverse.map(QVector3D(ndc_x, ndc_y, -1.0))
+        far = inverse.map(QVector3D(ndc_x, ndc_y, 1.0))
+
+        origin = np.array(near.toTuple())
+        direction = np.array(far.toTuple()) - origin
+        return origin, direction / np.linalg.norm(direction)
+
+    def pick(self, x: float, y: float) -> dict | None:
+        """
+        Nearest pick target under a widget position.
+
+        Returns:
+            dict | None: target, item, distance, point (local to the item),
+            pixel (k, j) and the readout of the target, None on a miss.
+        """
+        if len(self.__pickTargets) == 0:
+            return None
+
+        origin, direction = self.pickRay(x, y)
+        nearest = None
+        for target in self.__pickTargets:
+            # the index lives in item coordinates, move the ray instead of the items
+            inverse, invertible = target["item"].viewTransform().inverted()
+            if not invertible:
+                continue
+            o = inverse.map(QVector3D(*origin))
+            d = inverse.mapVector(QVector3D(*direction))
+            hit = target["index"].intersect(o.toTuple(), d.toTuple())
+            if hit is None:
+                continue
+
+            # distances are compared in world units
+            world = target["item"].viewTransform().map(QVector3D(*hit["point"]))
+            distance = float(np.linalg.norm(np.array(world.toTuple()) - origin))
+            if nearest is None or distance < nearest["distance"]:
+                nearest = {**hit, "distance": distance, "target": target}
+
+        if nearest is None:
+            return None
+
+        target = nearest["target"]
+        nearest["item"] = target["item"]
+        nearest["readout"] = target["readout"](nearest["pixel"])
+        return nearest
+
+    def __showPick(self, event):
+        position = event.position()
+        result = self.pick(position.x(), position.y())
+        if result is None:
+            QToolTip.hideText()
+            return
+
+        readout = result["readout"]
+        text = "\n".join(f"{label}: {value}" for label, value in readout.items())
+        QToolTip.showText(event.globalPosition().toPoint(), text, self)
+        self.onPicked.emit(result)
 
     # endregion
 
     # region workers
+    def renderFrame(self, size: tuple[int, int] = None) -> np.ndarray:
+        """
+        Renders the scene into an offscreen framebuffer and reads it back.
+
+        Parameters:
+            size (tuple): (width, height) in pixels, defaults to the widget
+                size in device pixels.
+
+        Returns:
+            np.ndarray: (height, width, 3) uint8 RGB, top row first.
+        """
+        if size is None:
+            ratio = self.devicePixelRatioF()
+            size = (int(self.width() * ratio), int(self.height() * ratio))
+        w, h = size
+
+        self.makeCurrent()
+        if self.__fbo is None or self.__fbo.size() != QSize(w, h):
+            self.__fbo = QOpenGLFramebufferObject(
+                w, h, QOpenGLFramebufferObject.Attachment.CombinedDepthStencil
+            )
+
+        frame = np.empty((h, w, 3), dtype=np.uint8)
+        self.__fbo.bind()
+        try:
+            GL.glViewport(0, 0, w, h)
+            self.paint(region=(0, 0, w, h), viewport=(0, 0, w, h))
+            GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 1)
+            GL.glReadPixels(0, 0, w, h, GL.GL_RGB, GL.GL_UNSIGNED_BYTE, frame)
+        finally:
+            self.__fbo.release()
+
+        # GL rows start at the bottom
+        return frame[::-1]
+
     def rePositionView(self):
         self.reset()
         self.setCameraPosition(
@@ -0,0 +1,69 @@
+import numpy as np
+import pyqtgraph as pg
+from PySide6 import QtWidgets
+from utils import appColors, FLUIDS
+
+
+class VProbePlot(QtWidgets.QWidget):
+    """
+    Concentration-vs-time curves of one cell, one curve per fluid, with a
+    marker on the time of the presented frame.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.__time: np.ndarray | None = None
+        self.__curves: list[pg.PlotDataItem] = []
+
+        self.titleLabel = QtWidgets.QLabel("Click a cell to probe it")
+        self.plotWidget = pg.PlotWidget()
+        self.plotWidget.setBackground(appColors.dark_rbg)
+        self.plotWidget.setLabel("bottom", "Time", units="s")
+        self.plotWidget.setLabel("left", "Concentration")
+        self.plotWidget.setYRange(0, 1)
+        self.plotWidget.showGrid(x=True, y=True, alpha=0.2)
+        self.plotWidget.addLegend(offset=(-10, 10))
+
+        for fluid in FLUIDS.values():
+            curve = self.plotWidget.plot(
+                [], [], name=fluid["name"], pen=pg.mkPen(fluid["color"], width=2)
+            )
+            self.__curves.append(curve)
+
+        self.__marker = pg.InfiniteLine(
+            angle=90, movable=False, pen=pg.mkPen(appColors.light_rbg, width=1)
+        )
+        self.__marker.hide()
+        self.plotWidget.addItem(self.__marker)
+
+        layout = QtWidgets.QVBoxLayout()
+        layout.addWidget(self.titleLabel)
+        layout.addWidget(self.plotWidget)
+        layout.setContentsMargins(4, 4, 4, 4)
+        self.setLayout(layout)
+
+    # region setters
+    def setSeries(self, time: np.ndarray, concentrations: np.ndarray, title: str = ""):
+        """
+        Parameters:
+            time (np.ndarray): (T,) simulation time of each frame.
+            concentrations (np.ndarray): (fluid, T) history of the cell.
+            title (str): Where the cell is.
+        """
+        self.__time = np.asarray(time)
+        for i, curve in enumerate(self.__curves):
+            if i < concentrations.shape[0]:
+                curve.setData(self.__time, concentrations[i])
+            else:
+                curve.setData([], [])
+        self.titleLabel.setText(title)
+
+    def setFrameIndex(self, index: int | None):
+        "move the marker to the time of a frame"
+        if self.__time is None or index is None or index not in range(len(self.__time)):
+            self.__marker.hide()
+            return
+        self.__marker.setValue(float(self.__time[index]))
+        self.__marker.show()
+
+    # endregion
@@ -0,0 +1,121 @@
+import numpy as np
+from PySide6 import QtCore, QtGui, QtWidgets
+from utils import appColors, FLUIDS
+
+
+class VTimelineStrip(QtWidgets.QWidget):
+    """
+    Depth-vs-time strip of a whole run, drawn from the overview index.
+
+    Each column is one timestep averaged over the azimuth, so the whole run
+    is visible at once. The pyramid level closest to the widget width is
+    used, hovering shows the summary stats and clicking jumps to the frame.
+    """
+
+    onFrameSelected = QtCore.Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.__overview: dict | None = None
+        self.__image: QtGui.QImage | None = None
+        self.__level = -1
+        self.__frameIndex = 0
+
+        self.setFixedHeight(40)
+        self.setMouseTracking(True)
+        self.hide()
+
+    # region setters
+    def setOverview(self, overview: dict | None):
+        self.__overview = overview
+        self.__image = None
+        self.__level = -1
+        self.setVisible(overview is not None)
+        self.update()
+
+    def setFrameIndex(self, index: int):
+        self.__frameIndex = index
+        self.update()
+
+    # endregion
+
+    # region getters
+    def overview(self) -> dict | None:
+        return self.__overview
+
+    def frameCount(self) -> int:
+        if self.__overview is None:
+            return 0
+        return self.__overview["strips"][0].shape[1]
+
+    # endregion
+
+    # region workers
+    def __frameAt(self, x: float) -> int:
+        n = self.frameCount()
+        return int(np.clip(x / max(self.width(), 1) * n, 0, n - 1))
+
+    def __selectLevel(self):
+        "pick the coarsest level still at least as wide as the widget"
+        strips = self.__overview["strips"]
+        level = 0
+        for i, strip in enumerate(strips):
+            if strip.shape[1] >= self.width():
+                level = i
+        if level == self.__level:
+            return
+
+        strip = np.ascontiguousarray(strips[level])
+        rows, cols, _ = strip.shape
+        self.__image = QtGui.QImage(
+            strip.data, cols, rows, cols * 3, QtGui.QImage.Format.Format_RGB888
+        ).copy()
+        self.__level = level
+
+    def __summary(self, index: int) -> str:
+        o = self.__overview
+        fluids = list(FLUIDS.values())
+        lines = [f"frame {index + 1}/{self.frameCount()}  t = {o['time'][index]:.1f} s"]
+        for i in range(o["n_fluids"]):
+            front = o["front"][index, i]
+            reach = "-" if np.isnan(front) else f"{front:.1f} m"
+            lines.append(
+                f"{fluids[i]['name']}: {100 * o['fractions'][index, i]:.1f} %  reach {reach}"
+            )
+        lines.append(f"mixing extent: {o['mixing'][index]:.1f} m")
+        return "\n".join(lines)
+
+    # endregion
+
+    # region override
+    def paintEvent(self, event):
+        if self.__overview is None:
+            return
+        self.__selectLevel()
+
+        painter = QtGui.QPainter(self)
+        painter.drawImage(QtCore.QRectF(self.rect()), self.__image)
+
+        x = (self.__frameIndex + 0.5) / max(self.frameCount(), 1) * self.width()
+        painter.setPen(QtGui.QPen(QtGui.QColor(appColors.warning_rbg), 2))
+        painter.drawLine(QtCore.QPointF(x, 0), QtCore.QPointF(x, self.height()))
+        painter.end()
+
+    def resizeEvent(self, event):
+        self.__level = -1
+        super().resizeEvent(event)
+
+    def mousePressEvent(self, event):
+        if self.__overview is not None:
+            self.onFrameSelected.emit(self.__frameAt(event.position().x()))
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self.__overview is not None:
+            index = self.__frameAt(event.position().x())
+            QtWidgets.QToolTip.showText(
+                event.globalPosition().toPoint(), self.__summary(index), self
+            )
+        super().mouseMoveEvent(event)
+
+    # endregion
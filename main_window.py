@@ -1,9 +1,11 @@
 from PySide6 import QtWidgets, QtCore, QtGui
 import pyqtgraph.opengl as gl
+from pyqtgraph import Vector
 import components as comp
 import utils as utils
-import models as models
 import os
+import time
+from functools import partial
 from pathlib import Path
 
 
@@ -18,19 +20,30 @@ class MainWindow(QtWidgets.QMainWindow):
         self.actionStopAnimation = QtGui.QAction("Stop", self)
         self.actionAnimate = QtGui.QAction("Animate", self)
         self.actionLoad = QtGui.QAction("Load", self)
+        self.actionCompare = QtGui.QAction("Compare", self)
         self.actionExport = QtGui.QAction("Export", self)
         self.actionImport = QtGui.QAction("Import", self)
+        self.actionWatch = QtGui.QAction("Watch", self)
+        self.actionTrace = QtGui.QAction("Trace", self)
+        self.speedInput = QtWidgets.QDoubleSpinBox(self)
         self.thicknessProfileComboBox = QtWidgets.QComboBox(self)
         self.slabPointsInput = QtWidgets.QLineEdit(self)
         self.baseThicknessInput = QtWidgets.QLineEdit(self)
+        self.roiTopInput = QtWidgets.QLineEdit(self)
+        self.roiBottomInput = QtWidgets.QLineEdit(self)
         self.dataFileInput = QtWidgets.QLineEdit(self)
         self.selectBaseFile = QtWidgets.QPushButton("Browse ...", self)
         self.depthDetailLevelComboBox = QtWidgets.QComboBox(self)
+        self.viewComboBox = QtWidgets.QComboBox(self)
+        self.logLevelComboBox = QtWidgets.QComboBox(self)
         self.progressBar = QtWidgets.QProgressBar()
         self.progressBar.setFixedHeight(5)
         self.progressBar.setRange(0, 0)
         self.progressBar.setStyleSheet(utils.PROGESS_BAR_STYLE)
         self.slider = QtWidgets.QSlider(QtCore.Qt.Orientation.Horizontal)
+        self.timelineStrip = comp.VTimelineStrip()
+        self.probePlot = comp.VProbePlot()
+        self.probeDock = QtWidgets.QDockWidget("Probe", self)
         self.drawFacesCheckbox = QtWidgets.QCheckBox("Faces ")
         self.drawEdgesCheckbox = QtWidgets.QCheckBox("Edges ")
 
@@ -39,17 +52,26 @@ class MainWindow(QtWidgets.QMainWindow):
         self.actionStopAnimation.setData("stop")
         self.actionAnimate.setData("animate")
         self.actionLoad.setData("load")
+        self.actionCompare.setData("compare")
         self.actionExport.setData("export")
         self.actionImport.setData("import")
+        self.actionWatch.setData("watch")
+        self.actionWatch.setCheckable(True)
+        self.actionTrace.setData("trace")
+        self.actionTrace.setCheckable(True)
 
-        self.console = QtWidgets.QTextEdit()
+        self.console = QtWidgets.QPlainTextEdit()
         self.glView = comp.VBaseGLViewWidget()
+        self.frameStatsLabel = QtWidgets.QLabel()
+        self.memoryLabel = QtWidgets.QLabel()
+        self.memoryBudgetInput = QtWidgets.QSpinBox()
         self.controlToolBar = QtWidgets.QToolBar()
 
         layout = QtWidgets.QVBoxLayout()
         layout.addWidget(self.progressBar)
         layout.addWidget(self.glView)
         layout.addWidget(self.controlToolBar)
+        layout.addWidget(self.timelineStrip)
         layout.addWidget(self.slider)
         layout.addWidget(self.console)
         layout.setStretch(1, 1)
@@ -61,27 +83,54 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setCentralWidget(centralWidget)
 
         self.__meshItems = {}
+        self.__runs: list[dict] = []
+        self.__pendingFrames = 0
+        self.__ticking = False
+        self.__exporting = False
+        self.__probing = False
+        self.__comparing = False
+        self.__rebuilds = 0
+        self.__watcher: utils.RunWatcher | None = None
         self.__conf = {
             "frame_index": None,
+            "frame_blend": 0.0,
             "thickness_profile": "CW",
             "z_points": 40,
             "y_points": 20,
             "base_thickness": 0.05,
             "depth_detail_level": 25,
+            "view": "slab",
             "tmd": 0.0,
             "bmd": 100.0,
+            "roi_tmd": None,
+            "roi_bmd": None,
             "images": [],
+            "source_file": None,
+            "roi": None,  # depth range the frames were loaded with
+            "geometry": None,
+            "ring": None,
+            "pick_index": None,
+            "probe": None,
             "data_file": os.path.join(os.getcwd(), "data", "results", "csave.h5"),
             "draw_edges": False,
             "draw_faces": True,
+            "memory_budget_mb": utils.MEMORY_BUDGET_MB,
+            "playback_speed": utils.PLAYBACK_SPEED,
             "rotations": [],
             # "rotations": (180, 0, 0, 1, False),
         }
 
+        # ticks at the display rate, the playback clock picks the frame
         self.timer = QtCore.QTimer(self)
-        self.timer.setInterval(17)  # 60 fps
+        self.timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        self.playback = utils.PlaybackClock({"speed": self.__conf["playback_speed"]})
 
-        self.manager = utils.ThreadManager()
+        self.scheduler = utils.TaskScheduler()
+        self.prefetcher = utils.FramePrefetcher(self.scheduler)
+        self.memory = utils.MemoryBudget({"budget_mb": self.__conf["memory_budget_mb"]})
+        self.logSink = utils.LogSink({"capacity": 2000, "interval": 100})
+        self.__logFormats = {}
+        self.__session = utils.read_session()
 
         self.__initialize()
         self.__configure()
@@ -91,16 +140,21 @@ class MainWindow(QtWidgets.QMainWindow):
     def __initialize(self):
         # populate the toolbar with actions
         self.controlToolBar.addAction(self.actionLoad)
+        self.controlToolBar.addAction(self.actionCompare)
+        self.controlToolBar.addAction(self.actionWatch)
         self.controlToolBar.addSeparator()
         self.controlToolBar.addAction(self.actionDraw)
         self.controlToolBar.addAction(self.actionAnimate)
         self.controlToolBar.addAction(self.actionStopAnimation)
+        self.controlToolBar.addWidget(self.speedInput)
         self.controlToolBar.addSeparator()
         self.controlToolBar.addAction(self.actionClear)
         self.controlToolBar.addSeparator()
         self.controlToolBar.addAction(self.actionImport)
         self.controlToolBar.addAction(self.actionExport)
         self.controlToolBar.addSeparator()
+        self.controlToolBar.addAction(self.actionTrace)
+        self.controlToolBar.addSeparator()
 
         s1 = QtWidgets.QWidget()
         s2 = QtWidgets.QWidget()
@@ -115,6 +169,9 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Preferred
         )
         self.controlToolBar.addWidget(s1)
+        self.controlToolBar.addWidget(QtWidgets.QLabel("View: "))
+        self.controlToolBar.addWidget(self.viewComboBox)
+        self.controlToolBar.addSeparator()
         self.controlToolBar.addWidget(QtWidgets.QLabel("Thickness Profile: "))
         self.controlToolBar.addWidget(self.thicknessProfileComboBox)
         self.controlToolBar.addSeparator()
@@ -123,6 +180,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self.controlToolBar.addSeparator()
         self.controlToolBar.addWidget(QtWidgets.QLabel("Base Thickness: "))
         self.controlToolBar.addWidget(self.baseThicknessInput)
+        self.controlToolBar.addSeparator()
+        self.controlToolBar.addWidget(QtWidgets.QLabel("Depth Range: "))
+        self.controlToolBar.addWidget(self.roiTopInput)
+        self.controlToolBar.addWidget(self.roiBottomInput)
         self.controlToolBar.addWidget(s2)
         self.controlToolBar.addWidget(QtWidgets.QLabel("h5 File: "))
         self.controlToolBar.addWidget(self.dataFileInput)
@@ -132,12 +193,17 @@ class MainWindow(QtWidgets.QMainWindow):
         self.controlToolBar.addWidget(self.drawFacesCheckbox)
         self.controlToolBar.addWidget(QtWidgets.QLabel("Depth Detail Level: "))
         self.controlToolBar.addWidget(self.depthDetailLevelComboBox)
+        self.controlToolBar.addSeparator()
+        self.controlToolBar.addWidget(QtWidgets.QLabel("Log Level: "))
+        self.controlToolBar.addWidget(self.logLevelComboBox)
 
         # populate the thickness profile combobox
         self.slabPointsInput.setPlaceholderText("number of points")
         self.slabPointsInput.setText(str(self.__conf["z_points"]))
         self.baseThicknessInput.setText(str(self.__conf["base_thickness"]))
         self.baseThicknessInput.setPlaceholderText("base thickness")
+        self.roiTopInput.setPlaceholderText("top MD")
+        self.roiBottomInput.setPlaceholderText("bottom MD")
         self.dataFileInput.setText(str(self.__conf["data_file"]))
         self.dataFileInput.setPlaceholderText(".h5 file")
         for k, opts in utils.THICKNESS_PROFILES.items():
@@ -149,12 +215,66 @@ class MainWindow(QtWidgets.QMainWindow):
             self.depthDetailLevelComboBox.addItem(level["name"], level["value"])
         self.depthDetailLevelComboBox.setCurrentIndex(1)
 
-        # make console only read only
+        # populate the view combobox
+        for view in utils.GEOMETRY_VIEWS:
+            self.viewComboBox.addItem(view["name"], view["value"])
+
+        # populate the log level combobox
+        for level in utils.LOG_LEVELS:
+            self.logLevelComboBox.addItem(level["name"], level["value"])
+        self.logLevelComboBox.setCurrentIndex(1)
+
+        # make console only read only, capped to the log history
         self.console.setReadOnly(True)
+        self.console.setMaximumBlockCount(self.logSink.capacity())
+        for level, prefix, color in [
+            ("message", "[MSG] ", utils.appColors.dark_rbg),
+            ("info", "[MSG] ", utils.appColors.dark_rbg),
+            ("debug", "[DEBUG] ", utils.appColors.medium_shade_rbg),
+            ("event", "[INFO] ", utils.appColors.tertiary_shade_rbg),
+            ("success", "[SUCCESS] ", utils.appColors.success_shade_rbg),
+            ("warning", "[WARNING] ", utils.appColors.warning_shade_rbg),
+            ("error", "[ERROR] ", utils.appColors.danger_rbg),
+        ]:
+            charFormat = QtGui.QTextCharFormat()
+            charFormat.setForeground(QtGui.QColor(color))
+            self.__logFormats[level] = (prefix, charFormat)
+
+        # playback speed, in simulation seconds per wall second
+        self.speedInput.setRange(*utils.PLAYBACK_SPEED_RANGE)
+        self.speedInput.setDecimals(1)
+        self.speedInput.setStepType(
+            QtWidgets.QAbstractSpinBox.StepType.AdaptiveDecimalStepType
+        )
+        self.speedInput.setPrefix("Speed ")
+        self.speedInput.setSuffix("x")
+        self.speedInput.setToolTip("Simulation seconds played per second")
+
+        # frame statistics of the view
+        self.statusBar().addPermanentWidget(self.frameStatsLabel)
+
+        # memory held by the loaded runs and its budget
+        self.memoryBudgetInput.setRange(256, 256 * 1024)
+        self.memoryBudgetInput.setSingleStep(256)
+        self.memoryBudgetInput.setPrefix("Budget ")
+        self.memoryBudgetInput.setSuffix(" MB")
+        self.statusBar().addPermanentWidget(self.memoryLabel)
+        self.statusBar().addPermanentWidget(self.memoryBudgetInput)
+
+        # read out the cell under the mouse, a click plots its history
+        self.glView.setPickingEnabled(True)
+        self.probeDock.setWidget(self.probePlot)
+        self.addDockWidget(QtCore.Qt.DockWidgetArea.RightDockWidgetArea, self.probeDock)
+        self.probeDock.hide()
 
         # hide the progress bar
         self.progressBar.hide()
 
+        # record from the start when a trace file is given
+        if os.environ.get(utils.TRACE_ENV):
+            utils.start_tracing()
+            self.actionTrace.setChecked(True)
+
         # process the timer
         self.timer.timeout.connect(self.__updateSlider)
 
@@ -162,6 +282,13 @@ class MainWindow(QtWidgets.QMainWindow):
         self.drawEdgesCheckbox.setChecked(self.__conf["draw_edges"])
         self.drawFacesCheckbox.setChecked(self.__conf["draw_faces"])
 
+        # pick up where the previous session stopped
+        self.__restoreSession()
+        self.memoryBudgetInput.setValue(self.__conf["memory_budget_mb"])
+        self.memory.setBudget(self.__conf["memory_budget_mb"])
+        self.speedInput.setValue(self.__conf["playback_speed"])
+        self.playback.setSpeed(self.__conf["playback_speed"])
+
         # draw and axis item
         self.__clear()  # clear the scene
 
@@ -172,6 +299,8 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.slabPointsInput.textChanged.connect(self.__onOptionsChanged)
         self.baseThicknessInput.textChanged.connect(self.__onOptionsChanged)
+        self.roiTopInput.textChanged.connect(self.__onOptionsChanged)
+        self.roiBottomInput.textChanged.connect(self.__onOptionsChanged)
         self.dataFileInput.textChanged.connect(self.__onOptionsChanged)
         self.selectBaseFile.pressed.connect(self.__onSelectFile)
         self.thicknessProfileComboBox.currentIndexChanged.connect(
@@ -180,14 +309,23 @@ class MainWindow(QtWidgets.QMainWindow):
         self.depthDetailLevelComboBox.currentIndexChanged.connect(
             self.__onOptionsChanged
         )
+        self.viewComboBox.currentIndexChanged.connect(self.__onOptionsChanged)
+        self.logLevelComboBox.currentIndexChanged.connect(self.__onLogLevelChanged)
 
         self.slider.valueChanged.connect(self.__onSliderValueChanged)
+        self.timelineStrip.onFrameSelected.connect(self.slider.setValue)
+        self.glView.onFrameStats.connect(self.__onFrameStats)
+        self.memory.onUsageChanged.connect(self.__onMemoryUsage)
+        self.glView.onPickSelected.connect(self.__onPickSelected)
+        self.memoryBudgetInput.valueChanged.connect(self.__onMemoryBudgetChanged)
+        self.speedInput.valueChanged.connect(self.__onPlaybackSpeedChanged)
         self.drawFacesCheckbox.checkStateChanged.connect(self.__onSceneOptionsChanged)
         self.drawEdgesCheckbox.checkStateChanged.connect(self.__onSceneOptionsChanged)
 
     @utils.errorhandler
     def __connectSignals(self):
         utils.signalBus.onMessage.connect(self.log)
+        self.logSink.onFlush.connect(self.__log)
 
     # region event handlers
     @utils.errorhandler
@@ -197,19 +335,164 @@ class MainWindow(QtWidgets.QMainWindow):
 
     @utils.errorhandler
     def __onSliderValueChanged(self, value: int):
+        if self.__exporting:
+            return
 
         # get the new frame
-        if value not in range(len(self.__conf["images"])):
+        if value not in range(self.__frameCount()):
             self.log(
-                f"Slider value: <{value}> out of bounds <0, {len(self.__conf['images']) - 1}>"
+                f"Slider value: <{value}> out of bounds <0, {self.__frameCount() - 1}>"
             )
             return
 
         self.__conf["frame_index"] = value
+        if not self.__ticking:
+            # dragged or stepped, playback carries on from there
+            self.__conf["frame_blend"] = 0.0
+            self.playback.seek(value)
+        self.prefetcher.observe(value)
+        self.timelineStrip.setFrameIndex(value)
+        self.probePlot.setFrameIndex(value)
 
         # draw
         self.draw_frame()
 
+    @utils.errorhandler
+    def __onFrameStats(self, stats: dict):
+        prefetch = self.prefetcher.stats()
+        self.frameStatsLabel.setText(
+            f"{stats['fps']:.1f} fps | frame {stats['frame_time_ms']:.1f} ms"
+            f" | paint {stats['paint_ms']:.1f} ms"
+            f" | prefetch {prefetch['hit_rate']:.0%}"
+        )
+        self.frameStatsLabel.setToolTip(
+            f"Prefetch: {prefetch['hits']} hits, {prefetch['misses']} misses,"
+            f" {prefetch['cached']}/{self.prefetcher.capacity()} frames cached,"
+            f" {prefetch['pending']} pending, depth {self.prefetcher.depth()}"
+        )
+
+    @utils.errorhandler
+    def __onMemoryUsage(self, usage: dict):
+        mb = 2**20
+        self.memoryLabel.setText(
+            f"Memory {usage['total'] / mb:.0f} / {usage['budget'] / mb:.0f} MB"
+        )
+        self.memoryLabel.setToolTip(
+            "\n".join(
+                f"{a['label']}: {a['bytes'] / mb:.1f} MB"
+                + (f" (reduced x{a['level']})" if a["level"] > 0 else "")
+                for a in usage["artifacts"].values()
+            )
+        )
+        over = usage["total"] > usage["budget"]
+        self.memoryLabel.setStyleSheet(
+            f"color: {utils.appColors.danger_rbg};" if over else ""
+        )
+
+    @utils.errorhandler
+    def __onPickSelected(self, result: dict):
+        "plot the concentration history of the clicked cell"
+        layer: dict = result["target"]["layer"]
+        probe: utils.ConcentrationProbe = layer["probe"]
+        if not probe.isAvailable():
+            self.logError("The run holds colors only, it cannot be probed.")
+            return
+        if self.__probing:
+            return  # the index is being built, one probe at a time
+
+        source = probe.source()
+        xi, zeta = probe.cell(result["pixel"])
+        readout = result["readout"]
+        title = f"{Path(source).parent.name}: {readout['Depth']}, {readout['Azimuth']}"
+
+        def task():
+            opts = {"section": probe.section()}
+            return utils.read_probe_series(source, xi, zeta, opts)
+
+        def on_complete(_res_dict):
+            self.__probing = False
+            self.progressBar.hide()
+            if _res_dict["failed"]:
+                self.logError(_res_dict["error"])
+                return
+
+            series = _res_dict["results"]
+            self.probePlot.setSeries(series["time"], series["concentrations"], title)
+            self.probePlot.setFrameIndex(self.__conf["frame_index"])
+            self.probeDock.show()
+
+        def on_started():
+            self.progressBar.show()
+            self.logDebug(f"Probing cell ({xi}, {zeta}) of {source}")
+
+        self.__probing = True
+        self.scheduler.submit(
+            "PROBE_SERIES",
+            task,
+            {
+                "on_complete": on_complete,
+                "on_started": on_started,
+                "priority": "load",
+                "group": "background",
+            },
+        )
+
+    @utils.errorhandler
+    def __onFramesAppended(self, res: dict):
+        "extend the main layer with the frames the solver wrote since the last poll"
+        if self.__watcher is None or self.__conf["images"] is None:
+            return
+
+        if res["frames"].shape[1:] != self.__conf["images"].shape[1:]:
+            self.__stopWatching()
+            self.logError("The new frames do not match the loaded ones, stopped watching.")
+            return
+
+        # the slider follows the live run while it sits on the last frame
+        at_end = self.slider.value() == self.slider.maximum()
+        self.__conf["images"] = utils.append_frames(self.__conf["images"], res["frames"])
+        self.prefetcher.setLength("frames", len(self.__conf["images"]))
+        # spilled frames were copied back to RAM to grow, they may be spilled again
+        self.memory.reset("frames")
+        self.memory.refresh()
+        self.__primeSlider()
+        if at_end and not self.timer.isActive():
+            self.slider.setValue(self.slider.maximum())
+        self.logDebug(
+            f"Appended frames {res['start'] + 1}-{res['count']} of the live run."
+        )
+
+    @utils.errorhandler
+    def __onMemoryBudgetChanged(self, value: int):
+        self.__conf["memory_budget_mb"] = value
+        self.memory.setBudget(value)
+
+    @utils.errorhandler
+    def __onPlaybackSpeedChanged(self, value: float):
+        self.__conf["playback_speed"] = value
+        self.playback.setSpeed(value)
+
+    def changeEvent(self, event: QtCore.QEvent):
+        # stop repainting entirely while the window is minimized
+        if event.type() == QtCore.QEvent.Type.WindowStateChange:
+            self.glView.setIdle(self.isMinimized())
+        super().changeEvent(event)
+
+    def closeEvent(self, event: QtGui.QCloseEvent):
+        self.__saveSession()
+        self.__stopWatching()
+        self.__clearRuns()
+        self.memory.close()
+        self.prefetcher.clear()
+        self.scheduler.close()
+        if utils.is_tracing() and os.environ.get(utils.TRACE_ENV):
+            utils.stop_tracing()
+            utils.write_chrome_trace(os.environ[utils.TRACE_ENV])
+        if self.__conf["ring"] is not None:
+            self.__conf["ring"].close()
+            self.__conf["probe"].close()
+        super().closeEvent(event)
+
     @utils.errorhandler
     def __onSelectFile(self, _=None):
 
@@ -234,11 +517,19 @@ class MainWindow(QtWidgets.QMainWindow):
         # redraw the cell
         self.__reDrawCell()
 
+    @utils.errorhandler
+    def __onLogLevelChanged(self, _=None):
+        self.logSink.setLevel(self.logLevelComboBox.currentData())
+
     @utils.errorhandler
     def __onOptionsChanged(self, _=None):
+        shape = (self.__conf["thickness_profile"], self.__conf["base_thickness"])
+        view = self.__conf["view"]
+
         # update the configuration based on the user input
         self.__conf["thickness_profile"] = self.thicknessProfileComboBox.currentData()
         self.__conf["depth_detail_level"] = self.depthDetailLevelComboBox.currentData()
+        self.__conf["view"] = self.viewComboBox.currentData()
 
         # collect the data file
         h5File = self.dataFileInput.text()
@@ -263,8 +554,26 @@ class MainWindow(QtWidgets.QMainWindow):
             self.__conf["base_thickness"] = 0.05
             self.baseThicknessInput.setText(str(self.__conf["base_thickness"]))
 
+        # collect the depth range of interest, empty means the whole well
+        for key, widget in [
+            ("roi_tmd", self.roiTopInput),
+            ("roi_bmd", self.roiBottomInput),
+        ]:
+            text = widget.text().strip()
+            try:
+                self.__conf[key] = float(text) if text else None
+            except ValueError:
+                self.logError(f"Invalid depth <{text}>.")
+                self.__conf[key] = None
+
         self.logEvent(f"Updated configuration")
 
+        # a new view needs new geometries, a new profile only moves the vertices
+        if view != self.__conf["view"]:
+            self.__rebuildCells()
+        elif shape != (self.__conf["thickness_profile"], self.__conf["base_thickness"]):
+            self.__reshapeCells()
+
         # draw the mesh item based on the new configuration
 
     @utils.errorhandler
@@ -280,10 +589,16 @@ class MainWindow(QtWidgets.QMainWindow):
             self.__animate()
         elif action_type == "load":
             self.__load()
+        elif action_type == "compare":
+            self.__compare()
         elif action_type == "export":
             self.__export()
         elif action_type == "import":
             self.__import()
+        elif action_type == "watch":
+            self.__watch()
+        elif action_type == "trace":
+            self.__trace()
         else:
             self.log(f"Unknown action: {action_type}")
 
@@ -293,11 +608,32 @@ class MainWindow(QtWidgets.QMainWindow):
 
     @utils.errorhandler
     def __updateSlider(self):
-        "when timer fires, shift the slider on step forward"
+        "when timer fires, move the slider to the position of the playback clock"
+        utils.trace_instant("timer tick", "gui")
         if self.__conf["frame_index"] is None:
             return
 
-        self.slider.setValue(self.__conf["frame_index"] + 1)
+        # never queue a new frame before the previous one has been presented,
+        # the clock runs on meanwhile so the frames it passed are skipped
+        if self.glView.isFramePending() or self.__pendingFrames > 0:
+            return
+
+        index, blend, finished = self.playback.position()
+        if finished:
+            index, blend = self.__frameCount() - 1, 0.0
+        if (index, blend) == (self.__conf["frame_index"], self.__conf["frame_blend"]):
+            return  # slow playback, nothing new to show yet
+
+        self.__conf["frame_blend"] = blend
+        if index == self.slider.value():
+            self.draw_frame()
+            return
+
+        self.__ticking = True
+        try:
+            self.slider.setValue(index)
+        finally:
+            self.__ticking = False
 
     @utils.errorhandler
     def __stopAnimation(self):
@@ -305,27 +641,40 @@ class MainWindow(QtWidgets.QMainWindow):
         # construct the base meshdata frame objects with the various colors
 
         self.timer.stop()
+        self.playback.pause()
         self.__conf["frame_index"] = 0
         self.progressBar.hide()
 
     @utils.errorhandler
     def __animate(self):
-        frames = self.__conf["images"]
-        if len(frames) == 0:
+        if self.__frameCount() == 0:
             self.logWarning("No images to animate.")
             return
-        self.logEvent("Animating images...")
+        self.logEvent(
+            f"Animating images at {self.playback.speed():g}x"
+            f" ({self.playback.duration():.0f} s)..."
+        )
 
         self.__conf["frame_index"] = 0
+        self.__conf["frame_blend"] = None  # nothing played yet, draw the first tick
+        self.playback.start(0)
+        # no point in ticking faster than frames can be presented
+        self.timer.setInterval(self.glView.refreshInterval())
         self.timer.start()
         self.progressBar.show()
 
     def draw_frame(self):
-        def task(i: int):
-            self.__updateCell(i)
+        layers = self.__layers()
+
+        def task(params: tuple):
+            # workers only fill the ring slots, the GUI thread flips them
+            i, blend = params
+            for layer in layers:
+                self.__produceFrame(layer, i, blend)
             return i
 
         def on_complete(res):
+            self.__pendingFrames -= 1
             if res["failed"]:
                 self.timer.stop()
                 self.__conf["frame_index"] = None
@@ -335,74 +684,68 @@ class MainWindow(QtWidgets.QMainWindow):
                 if cur_index is None:
                     return
 
-                if cur_index + 1 == len(self.__conf["images"]):
+                self.__presentFrame(cur_index)
+                if cur_index + 1 == self.__frameCount():
                     return self.__stopAnimation()
 
                 # self.__conf['frame_index'] = cur_index + 1
 
         def on_started():
-            self.logEvent(
-                f"DRAW_FRAME_{self.__conf['frame_index'] + 1}/{len(self.__conf['images'])}"
+            self.logDebug(
+                f"DRAW_FRAME_{self.__conf['frame_index'] + 1}/{self.__frameCount()}"
             )
 
-        thread = models.ThreadModel(
+        # what is on screen goes before loads and background work
+        self.__pendingFrames += 1
+        self.scheduler.submit(
+            f"DRAW_FRAME_{self.__conf['frame_index'] + 1}/{self.__frameCount()}",
+            task,
             {
-                "task": task,
-                "params": self.__conf["frame_index"],
+                "params": (self.__conf["frame_index"], self.__conf["frame_blend"] or 0.0),
                 "on_complete": on_complete,
                 "on_started": on_started,
+                "priority": "interactive",
+                "group": "draw",
             },
-            f"DRAW_FRAME_{self.__conf['frame_index'] + 1}/{len(self.__conf['images'])}",
         )
 
-        self.manager.launchThread(thread)
-
     @utils.errorhandler
     def __load(self):
         file_path = self.__conf["data_file"]
+        roi = self.__depthRange()
+
+        # load -> geometry -> pick index, the probe opens alongside
+        def load_task(file: str):
+            # warm start from the frame store when one is cached for the file
+            store = utils.cached_store_path(file)
+            _res_task = utils.load_frames(store or file, {"roi": roi})
+            _res_task["store"] = store
+            return _res_task
 
-        def task(file: str):
-
-            _res_task = utils.load_frames(file)
-
-            profile = utils.THICKNESS_PROFILES[self.__conf["thickness_profile"]][
-                "equation"
-            ](_res_task["nxi"], self.__conf["base_thickness"])
+        def geometry_task(file: str, loaded: dict):
+            # shared by every frame, only the vertex colors change
+            geometry = self.__createGeometry(file, loaded)
+            ring = utils.FrameRing((geometry["vertexes"].shape[0], 4))
+            self.__produceFrame(
+                {"frames": loaded["images"], "geometry": geometry, "ring": ring}, 0
+            )
 
-            props = {
-                "thickness_profile": profile,
-                "y_points": _res_task["nzeta"],
-                "z_points": _res_task["nxi"],
-                "tmd": _res_task["tmd"],
-                "bmd": _res_task["bmd"],
-                "text_positions": utils.create_depth_vertex_array(
-                    {
-                        "thickness_profile": profile,
-                        "plane": "yx",
-                        "size": 1,
-                        "anchor": "center",
-                    }
-                ),
-                "detail_level": self.__conf["depth_detail_level"] / 100,
-                "text_color": utils.appColors.light_rbg,
-                "images": _res_task["images"],
+            positions, labels = self.__createDepthLabels(geometry, loaded)
+            return {
+                "geometry": geometry,
+                "ring": ring,
+                "label_positions": positions,
+                "labels": labels,
             }
 
-            _res_task["meshdata"] = utils.create_slab_mesh(props)["meshdata"]
-            mesh_item = utils.create_mesh_item(
-                {
-                    "meshdata": _res_task["meshdata"][0],
-                    "color": utils.appColors.medium_rbg,
-                    "rotations": self.__conf["rotations"],
-                    "draw_edges": self.__conf["draw_edges"],
-                    "draw_faces": self.__conf["draw_faces"],
-                }
-            )
-            text_items = utils.create_text_items(props)
+        def probe_task(file: str):
+            return utils.ConcentrationProbe(file, {"roi": roi})
 
-            # collect the items
-            _res_task["depth_labels"] = text_items
-            _res_task["cell"] = mesh_item
+        def task(loaded: dict, built: dict, probe: utils.ConcentrationProbe):
+            # plain arrays only, the GL items are built on the GUI thread
+            _res_task = {**loaded, **built}
+            _res_task["pick_index"] = utils.PickIndex(built["geometry"])
+            _res_task["probe"] = probe
 
             # resolve task
             return _res_task
@@ -412,26 +755,57 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.logError(_res_dict["error"])
             else:
                 opts = _res_dict["results"]
+                if self.__conf["ring"] is not None:
+                    self.__conf["ring"].close()
+                    self.__conf["probe"].close()
+                self.__stopWatching()  # counts frames of the replaced run
+
                 self.__conf["images"] = opts["images"]
                 self.__conf["y_points"] = opts["nzeta"]
                 self.__conf["z_points"] = opts["nxi"]
                 self.__conf["tmd"] = opts["tmd"]
                 self.__conf["bmd"] = opts["bmd"]
                 self.__conf["unit"] = opts["unit"]
-                self.__conf["meshdata"] = opts["meshdata"]
+                self.__conf["source_file"] = file_path
+                self.__conf["roi"] = roi
+                self.__conf["geometry"] = opts["geometry"]
+                self.__conf["ring"] = opts["ring"]
+                self.__conf["pick_index"] = opts["pick_index"]
+                self.__conf["probe"] = opts["probe"]
                 self.__conf["frame_index"] = 0
-                self.__meshItems["depth_labels"] = opts["depth_labels"]
-                self.__meshItems["cell"] = opts["cell"]
+                self.__meshItems["depth_labels"] = [
+                    comp.VDepthLabelItem(
+                        positions=opts["label_positions"],
+                        labels=opts["labels"],
+                        color=utils.appColors.light_rbg,
+                    )
+                ]
+                self.__meshItems["cell"] = utils.create_mesh_item(
+                    {
+                        "empty": True,
+                        "color": utils.appColors.medium_rbg,
+                        "rotations": self.__conf["rotations"],
+                        "draw_edges": self.__conf["draw_edges"],
+                        "draw_faces": self.__conf["draw_faces"],
+                        "static_geometry": True,
+                    }
+                )
+                self.timelineStrip.setOverview(opts.get("overview"))
 
                 self.__draw()
+                self.__presentFrame(0)
+                self.__updatePickTargets()
+                self.__updatePrefetch()
+                # the new frames are in RAM, drop the spill files of the old ones
+                self.memory.reset("frames")
+                self.__trackMemory()
 
                 # prime the slide
-                self.slider.setMinimum(0)
-                self.slider.setMaximum(len(opts["meshdata"]) - 1)
-                self.slider.setSingleStep(1)
-                self.slider.setTickPosition(QtWidgets.QSlider.TickPosition.TicksBelow)
-                self.slider.setTickInterval(5)
+                self.__primeSlider()
+                self.__restoreFrameIndex()
 
+                if opts["store"] is not None and opts["store"] != file_path:
+                    self.logEvent(f"Warm start from frame store {opts['store']}.")
                 self.logSuccess(f"Loaded {opts['time_step']} images from {file_path}.")
                 self.progressBar.hide()
 
@@ -439,25 +813,328 @@ class MainWindow(QtWidgets.QMainWindow):
             self.progressBar.show()
             self.logEvent("Loading data from sources and constructing mesh...")
 
-        thread = models.ThreadModel(
+        self.scheduler.submit(
+            "LOAD_FRAMES",
+            load_task,
+            {"params": file_path, "on_started": on_started, "group": "load"},
+        )
+        self.scheduler.submit(
+            "LOAD_GEOMETRY",
+            geometry_task,
+            {"params": file_path, "after": ["LOAD_FRAMES"]},
+        )
+        self.scheduler.submit("LOAD_PROBE", probe_task, {"params": file_path})
+        self.scheduler.submit(
+            "LOAD_DATA",
+            task,
             {
-                "params": file_path,
+                "after": ["LOAD_FRAMES", "LOAD_GEOMETRY", "LOAD_PROBE"],
+                "on_complete": on_complete,
+            },
+        )
+
+    @utils.errorhandler
+    def __compare(self):
+        "load several runs side by side, they share the slider and the geometry"
+        if self.__comparing:
+            self.logWarning("The comparison runs are still loading.")
+            return
+
+        files = QtWidgets.QFileDialog.getOpenFileNames(
+            parent=self, filter="HDF5 files (*.h5)"
+        )[0]
+        if len(files) == 0:
+            return
+
+        roi = self.__depthRange()
+        frame_index = self.__conf["frame_index"] or 0
+
+        def task(paths: list[str]):
+            runs = []
+            for path in paths:
+                frames = utils.FrameSequence(path, {"roi": roi})
+
+                # identical dimensions and profile resolve to the same cached arrays
+                geometry = self.__createGeometry(path, frames.header())
+                run = {
+                    "file": path,
+                    "header": frames.header(),
+                    "frames": frames,
+                    "geometry": geometry,
+                    "ring": utils.FrameRing((geometry["vertexes"].shape[0], 4)),
+                    "pick_index": utils.PickIndex(geometry),
+                    "probe": utils.ConcentrationProbe(path, {"roi": roi}),
+                }
+                self.__produceFrame(run, frame_index)
+                runs.append(run)
+            return runs
+
+        def on_complete(_res_dict):
+            self.__comparing = False
+            self.progressBar.hide()
+            if _res_dict["failed"]:
+                self.logError(_res_dict["error"])
+                return
+
+            self.__clearRuns()
+            for i, run in enumerate(_res_dict["results"]):
+                offset = (i + 1) * utils.COMPARISON_SPACING
+                cell = utils.create_mesh_item(
+                    {
+                        "empty": True,
+                        "color": utils.appColors.medium_rbg,
+                        "rotations": self.__conf["rotations"],
+                        "draw_edges": self.__conf["draw_edges"],
+                        "draw_faces": self.__conf["draw_faces"],
+                        "static_geometry": True,
+                    }
+                )
+                cell.translate(0, offset, 0)
+                title = gl.GLTextItem(
+                    pos=(0, offset, 0.6),
+                    text=Path(run["file"]).parent.name,
+                    color=QtGui.QColor(utils.appColors.light_rbg),
+                )
+                run["cell"] = cell
+                run["title"] = title
+                run["memory_key"] = f"run:{id(run)}"
+                self.glView.addItem(cell)
+                self.glView.addItem(title)
+                self.__runs.append(run)
+
+            if self.__conf["frame_index"] is None:
+                self.__conf["frame_index"] = 0
+            self.__presentFrame(frame_index)
+            self.__updatePickTargets()
+            self.__updatePrefetch()
+            self.__trackMemory()
+            self.__primeSlider()
+            self.logSuccess(f"Loaded {len(self.__runs)} runs for comparison.")
+
+        def on_started():
+            self.progressBar.show()
+            self.logEvent(f"Opening {len(files)} runs for comparison...")
+
+        self.__comparing = True
+        self.scheduler.submit(
+            "LOAD_COMPARISON",
+            task,
+            {
+                "params": files,
                 "on_complete": on_complete,
                 "on_started": on_started,
-                "task": task,
+                "group": "load",
             },
-            id="LOAD_DATA",
         )
-        self.manager.launchThread(thread)
 
     @utils.errorhandler
     def __export(self):
-        pass
+        """
+        Render every frame offscreen into a video. Three stages overlap:
+        a worker colors frame N+1 while the GUI thread reads frame N back
+        from the framebuffer and the encoder thread encodes frame N-1.
+        Frames are handed to the encoder on a worker, coloring pauses while
+        `EXPORT_QUEUE_SIZE` of them wait, so the GUI thread never blocks.
+        """
+        if self.__exporting:
+            self.logWarning("An export is already running.")
+            return
+        n_frames = self.__frameCount()
+        if n_frames == 0:
+            self.logWarning("No frames to export.")
+            return
+
+        filters = ";;".join(
+            f"{f['name']} (*{ext})" for ext, f in utils.EXPORT_FORMATS.items()
+        )
+        file = QtWidgets.QFileDialog.getSaveFileName(parent=self, filter=filters)[0]
+        if len(file) == 0:
+            return
+
+        encoder = utils.FrameEncoder(
+            utils.VideoWriter(file, {"fps": utils.EXPORT_FPS}),
+            {"queue_size": utils.EXPORT_QUEUE_SIZE},
+        )
+        layers = self.__layers()
+        stats = {
+            "start": time.perf_counter(),
+            "readback_s": 0.0,
+            "done": False,
+            "queued": 0,  # frames handed over, not yet in the encoder queue
+            "next": None,  # frame to color once the encoder catches up
+        }
+
+        self.timer.stop()
+        self.__exporting = True
+        self.slider.setEnabled(False)
+        self.progressBar.setRange(0, n_frames)
+        self.progressBar.show()
+        self.logEvent(f"Exporting {n_frames} frames to {file}...")
+
+        def produce(i: int):
+            "stage 1, color the frame into the rings on a worker"
+
+            def task(index: int):
+                for layer in layers:
+                    self.__produceFrame(layer, index)
+                return index
+
+            self.scheduler.submit(
+                f"EXPORT_FRAME_{i + 1}/{n_frames}",
+                task,
+                {"params": i, "on_complete": on_produced},
+            )
+
+        def on_produced(res):
+            if stats["done"]:
+                return  # already failed
+            if res["failed"]:
+                return finish(res["error"])
+
+            i = res["results"]
+            self.__presentFrame(i)
+            if i + 1 < n_frames:
+                if stats["queued"] < utils.EXPORT_QUEUE_SIZE:
+                    produce(i + 1)
+                else:
+                    stats["next"] = i + 1  # the encoder is behind
+
+            # stage 2, read back while the next frame is colored
+            start = time.perf_counter()
+            try:
+                frame = self.glView.renderFrame()
+            except Exception as e:
+                return finish(str(e))
+            stats["readback_s"] += time.perf_counter() - start
+
+            # stage 3, a worker waits on the encoder queue, in frame order
+            stats["queued"] += 1
+            self.scheduler.submit(
+                f"EXPORT_ENCODE_{i + 1}/{n_frames}",
+                encoder.put,
+                {
+                    "params": frame,
+                    "on_complete": partial(on_encoded, i),
+                    "priority": "background",
+                    "group": "export",
+                },
+            )
+            self.timelineStrip.setFrameIndex(i)
+            self.progressBar.setValue(i + 1)
+
+        def on_encoded(i: int, res):
+            stats["queued"] -= 1
+            if stats["done"]:
+                return
+            if res["failed"]:
+                return finish(res["error"])
+            if i + 1 == n_frames:
+                return finish()
+
+            if stats["next"] is not None and stats["queued"] < utils.EXPORT_QUEUE_SIZE:
+                produce(stats["next"])
+                stats["next"] = None
+
+        def finish(error: str = None):
+            stats["done"] = True
+
+            def task():
+                return encoder.close()
+
+            def on_complete(res):
+                self.__exporting = False
+                self.slider.setEnabled(True)
+                self.progressBar.setRange(0, 0)
+                self.progressBar.hide()
+                if self.__conf["frame_index"] is not None:
+                    self.draw_frame()
+
+                if error is not None or res["failed"]:
+                    self.logError(f"Export failed: {error or res['error']}")
+                    return
+
+                enc = res["results"]
+                elapsed = time.perf_counter() - stats["start"]
+                self.logSuccess(
+                    f"Exported {enc['frames']} frames to {file} in {elapsed:.1f}s"
+                    f" ({enc['frames'] / elapsed:.1f} fps)."
+                )
+                self.logDebug(
+                    f"Export stages: encode {enc['encode_s']:.2f}s,"
+                    f" readback {stats['readback_s']:.2f}s,"
+                    f" waiting on the encoder {enc['wait_s']:.2f}s"
+                )
+
+            # after the frames still being handed over
+            self.scheduler.submit(
+                "EXPORT_FINISH", task, {"on_complete": on_complete, "group": "export"}
+            )
+
+        produce(0)
 
     @utils.errorhandler
     def __import(self):
         pass
 
+    @utils.errorhandler
+    def __watch(self):
+        "follow the loaded run while the solver is still writing it"
+        if self.__watcher is not None:
+            self.__stopWatching()
+            self.logEvent("Stopped watching the run.")
+            return
+
+        if self.__conf["ring"] is None:
+            self.actionWatch.setChecked(False)
+            self.logWarning("Load a run before watching it.")
+            return
+
+        # a frame store is never written by the solver, follow its source
+        file = self.__conf["probe"].source()
+        if file is None:
+            self.actionWatch.setChecked(False)
+            self.logWarning("The run holds colors only, it cannot be watched.")
+            return
+
+        # the new frames must match the rows of the loaded ones
+        self.__watcher = utils.RunWatcher(
+            file,
+            {"roi": self.__conf["roi"], "start": len(self.__conf["images"])},
+        )
+        self.__watcher.onFramesAppended.connect(self.__onFramesAppended)
+        self.__watcher.onError.connect(self.logWarning)
+        self.__watcher.start()
+        self.actionWatch.setChecked(True)
+        self.logEvent(f"Watching {file} for new timesteps.")
+
+    def __stopWatching(self):
+        if self.__watcher is not None:
+            self.__watcher.close()
+            self.__watcher = None
+        self.actionWatch.setChecked(False)
+
+    @utils.errorhandler
+    def __trace(self):
+        "start recording spans, on the second click write them as a Chrome trace"
+        if not utils.is_tracing():
+            utils.start_tracing()
+            self.logEvent("Recording a performance trace, click Trace again to save it.")
+            return
+
+        count = utils.stop_tracing()
+        self.actionTrace.setChecked(False)
+        file = QtWidgets.QFileDialog.getSaveFileName(
+            parent=self, filter="Chrome trace (*.json)"
+        )[0]
+        if len(file) == 0:
+            self.logWarning(f"Discarded a trace of {count} events.")
+            return
+
+        utils.write_chrome_trace(file)
+        self.logSuccess(
+            f"Wrote {count} trace events to {file}, open it in chrome://tracing or Perfetto."
+        )
+
     # endregion
 
     # region scene workers
@@ -477,11 +1154,19 @@ class MainWindow(QtWidgets.QMainWindow):
                 "rotations": self.__conf["rotations"],
                 "draw_edges": self.__conf["draw_edges"],
                 "draw_faces": self.__conf["draw_faces"],
+                "static_geometry": True,
             }
         )
         self.glView.addItem(mesh_item)
         self.__meshItems["cell"] = mesh_item
-        self.__updateCell(self.__conf["frame_index"])
+        self.__updatePickTargets()
+        self.__updatePrefetch()
+
+        # the front buffer is still valid, hand it to the new cell
+        ring: utils.FrameRing = self.__conf["ring"]
+        colors = None if ring is None else ring.front()
+        if colors is not None:
+            self.__setCellColors(mesh_item, self.__conf["geometry"], colors)
 
     @utils.errorhandler
     def __draw(self, _=None):
@@ -498,16 +1183,445 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             self.glView.addItem(self.__meshItems["cell"])
 
+    def __thicknessProfile(self, nz: int):
+        equation = utils.THICKNESS_PROFILES[self.__conf["thickness_profile"]]["equation"]
+        return equation(nz, self.__conf["base_thickness"])
+
+    def __createGeometry(self, file: str, header: dict) -> dict:
+        "geometry of the selected view for a run, header carries tmd, bmd, nxi and nzeta"
+        if self.__conf["view"] == "annulus":
+            well = utils.read_well_geometry(
+                file, header["nxi"], header["tmd"], header["bmd"]
+            )
+            return utils.create_annulus_geometry(
+                {"well": well, "y_points": header["nzeta"]}
+            )
+
+        return utils.create_slab_geometry(
+            {
+                "thickness_profile": self.__thicknessProfile(header["nxi"]),
+                "y_points": header["nzeta"],
+            }
+        )
+
+    def __createDepthLabels(self, geometry: dict, header: dict):
+        "label anchors along the geometry surface, header carries tmd, bmd and unit"
+        if geometry["kind"] == "annulus":
+            positions = geometry["label_anchors"]
+        else:
+            positions = utils.create_depth_vertex_array(
+                {
+                    "thickness_profile": self.__thicknessProfile(geometry["shape"][0]),
+                    "plane": "yx",
+                    "size": 1,
+                    "anchor": "center",
+                }
+            )
+
+        return utils.create_depth_labels(
+            {
+                "tmd": header["tmd"],
+                "bmd": header["bmd"],
+                "unit": header["unit"],
+                "text_positions": positions,
+                "detail_level": self.__conf["depth_detail_level"] / 100,
+            }
+        )
+
     @utils.errorhandler
-    def __updateCell(self, frame_index: int):
-        if frame_index < len(self.__conf["meshdata"]):
-            cell: gl.GLMeshItem = self.__meshItems["cell"]
-            cell.setMeshData(meshdata=self.__conf["meshdata"][frame_index])
+    def __reshapeCells(self):
+        "apply the thickness profile to the loaded slabs, the frame colors are kept"
+        geometry = self.__conf["geometry"]
+        if geometry is not None and geometry["kind"] == "slab":
+            profile = self.__thicknessProfile(geometry["shape"][0])
+            self.__conf["geometry"] = utils.reshape_slab_geometry(geometry, profile)
+            self.__conf["pick_index"] = utils.PickIndex(self.__conf["geometry"])
+
+            positions, labels = self.__createDepthLabels(
+                self.__conf["geometry"], self.__conf
+            )
+            for item in self.__meshItems.get("depth_labels", []):
+                item.setData(positions=positions, labels=labels)
+
+        for run in self.__runs:
+            if run["geometry"]["kind"] != "slab":
+                continue
+            profile = self.__thicknessProfile(run["geometry"]["shape"][0])
+            run["geometry"] = utils.reshape_slab_geometry(run["geometry"], profile)
+            run["pick_index"] = utils.PickIndex(run["geometry"])
+
+        # present the front buffers again on the new geometry
+        for layer in self.__layers():
+            if layer["geometry"]["kind"] != "slab":
+                continue
+            colors = layer["ring"].front()
+            if colors is not None:
+                layer["cell"].geometryChanged()
+                self.__setCellColors(layer["cell"], layer["geometry"], colors)
+
+    @utils.errorhandler
+    def __rebuildCells(self):
+        "map the loaded frames onto the geometry of the selected view"
+        layers = self.__layers()
+        if len(layers) == 0:
+            return
+
+        frame_index = self.__conf["frame_index"] or 0
+        loaded = len(layers) > len(self.__runs)
+        # a newer rebuild replaces this one, before it starts or once it is done
+        self.__rebuilds += 1
+        generation = self.__rebuilds
+
+        def task():
+            if generation != self.__rebuilds:
+                return None
+            rebuilt = []
+            for layer in layers:
+                nxi, nzeta = layer["geometry"]["shape"]
+                header = {**layer["header"], "nxi": nxi, "nzeta": nzeta}
+                geometry = self.__createGeometry(layer["file"], header)
+                ring = utils.FrameRing((geometry["vertexes"].shape[0], 4))
+                self.__produceFrame(
+                    {"frames": layer["frames"], "geometry": geometry, "ring": ring},
+                    frame_index,
+                )
+                rebuilt.append(
+                    {
+                        "geometry": geometry,
+                        "ring": ring,
+                        "pick_index": utils.PickIndex(geometry),
+                    }
+                )
+
+            labels = None
+            if loaded:
+                labels = self.__createDepthLabels(
+                    rebuilt[0]["geometry"], layers[0]["header"]
+                )
+            return rebuilt, labels
+
+        def on_complete(_res_dict):
+            self.progressBar.hide()
+            if _res_dict["failed"]:
+                self.logError(_res_dict["error"])
+                return
+
+            if _res_dict["results"] is None:
+                return  # replaced before it started
+
+            rebuilt, labels = _res_dict["results"]
+            if generation != self.__rebuilds or [layer["ring"] for layer in layers] != [
+                layer["ring"] for layer in self.__layers()
+            ]:
+                for layer in rebuilt:
+                    layer["ring"].close()
+                return  # the scene changed meanwhile
+
+            if loaded:
+                main = rebuilt.pop(0)
+                self.__conf["ring"].close()
+                self.__conf["geometry"] = main["geometry"]
+                self.__conf["ring"] = main["ring"]
+                self.__conf["pick_index"] = main["pick_index"]
+
+                positions, texts = labels
+                for item in self.__meshItems.get("depth_labels", []):
+                    item.setData(positions=positions, labels=texts)
+
+            for run, layer in zip(self.__runs, rebuilt):
+                run["ring"].close()
+                run.update(layer)
+
+            for layer in self.__layers():
+                layer["cell"].geometryChanged()
+            self.__presentFrame(frame_index)
+            self.__updatePickTargets()
+            self.__updatePrefetch()
+            self.logSuccess(f"Switched to the {self.__conf['view']} view.")
+
+        # one rebuild at a time, the load group serializes them
+        self.scheduler.submit(
+            "REBUILD_GEOMETRY",
+            task,
+            {
+                "on_complete": on_complete,
+                "on_started": lambda: self.progressBar.show(),
+                "priority": "interactive",
+                "group": "load",
+            },
+        )
+
+    def __layers(self) -> list[dict]:
+        "everything colored per frame: the loaded run, then the comparison runs"
+        layers = []
+        if self.__conf["ring"] is not None and "cell" in self.__meshItems:
+            layers.append(
+                {
+                    "file": self.__conf["source_file"],
+                    "header": {
+                        "tmd": self.__conf["tmd"],
+                        "bmd": self.__conf["bmd"],
+                        "unit": self.__conf["unit"],
+                    },
+                    "frames": self.__conf["images"],
+                    "geometry": self.__conf["geometry"],
+                    "ring": self.__conf["ring"],
+                    "pick_index": self.__conf["pick_index"],
+                    "probe": self.__conf["probe"],
+                    "memory_key": "frames",
+                    "cell": self.__meshItems["cell"],
+                }
+            )
+        return layers + self.__runs
+
+    def __produceFrame(self, layer: dict, frame_index: int, blend: float = 0.0):
+        """
+        worker side: color a frame straight into a free slot of the layer ring,
+        blended towards the next one by `blend` during slow playback
+        """
+        ring: utils.FrameRing = layer["ring"]
+        slot = ring.acquire()
+        if slot is None:
+            return  # closed meanwhile
+
+        buffer = ring.buffer(slot)
+        if buffer is None:
+            return
+
+        try:
+            # shorter runs hold their last frame
+            frames = layer["frames"]
+            index = min(frame_index, len(frames) - 1)
+            self.__layerColors(layer, index, buffer)
+            if blend > 0 and index + 1 < len(frames):
+                buffer *= 1.0 - blend
+                buffer += blend * self.__layerColors(layer, index + 1)
+        except Exception:
+            ring.discard(slot)
+            raise
+        ring.publish(slot, frame_index)
+
+    def __layerColors(self, layer: dict, index: int, out=None):
+        "vertex colors of a frame, prefetched when possible"
+        colors = None
+        if "memory_key" in layer:
+            colors = self.prefetcher.get(layer["memory_key"], index)
+        if colors is None:
+            return utils.create_frame_colors(layer["geometry"], layer["frames"][index], out=out)
+        if out is None:
+            return colors
+        out[:] = colors
+        return out
+
+    @utils.errorhandler
+    def __presentFrame(self, frame_index: int):
+        "GUI side: flip every ring to the frame and upload the front buffers"
+        for layer in self.__layers():
+            self.memory.touch(layer["memory_key"])
+            colors = layer["ring"].flip(frame_index)
+            if colors is not None:
+                self.__setCellColors(layer["cell"], layer["geometry"], colors)
+
+    def __trackMemory(self):
+        "account the loaded frames, the comparison runs and the scene"
+        if self.__conf["ring"] is not None:
+            self.memory.track(
+                "frames",
+                {
+                    "label": "Frames",
+                    "measure": lambda: utils.resident_bytes(self.__conf["images"]),
+                    "reducers": [self.__downcastImages, self.__spillImages],
+                },
+            )
+
+        for run in self.__runs:
+            frames: utils.FrameSequence = run["frames"]
+            self.memory.track(
+                run["memory_key"],
+                {
+                    "label": f"Run {Path(run['file']).parent.name}",
+                    "measure": frames.cacheBytes,
+                    "reducers": [partial(frames.setCacheSize, 2)],
+                },
+            )
+
+        self.memory.track("scene", {"label": "Geometry", "measure": self.__sceneBytes})
+        self.memory.track(
+            "prefetch",
+            {
+                "label": "Prefetched frames",
+                "measure": self.prefetcher.nbytes,
+                "reducers": [partial(self.prefetcher.setCapacity, utils.PREFETCH_DEPTH)],
+            },
+        )
+
+    def __sceneBytes(self) -> int:
+        "geometries, frame rings and pick indices, shared geometries counted once"
+        total = 0
+        geometries = {}
+        for layer in self.__layers():
+            geometries[id(layer["geometry"])] = layer["geometry"]
+            total += layer["ring"].nbytes() + layer["pick_index"].nbytes()
+        for geometry in geometries.values():
+            total += utils.resident_bytes(*geometry.values())
+        return total
+
+    @utils.errorhandler
+    def __downcastImages(self):
+        images = self.__conf["images"]
+        self.__conf["images"] = utils.downcast_frames(images)
+        if self.__conf["images"] is not images:
+            self.logEvent("Frames kept in half precision to stay within the memory budget.")
+
+    @utils.errorhandler
+    def __spillImages(self):
+        self.__conf["images"] = self.memory.spill("frames", self.__conf["images"])
+        self.logEvent("Frames spilled to disk to stay within the memory budget.")
+
+    def __updatePrefetch(self):
+        "prefetch the frames of every layer, keyed like the memory artifacts"
+        self.prefetcher.setSources(
+            {
+                layer["memory_key"]: {
+                    "load": partial(self.__frameColors, layer["memory_key"]),
+                    "length": len(layer["frames"]),
+                }
+                for layer in self.__layers()
+            }
+        )
+        self.prefetcher.resetStats()
+
+    def __frameColors(self, key: str, index: int):
+        "worker side: vertex colors of a frame, the layer is looked up when it runs"
+        for layer in self.__layers():
+            if layer["memory_key"] == key:
+                image = layer["frames"][index]
+                return utils.create_frame_colors(layer["geometry"], image)
+        raise KeyError(f"No layer <{key}>")
+
+    def __updatePickTargets(self):
+        "hovering a cell reads out the pixel under the mouse"
+        self.glView.setPickTargets(
+            [
+                {
+                    "item": layer["cell"],
+                    "index": layer["pick_index"],
+                    "readout": partial(self.__readout, layer),
+                    "layer": layer,
+                }
+                for layer in self.__layers()
+            ]
+        )
+
+    def __readout(self, layer: dict, pixel: tuple[int, int]) -> dict:
+        "depth, azimuth from the high side and concentrations of a pixel"
+        k, j = pixel
+        nxi, _ = layer["geometry"]["shape"]
+        header = layer["header"]
+        depth = header["tmd"] + k * (header["bmd"] - header["tmd"]) / max(nxi - 1, 1)
+        readout = {
+            "Depth": f"{depth:.1f} {header['unit']}",
+            "Azimuth": self.__azimuth(layer["geometry"], j),
+        }
+
+        # the frame on screen, comparison runs may lag behind the slider
+        frame_index = layer["ring"].frontIndex()
+        probe: utils.ConcentrationProbe = layer["probe"]
+        if frame_index is None or not probe.isAvailable():
+            return readout
+
+        # hovering never reads the file, the frame is loaded on a worker
+        concentrations = probe.cached(frame_index, pixel)
+        if concentrations is None:
+            self.__loadProbeFrame(probe, frame_index)
+            readout["Concentrations"] = "reading..."
+            return readout
+        for fluid, c in zip(utils.FLUIDS.values(), concentrations):
+            readout[fluid["name"]] = f"{c:.3f}"
+        return readout
+
+    def __azimuth(self, geometry: dict, j: int) -> str:
+        "angle from the high side shown by an image column"
+        nzeta = geometry["shape"][1]
+        if geometry["kind"] == "annulus" and not geometry["symmetric"]:
+            # the columns wrap the whole pipe
+            return f"{360.0 * (nzeta - j) / nzeta % 360:.0f}°"
+
+        azimuth = 180.0 * (nzeta - 1 - j) / max(nzeta - 1, 1)
+        if geometry["kind"] == "annulus" and 0 < azimuth < 180:
+            return f"±{azimuth:.0f}°"  # mirrored on both sides of the pipe
+        return f"{azimuth:.0f}°"
+
+    def __loadProbeFrame(self, probe: utils.ConcentrationProbe, frame_index: int):
+        stage_id = f"PROBE_FRAME_{id(probe)}_{frame_index}"
+        if self.scheduler.isRunning(stage_id):
+            return
+        self.scheduler.submit(
+            stage_id, probe.load, {"params": frame_index, "priority": "interactive"}
+        )
+
+    def __setCellColors(self, cell: gl.GLMeshItem, geometry: dict, colors):
+        # the arrays are referenced, not copied, until the next flip. The
+        # geometry and its normals are shared, only the colors are uploaded
+        with utils.trace_span("upload colors", "gl"):
+            cell.setMeshData(
+                meshdata=gl.MeshData(
+                    vertexes=geometry["vertexes"],
+                    faces=geometry["faces"],
+                    vertexColors=colors,
+                ),
+                normals=geometry["normals"],
+            )
+
+    @utils.errorhandler
+    def __clearRuns(self):
+        for run in self.__runs:
+            self.glView.removeItem(run["cell"])
+            self.glView.removeItem(run["title"])
+            run["frames"].close()
+            run["ring"].close()
+            run["probe"].close()
+            self.memory.release(run["memory_key"])
+        self.__runs.clear()
+        self.__updatePickTargets()
+        self.__updatePrefetch()
+
+    def __depthRange(self) -> tuple[float, float] | None:
+        "depth range of interest, None loads the whole well"
+        tmd, bmd = self.__conf["roi_tmd"], self.__conf["roi_bmd"]
+        if tmd is None and bmd is None:
+            return None
+        return tmd, bmd
+
+    def __frameCount(self) -> int:
+        "number of frames driven by the slider, across all loaded runs"
+        counts = [len(self.__conf["images"])]
+        counts += [len(run["frames"]) for run in self.__runs]
+        return max(counts)
+
+    @utils.errorhandler
+    def __primeSlider(self):
+        self.slider.setMinimum(0)
+        self.slider.setMaximum(max(self.__frameCount() - 1, 0))
+        self.slider.setSingleStep(1)
+        self.slider.setTickPosition(QtWidgets.QSlider.TickPosition.TicksBelow)
+        self.slider.setTickInterval(5)
+        self.__updatePlaybackTimes()
+
+    def __updatePlaybackTimes(self):
+        "simulation time of every frame for the playback clock"
+        file = self.__conf["source_file"] or self.__conf["data_file"]
+        try:
+            times = utils.read_timesave(file) if file else None
+        except OSError:
+            times = None  # being written, records fall back to a fixed spacing
+        self.playback.setTimes(times, self.__frameCount())
 
     @utils.errorhandler
     def __clear(self):
 
         # first clear the scene
+        self.__clearRuns()
         self.glView.clear()
 
         # add the axis item
@@ -523,52 +1637,103 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # delete all mesh items
         self.__meshItems.clear()
+        self.__updatePickTargets()
+        self.__updatePrefetch()
 
         self.logEvent("Cleared all mesh items.")
 
     # endregion
 
-    # region log workers
+    # region session workers
+    @utils.errorhandler
+    def __restoreSession(self):
+        "restore the configuration and widgets saved by the previous session"
+        session = self.__session
+        if len(session) == 0:
+            return
+
+        for key in utils.SESSION_KEYS:
+            # the frame index waits for the frames, see __restoreFrameIndex
+            if key in session and key != "frame_index":
+                self.__conf[key] = session[key]
+
+        self.dataFileInput.setText(str(self.__conf["data_file"]))
+        self.baseThicknessInput.setText(str(self.__conf["base_thickness"]))
+        for key, widget in [
+            ("roi_tmd", self.roiTopInput),
+            ("roi_bmd", self.roiBottomInput),
+        ]:
+            value = self.__conf[key]
+            widget.setText("" if value is None else str(value))
+
+        for comboBox, value in [
+            (self.thicknessProfileComboBox, self.__conf["thickness_profile"]),
+            (self.depthDetailLevelComboBox, self.__conf["depth_detail_level"]),
+            (self.viewComboBox, self.__conf["view"]),
+            (self.logLevelComboBox, session.get("log_level", None)),
+        ]:
+            index = comboBox.findData(value)
+            if index >= 0:
+                comboBox.setCurrentIndex(index)
+        self.logSink.setLevel(self.logLevelComboBox.currentData())
+
+        self.drawEdgesCheckbox.setChecked(self.__conf["draw_edges"])
+        self.drawFacesCheckbox.setChecked(self.__conf["draw_faces"])
+
+        camera = session.get("camera", None)
+        if camera is not None:
+            camera["center"] = Vector(*camera["center"])
+            self.glView.setCameraParams(**camera)
 
     @utils.errorhandler
-    def __log(self, msg: str, color: str = utils.appColors.dark_rbg):
-        self.console.moveCursor(QtGui.QTextCursor.MoveOperation.End)
+    def __restoreFrameIndex(self):
+        "jump to the frame the previous session stopped on, once"
+        index = self.__session.pop("frame_index", None)
+        if index is not None and index in range(self.__frameCount()):
+            self.slider.setValue(index)
+
+    @utils.errorhandler
+    def __saveSession(self):
+        session = {key: self.__conf[key] for key in utils.SESSION_KEYS}
+        session["log_level"] = self.logLevelComboBox.currentData()
+
+        params = self.glView.cameraParams()
+        camera = {k: params[k] for k in ["distance", "fov", "elevation", "azimuth"] if k in params}
+        camera["center"] = list(params["center"])
+        session["camera"] = camera
+
+        utils.write_session(session)
 
-        cursor = self.console.textCursor()
+    # endregion
 
-        charFormat = QtGui.QTextCharFormat()
-        charFormat.setForeground(QtGui.QColor(color))
+    # region log workers
 
-        cursor.setCharFormat(charFormat)
-        cursor.insertText("\n")
-        cursor.insertText(msg.strip())
+    @utils.errorhandler
+    def __log(self, records: list[dict]):
+        "append a batch of log records to the console in one edit"
+        cursor = QtGui.QTextCursor(self.console.document())
+        cursor.movePosition(QtGui.QTextCursor.MoveOperation.End)
+
+        cursor.beginEditBlock()
+        for record in records:
+            prefix, charFormat = self.__logFormats.get(
+                record["type"], self.__logFormats["message"]
+            )
+            cursor.insertBlock()
+            cursor.insertText(prefix + str(record["text"]).strip(), charFormat)
+        cursor.endEditBlock()
 
         sb = self.console.verticalScrollBar()
         sb.setValue(sb.maximum())
 
     @utils.errorhandler
     def log(self, data: str | dict):
-        prefix = "[MSG] "
+        "queue a message, the console is updated in batches by the log sink"
         if isinstance(data, str):
-            self.__log(prefix + data)
+            self.logSink.push(data, "message")
 
         if isinstance(data, dict):
-            if data.get("type") == "error":
-                prefix = "[ERROR] "
-                self.__log(prefix + data.get("text"), utils.appColors.danger_rbg)
-            elif data.get("type") == "warning":
-                prefix = "[WARNING] "
-                self.__log(prefix + data.get("text"), utils.appColors.warning_shade_rbg)
-            elif data.get("type") == "event":
-                prefix = "[INFO] "
-                self.__log(
-                    prefix + data.get("text"), utils.appColors.tertiary_shade_rbg
-                )
-            elif data.get("type") == "success":
-                prefix = "[SUCCESS] "
-                self.__log(prefix + data.get("text"), utils.appColors.success_shade_rbg)
-            else:
-                self.__log(prefix + data.get("text"))
+            self.logSink.push(data.get("text"), data.get("type", "message"))
 
     @utils.errorhandler
     def logError(self, msg: str):
@@ -586,4 +1751,8 @@ class MainWindow(QtWidgets.QMainWindow):
     def logSuccess(self, msg: str):
         self.log({"text": msg, "type": "success"})
 
+    @utils.errorhandler
+    def logDebug(self, msg: str):
+        self.log({"text": msg, "type": "debug"})
+
     # endregion
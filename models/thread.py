@@ -1,6 +1,7 @@
 from uuid import uuid4
 from PySide6 import QtCore
 import traceback
+from utils.tracing import trace_span
 
 
 class ThreadModel(QtCore.QThread):
@@ -43,10 +44,11 @@ class ThreadModel(QtCore.QThread):
     
     def run(self) -> None:
         try:
-            if self.__opts.get("params") is None:
-                self.__opts["results"] = self.__opts["task"]()
-            else:
-                self.__opts["results"] = self.__opts["task"](self.__opts["params"])
+            with trace_span(self.__id, "thread"):
+                if self.__opts.get("params") is None:
+                    self.__opts["results"] = self.__opts["task"]()
+                else:
+                    self.__opts["results"] = self.__opts["task"](self.__opts["params"])
 
             # flag that no error occurred
             self.__opts["failed"] = False
@@ -0,0 +1,89 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import utils as utils
+
+
+def format_seconds(value: float | None) -> str:
+    return "-" if value is None else f"{value:.2f}"
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Precompute the viewer caches (frame store, overview, statistics) "
+        "of every run under a directory."
+    )
+    parser.add_argument("directory", help="root directory, e.g. data/")
+    parser.add_argument(
+        "-n", "--name", default="csave.h5", help="simulator output file name"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="worker processes (default: number of cpus)",
+    )
+    parser.add_argument(
+        "-c",
+        "--compression",
+        default=None,
+        choices=["gzip", "lzf"],
+        help="compress the frame store chunks",
+    )
+    parser.add_argument(
+        "-f", "--force", action="store_true", help="rebuild up to date caches"
+    )
+    args = parser.parse_args(argv)
+
+    files = utils.find_runs(args.directory, args.name)
+    if len(files) == 0:
+        print(f"No {args.name} found under {args.directory}")
+        return 1
+
+    jobs = max(1, min(args.jobs, len(files)))
+    print(f"Precomputing {len(files)} runs with {jobs} processes")
+
+    opts = {"force": args.force, "compression": args.compression}
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(utils.precompute_run, file, opts) for file in files]
+        for i, future in enumerate(as_completed(futures)):
+            res = future.result()
+            results.append(res)
+            status = "failed" if res["error"] else "done"
+            print(f"[{i + 1}/{len(files)}] {status} {res['file']} in {res['total_s']:.2f}s")
+    wall = time.perf_counter() - start
+
+    # per-file summary, "-" marks an artifact that was already up to date
+    results.sort(key=lambda res: res["file"])
+    width = max(len(res["file"]) for res in results)
+    print(
+        f"\n{'file':<{width}}  {'frames':>6}  {'store':>7}  {'overview':>8}"
+        f"  {'stats':>7}  {'total':>7}"
+    )
+    for res in results:
+        frames = "-" if res["frames"] is None else str(res["frames"])
+        print(
+            f"{res['file']:<{width}}  {frames:>6}  {format_seconds(res['store_s']):>7}"
+            f"  {format_seconds(res['overview_s']):>8}"
+            f"  {format_seconds(res['statistics_s']):>7}  {res['total_s']:>7.2f}"
+        )
+        if res["error"]:
+            print(f"    {res['error']}")
+
+    failed = [res for res in results if res["error"]]
+    busy = sum(res["total_s"] for res in results)
+    print(
+        f"\n{len(results) - len(failed)}/{len(results)} runs in {wall:.2f}s"
+        f" ({busy:.2f}s of work, {busy / max(wall, 1e-9):.1f}x)"
+    )
+    return 1 if len(failed) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
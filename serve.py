@@ -0,0 +1,61 @@
+import argparse
+import sys
+
+import utils as utils
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Serve the colored frames of the runs under a directory to remote "
+        "viewers over HTTP and WebSocket."
+    )
+    parser.add_argument("directory", help="root directory, e.g. data/")
+    parser.add_argument(
+        "-n", "--name", default="csave.h5", help="simulator output file name"
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="interface to listen on (default: localhost)"
+    )
+    parser.add_argument(
+        "-p", "--port", type=int, default=utils.RENDER_SERVICE_PORT, help="port"
+    )
+    parser.add_argument(
+        "--roi",
+        type=float,
+        nargs=2,
+        default=None,
+        metavar=("TOP", "BOTTOM"),
+        help="depth range served, in the unit of the runs",
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=32, help="colored frames cached per run"
+    )
+    args = parser.parse_args(argv)
+
+    service = utils.RenderService(
+        args.directory,
+        {
+            "host": args.host,
+            "port": args.port,
+            "name": args.name,
+            "roi": tuple(args.roi) if args.roi else None,
+            "cache_size": args.cache_size,
+        },
+    )
+    runs = service.runs()
+    if len(runs) == 0:
+        print(f"No {args.name} found under {args.directory}")
+        return 1
+
+    for run in runs:
+        print(f"[{run['id']}] {run['name']}")
+    print(f"Serving {len(runs)} runs on http://{args.host}:{args.port} (ws on /ws)")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
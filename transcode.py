@@ -0,0 +1,51 @@
+import argparse
+import sys
+import time
+
+import utils as utils
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Rewrite simulator results into a viewer-optimized frame store."
+    )
+    parser.add_argument("file", help="simulator output, e.g. data/results/csave.h5")
+    parser.add_argument(
+        "-o", "--output", default=None, help="frame store path (default: <file>.frames.h5)"
+    )
+    parser.add_argument(
+        "-s", "--section", type=int, default=1, help="annulus section index"
+    )
+    parser.add_argument(
+        "-c",
+        "--compression",
+        default=None,
+        choices=["gzip", "lzf"],
+        help="compress the frame chunks",
+    )
+    args = parser.parse_args(argv)
+
+    out_file = args.output or utils.default_store_path(args.file)
+
+    def on_progress(step: int, total: int):
+        print(f"\r[{step}/{total}] {out_file}", end="", flush=True)
+
+    start = time.perf_counter()
+    header = utils.transcode_results(
+        args.file,
+        out_file,
+        {
+            "section": args.section,
+            "compression": args.compression,
+            "on_progress": on_progress,
+        },
+    )
+    print(
+        f"\nWrote {header['time_step'] - 1} frames of shape {header['shape']} "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,96 @@
+import importlib
+
 from .colors import appColors
-from .mesh import *
 from .decorators import errorhandler
 from .signal_bus import signalBus
+from .tracing import (
+    is_tracing,
+    start_tracing,
+    stop_tracing,
+    trace_instant,
+    trace_span,
+    traced,
+    write_chrome_trace,
+)
 from .variables import *
-from .image_processing import load_images_from_directory, load_frames
-from .thread_manager import ThreadManager
\ No newline at end of file
+
+# everything below pulls in pyqtgraph.opengl, h5py or Qt widgets, the owning
+# module is imported on first attribute access instead of with the package
+_LAZY_ATTRIBUTES = {
+    # mesh
+    "apply_rotations": "mesh",
+    "create_mesh_item": "mesh",
+    "compute_vertex_normals": "mesh",
+    "create_slab_geometry": "mesh",
+    "reshape_slab_geometry": "mesh",
+    "create_annulus_geometry": "mesh",
+    "create_frame_colors": "mesh",
+    "create_slab_mesh": "mesh",
+    "create_depth_vertex_array": "mesh",
+    "create_depth_labels": "mesh",
+    "create_text_items": "mesh",
+    "GEOMETRY_CACHE_SIZE": "mesh",
+    # logging
+    "LogSink": "log_sink",
+    # frames
+    "load_images_from_directory": "image_processing",
+    "load_frames": "image_processing",
+    "read_well_geometry": "image_processing",
+    "depth_slice": "image_processing",
+    "cached_store_path": "frame_store",
+    "default_store_path": "frame_store",
+    "transcode_results": "frame_store",
+    "FrameSequence": "frame_sequence",
+    "FrameRing": "frame_ring",
+    "FramePrefetcher": "prefetch",
+    "PlaybackClock": "playback",
+    "read_timesave": "overview",
+    "RunWatcher": "run_watcher",
+    "append_frames": "run_watcher",
+    # picking
+    "PickIndex": "picking",
+    "ConcentrationProbe": "picking",
+    "build_probe_index": "probe_index",
+    "read_probe_series": "probe_index",
+    # export
+    "VideoWriter": "video_export",
+    "FrameEncoder": "video_export",
+    # analytics
+    "compute_fluid_profile": "analytics",
+    "compute_fluid_statistics": "analytics",
+    "load_fluid_statistics": "analytics",
+    # batch
+    "find_runs": "batch",
+    "precompute_run": "batch",
+    # remote viewing
+    "RenderService": "render_service",
+    "RenderClient": "render_service",
+    "encode_frame": "render_service",
+    "decode_frame": "render_service",
+    # memory
+    "MemoryBudget": "memory_budget",
+    "downcast_frames": "memory_budget",
+    "resident_bytes": "memory_budget",
+    # session
+    "default_session_path": "session",
+    "read_session": "session",
+    "write_session": "session",
+    # threads
+    "ThreadManager": "thread_manager",
+    "TaskScheduler": "task_scheduler",
+    "PriorityExecutor": "task_scheduler",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name, None)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # resolved once, later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
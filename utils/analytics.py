@@ -0,0 +1,209 @@
+import os
+import numpy as np
+import h5py
+
+from .cache_files import (
+    is_stamp_current,
+    open_cache,
+    source_stamp,
+    write_cache,
+    write_source_stamp,
+)
+from .image_processing import open_results_file, read_depth_range
+from .overview import read_timesave
+from .variables import STATISTICS_VERSION
+
+
+def default_statistics_path(file: str) -> str:
+    """
+    Returns the statistics cache path used for a simulator output file,
+    e.g. `results/csave.h5` -> `results/csave.stats.h5`.
+    """
+    root, ext = os.path.splitext(file)
+    return f"{root}.stats{ext}"
+
+
+def read_result_array(file: str, name: str) -> np.ndarray | None:
+    "read a solver output written next to the file, e.g. `beta` or `vfracsave`"
+    path = os.path.join(os.path.dirname(file), f"{name}.h5")
+    if not os.path.isfile(path):
+        return None
+    with h5py.File(path, "r") as f:
+        return f[name][()]
+
+
+def compute_fluid_profile(file: str, opts: dict = None) -> np.ndarray:
+    """
+    Reduces the concentration tensor to the azimuthal mean of every fluid at
+    every depth, in one streaming pass over time.
+
+    Parameters:
+        file (str): Path to the simulator output file.
+        opts (dict): Optional settings
+            - section (int): section to reduce. Default 1.
+            - chunk_size (int): timesteps read at once, defaults to the
+              dataset chunking along time.
+            - on_progress (callable): called with (step, total) after each chunk.
+
+    Returns:
+        np.ndarray: Profile of shape (time, fluid, xi).
+    """
+    if opts is None:
+        opts = {}
+
+    section: int = opts.get("section", 1)
+    on_progress = opts.get("on_progress", None)
+
+    with open_results_file(file) as f:
+        csave = f["csave"]
+        time_step, n_fluids, _, n_xi, _ = csave.shape
+        ts = time_step - 1  # the last record is never written
+
+        chunk_size: int = opts.get("chunk_size", None)
+        if chunk_size is None:
+            chunk_size = csave.chunks[0] if csave.chunks is not None else 32
+
+        profile = np.empty((ts, n_fluids, n_xi), dtype=float)
+        for start in range(0, ts, chunk_size):
+            stop = min(start + chunk_size, ts)
+            profile[start:stop] = csave[start:stop, :, section, :, :].mean(axis=3)
+            if on_progress is not None:
+                on_progress(stop, ts)
+
+    return profile
+
+
+def compute_fluid_statistics(profile: np.ndarray, opts: dict = None) -> dict:
+    """
+    Derives the per-fluid statistics from a profile of shape (time, fluid, xi).
+
+    Parameters:
+        profile (np.ndarray): Output of `compute_fluid_profile`.
+        opts (dict): Optional settings
+            - tmd, bmd (float): depth range of the section. Default 0, 800.
+            - tolerance (float): concentration at which a fluid is signalled. Default 0.01.
+            - time (np.ndarray): simulation time of each step.
+            - volume_fractions (np.ndarray): solver volume fractions (time, fluid).
+            - beta (np.ndarray): inclination of each xi cell in radians.
+
+    Returns:
+        dict:
+            - profile (time, fluid, xi): volume fraction per depth over time
+            - volume_fractions (time, fluid): fraction of the section volume
+            - contamination_length (time, fluid): length where the fluid is
+              present but not pure
+            - arrival_time (fluid, xi): first time the fluid is signalled at
+              each depth, nan if never
+            - depths, tvd (xi,): measured and true vertical depth of each cell
+            - time (time,)
+    """
+    if opts is None:
+        opts = {}
+
+    ts, n_fluids, n_xi = profile.shape
+    tmd: float = opts.get("tmd", 0.0)
+    bmd: float = opts.get("bmd", 800.0)
+    tolerance: float = opts.get("tolerance", 0.01)
+    dz = (bmd - tmd) / max(n_xi - 1, 1)
+    depths = np.linspace(tmd, bmd, n_xi)
+
+    time = opts.get("time", None)
+    if time is None or len(time) < ts:
+        time = np.arange(ts, dtype=float)
+    time = np.asarray(time, dtype=float)[:ts]
+
+    volume_fractions = opts.get("volume_fractions", None)
+    if volume_fractions is None or volume_fractions.shape[0] < ts:
+        volume_fractions = profile.mean(axis=2)
+    volume_fractions = volume_fractions[:ts, :n_fluids]
+
+    contaminated = (profile > tolerance) & (profile < 1 - tolerance)
+    contamination_length = contaminated.sum(axis=2) * dz
+
+    present = profile > tolerance  # (time, fluid, xi)
+    first = np.argmax(present, axis=0)  # (fluid, xi)
+    arrival_time = np.where(present.any(axis=0), time[first], np.nan)
+
+    # true vertical depth, beta is the local angle from the vertical
+    tvd = depths.copy()
+    beta = opts.get("beta", None)
+    if beta is not None and len(beta) == n_xi:
+        tvd = tmd + np.concatenate([[0.0], np.cumsum(np.abs(np.cos(beta[:-1]))) * dz])
+
+    return {
+        "profile": profile,
+        "volume_fractions": volume_fractions,
+        "contamination_length": contamination_length,
+        "arrival_time": arrival_time,
+        "depths": depths,
+        "tvd": tvd,
+        "time": time,
+    }
+
+
+def load_fluid_statistics(file: str, opts: dict = None) -> dict:
+    """
+    Returns the per-fluid statistics of a run, computed once and cached next
+    to the file. The cache is rebuilt when the file changed.
+
+    Parameters:
+        file (str): Path to the simulator output file.
+        opts (dict): Passed to `compute_fluid_profile` and `compute_fluid_statistics`,
+            plus `cache` (bool, default True).
+
+    Returns:
+        dict: See `compute_fluid_statistics`.
+    """
+    if opts is None:
+        opts = {}
+
+    if not os.path.isfile(file):
+        raise FileNotFoundError(f"File not found: {file}")
+
+    section: int = opts.get("section", 1)
+    tolerance: float = opts.get("tolerance", 0.01)
+    cache_file = default_statistics_path(file)
+    # taken before reading, a write meanwhile leaves the cache stale
+    stamp = source_stamp(file)
+
+    if opts.get("cache", True):
+        with open_cache(cache_file) as f:
+            if (
+                f is not None
+                and f.attrs.get("version", 0) == STATISTICS_VERSION
+                and f.attrs.get("section", None) == section
+                and f.attrs.get("tolerance", None) == tolerance
+                and is_stamp_current(cache_file, f.attrs, file)
+            ):
+                try:
+                    return {key: f[key][()] for key in f.keys()}
+                except (OSError, KeyError):
+                    pass  # damaged, recomputed like a stale one
+
+    tmd, bmd = read_depth_range(file, section)
+    vfrac = read_result_array(file, "vfracsave")
+    beta = read_result_array(file, "beta")
+
+    profile = compute_fluid_profile(file, opts)
+    statistics = compute_fluid_statistics(
+        profile,
+        {
+            "tmd": tmd,
+            "bmd": bmd,
+            "tolerance": tolerance,
+            "time": read_timesave(file),
+            "volume_fractions": vfrac,
+            "beta": beta[section] if beta is not None and beta.ndim == 2 else None,
+        },
+    )
+
+    if opts.get("cache", True):
+        with write_cache(cache_file) as f:
+            f.attrs["version"] = STATISTICS_VERSION
+            write_source_stamp(f.attrs, stamp)
+            f.attrs["section"] = section
+            f.attrs["tolerance"] = tolerance
+            for key, value in statistics.items():
+                f.create_dataset(key, data=value)
+
+    return statistics
@@ -0,0 +1,141 @@
+import os
+import time
+import numpy as np
+import h5py
+
+from .analytics import default_statistics_path, load_fluid_statistics
+from .frame_store import cached_store_path, default_store_path, transcode_results
+from .image_processing import get_all_file_paths, open_results_file, read_depth_range
+from .overview import (
+    build_overview_chunks,
+    default_overview_path,
+    read_overview,
+    read_timesave,
+    write_overview,
+)
+
+
+def find_runs(directory: str, name: str = "csave.h5") -> list[str]:
+    """
+    Returns the simulator outputs found under a directory, one per result folder.
+
+    Parameters:
+        directory (str): Root directory to walk.
+        name (str): File name of the simulator output. Default `csave.h5`.
+
+    Returns:
+        list[str]: Sorted paths.
+    """
+    if not os.path.isdir(directory):
+        raise NotADirectoryError(f"Directory not found: {directory}")
+
+    return sorted(p for p in get_all_file_paths(directory) if os.path.basename(p) == name)
+
+
+def write_run_overview(file: str, store: str, opts: dict = None) -> int:
+    """
+    Builds and stores the overview index of a run in one streaming pass over
+    time, the concentrations read from the simulator output and the colors
+    from its frame store, a block of timesteps at a time.
+
+    Parameters:
+        file (str): Path to the simulator output file.
+        store (str): Its frame store, see `transcode_results`.
+        opts (dict): Optional settings
+            - section (int): section the overview is built on. Default 1.
+            - chunk_size (int): timesteps read at once, defaults to the
+              dataset chunking along time.
+
+    Returns:
+        int: Number of frames indexed.
+    """
+    if opts is None:
+        opts = {}
+
+    section: int = opts.get("section", 1)
+    tmd, bmd = read_depth_range(file, section)
+
+    with open_results_file(file) as src, h5py.File(store, "r") as dst:
+        csave, rgb = src["csave"], dst["rgb"]
+        ts = rgb.shape[0]
+
+        chunk_size: int = opts.get("chunk_size", None)
+        if chunk_size is None:
+            chunk_size = csave.chunks[0] if csave.chunks is not None else 32
+
+        def chunks():
+            for start in range(0, ts, chunk_size):
+                stop = min(start + chunk_size, ts)
+                images = rgb[start:stop, section].astype(np.float32) / 255.0
+                yield csave[start:stop, :, section, :, :], images
+
+        overview = build_overview_chunks(
+            chunks(), {"tmd": tmd, "bmd": bmd, "time": read_timesave(file)}
+        )
+
+    write_overview(default_overview_path(file), overview, file)
+    return ts
+
+
+def precompute_run(file: str, opts: dict = None) -> dict:
+    """
+    Writes the cache artifacts the viewer opens a run from: the frame store,
+    the overview index and the fluid statistics. Artifacts that are already
+    up to date are kept unless `force` is set.
+
+    Runs in a worker process, the result only holds plain values.
+
+    Parameters:
+        file (str): Path to the simulator output file.
+        opts (dict): Optional settings
+            - force (bool): rebuild every artifact. Default False.
+            - compression (str | None): frame store compression. Default None.
+
+    Returns:
+        dict: file, store_s, overview_s, statistics_s, total_s (seconds, None
+        when skipped), frames and error (None on success).
+    """
+    if opts is None:
+        opts = {}
+
+    force: bool = opts.get("force", False)
+    result = {
+        "file": file,
+        "store_s": None,
+        "overview_s": None,
+        "statistics_s": None,
+        "total_s": 0.0,
+        "frames": None,
+        "error": None,
+    }
+    start = time.perf_counter()
+
+    try:
+        if force or cached_store_path(file) is None:
+            t = time.perf_counter()
+            header = transcode_results(
+                file,
+                default_store_path(file),
+                {"compression": opts.get("compression", None)},
+            )
+            result["store_s"] = time.perf_counter() - t
+            result["frames"] = header["time_step"] - 1
+
+        if force:
+            for cache_file in [default_overview_path(file), default_statistics_path(file)]:
+                if os.path.isfile(cache_file):
+                    os.remove(cache_file)
+
+        if read_overview(default_overview_path(file), file) is None:
+            t = time.perf_counter()
+            result["frames"] = write_run_overview(file, default_store_path(file))
+            result["overview_s"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        load_fluid_statistics(file)  # computed once, then read from its cache
+        result["statistics_s"] = time.perf_counter() - t
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["total_s"] = time.perf_counter() - start
+    return result
@@ -0,0 +1,67 @@
+import os
+from contextlib import contextmanager
+
+import h5py
+
+
+def source_stamp(file: str) -> tuple[int, int]:
+    "modification time in integer nanoseconds and size, exact across filesystems"
+    stat = os.stat(file)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def write_source_stamp(attrs: h5py.AttributeManager, stamp: tuple[int, int]):
+    "record the `source_stamp` a cache was built from in its attributes"
+    attrs["source_mtime_ns"], attrs["source_size"] = stamp
+
+
+def is_stamp_current(
+    cache_file: str, attrs: h5py.AttributeManager, source: str
+) -> bool:
+    """
+    Whether a cache was built from the current `source`: same size and same
+    modification time, or a cache newer than the source, as when both were
+    copied together and the copy changed their times.
+    """
+    mtime_ns, size = source_stamp(source)
+    if attrs.get("source_size", None) != size:
+        return False
+    return (
+        attrs.get("source_mtime_ns", None) == mtime_ns
+        or os.stat(cache_file).st_mtime_ns >= mtime_ns
+    )
+
+
+@contextmanager
+def open_cache(file: str):
+    """
+    Opens a cache file for reading, None when it is missing or unreadable
+    (truncated, not HDF5, locked), which callers treat as stale.
+    """
+    if not os.path.isfile(file):
+        yield None
+        return
+    try:
+        f = h5py.File(file, "r")
+    except OSError:
+        yield None
+        return
+    with f:
+        yield f
+
+
+@contextmanager
+def write_cache(file: str):
+    """
+    Writes a cache file under a temporary name and moves it in place once
+    complete, an interrupted write is never picked up.
+    """
+    tmp_file = f"{file}.tmp"
+    try:
+        with h5py.File(tmp_file, "w") as f:
+            yield f
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    os.replace(tmp_file, file)
@@ -8,7 +8,8 @@ def errorhandler(func):
             return func(*args, **kwargs)
         except Exception as e:
             tb = traceback.format_exc()
-            msg = f"{func.__name__}: {str(e)} \n {tb}"
+            msg = f"{func.__name__}: {str(e)}"
             signalBus.onMessage.emit({"text": msg, "type": "error"})
+            signalBus.onMessage.emit({"text": tb, "type": "debug"})
             traceback.print_exc()
     return wrapper
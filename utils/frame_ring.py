@@ -0,0 +1,193 @@
+import threading
+from multiprocessing import shared_memory
+import numpy as np
+
+# slot states
+FREE = 0
+WRITING = 1
+READY = 2
+FRONT = 3
+
+_TABLE_FIELDS = 3  # state, frame index, publish sequence
+_ALIGNMENT = 64
+
+# blocks closed while their views were still displayed, retried on every close
+_pending: list[shared_memory.SharedMemory] = []
+
+
+def _release(shm: shared_memory.SharedMemory) -> bool:
+    try:
+        shm.close()
+    except BufferError:
+        return False
+    return True
+
+
+class FrameRing:
+    """
+    Preallocated frame slots in shared memory, filled by producers and
+    presented by the GUI thread.
+
+    A slot cycles FREE -> WRITING -> READY -> FRONT -> FREE. Producers write
+    straight into a slot they acquired and publish it with its frame index.
+    The consumer flips to a ready slot, which stays the front buffer until
+    the next flip, so an array handed to a GL item is never overwritten while
+    it is displayed. The slot table lives in the same shared block, another
+    process can attach to it by `name` (pass a `multiprocessing.Lock`).
+    """
+
+    def __init__(self, shape: tuple, opts: dict = None):
+        if opts is None:
+            opts = {}
+
+        self.__shape = tuple(shape)
+        self.__dtype = np.dtype(opts.get("dtype", np.float32))
+        self.__slots: int = opts.get("slots", 3)
+        self.__lock = opts.get("lock", None) or threading.Lock()
+        self.__closed = False
+
+        if self.__slots < 2:
+            raise ValueError("A frame ring needs at least 2 slots")
+
+        table_size = self.__slots * _TABLE_FIELDS * np.dtype(np.int64).itemsize
+        offset = -(-table_size // _ALIGNMENT) * _ALIGNMENT
+        slot_size = int(np.prod(self.__shape)) * self.__dtype.itemsize
+
+        name = opts.get("name", None)
+        self.__owner = name is None
+        self.__shm = shared_memory.SharedMemory(
+            name=name, create=self.__owner, size=offset + self.__slots * slot_size
+        )
+
+        # frombuffer holds the buffer export, the block cannot be unmapped under a view
+        self.__table = np.frombuffer(
+            self.__shm.buf, dtype=np.int64, count=self.__slots * _TABLE_FIELDS
+        ).reshape(self.__slots, _TABLE_FIELDS)
+        self.__data = np.frombuffer(
+            self.__shm.buf,
+            dtype=self.__dtype,
+            count=self.__slots * int(np.prod(self.__shape)),
+            offset=offset,
+        ).reshape(self.__slots, *self.__shape)
+        if self.__owner:
+            self.__table[:] = [FREE, -1, 0]
+
+    # region getters
+    def name(self) -> str:
+        return self.__shm.name
+
+    def shape(self) -> tuple:
+        return self.__shape
+
+    def slots(self) -> int:
+        return self.__slots
+
+    def nbytes(self) -> int:
+        "size of the frame slots"
+        return self.__slots * int(np.prod(self.__shape)) * self.__dtype.itemsize
+
+    def isClosed(self) -> bool:
+        return self.__closed
+
+    def buffer(self, slot: int) -> np.ndarray:
+        "the array of a slot, only write to it between `acquire` and `publish`"
+        with self.__lock:
+            return None if self.__closed else self.__data[slot]
+
+    def front(self) -> np.ndarray | None:
+        "the array currently presented, None before the first flip"
+        with self.__lock:
+            if self.__closed:
+                return None
+            slot = self.__find(FRONT)
+            return None if slot is None else self.__data[slot]
+
+    def frontIndex(self) -> int | None:
+        with self.__lock:
+            if self.__closed:
+                return None
+            slot = self.__find(FRONT)
+            return None if slot is None else int(self.__table[slot, 1])
+
+    # endregion
+
+    # region workers
+    def __find(self, state: int, frame_index: int = None) -> int | None:
+        "oldest slot in a state, optionally holding a frame"
+        match = self.__table[:, 0] == state
+        if frame_index is not None:
+            match &= self.__table[:, 1] == frame_index
+        slots = np.flatnonzero(match)
+        if len(slots) == 0:
+            return None
+        return int(slots[np.argmin(self.__table[slots, 2])])
+
+    def acquire(self) -> int | None:
+        """
+        Reserves a slot for writing. When every slot is taken the oldest
+        frame not yet presented is dropped. None once the ring is closed.
+        """
+        with self.__lock:
+            if self.__closed:
+                return None
+            slot = self.__find(FREE)
+            if slot is None:
+                slot = self.__find(READY)
+            if slot is None:
+                return None
+            self.__table[slot, 0] = WRITING
+            return slot
+
+    def publish(self, slot: int, frame_index: int):
+        "hand a written slot over to the consumer"
+        with self.__lock:
+            if self.__closed or self.__table[slot, 0] != WRITING:
+                return
+            sequence = self.__table[:, 2].max() + 1
+            self.__table[slot] = [READY, frame_index, sequence]
+
+    def discard(self, slot: int):
+        "give back a slot without publishing it"
+        with self.__lock:
+            if not self.__closed and self.__table[slot, 0] == WRITING:
+                self.__table[slot, :2] = [FREE, -1]
+
+    def flip(self, frame_index: int = None) -> np.ndarray | None:
+        """
+        Presents the ready slot holding `frame_index`, or the newest ready
+        slot when None. The previous front slot is released.
+
+        Returns:
+            np.ndarray | None: The new front array, None if nothing is ready.
+        """
+        with self.__lock:
+            if self.__closed:
+                return None
+            ready = np.flatnonzero(self.__table[:, 0] == READY)
+            if frame_index is not None:
+                ready = ready[self.__table[ready, 1] == frame_index]
+            if len(ready) == 0:
+                return None
+            slot = int(ready[np.argmax(self.__table[ready, 2])])
+
+            self.__table[self.__table[:, 0] == FRONT, 0] = FREE
+            self.__table[slot, 0] = FRONT
+            return self.__data[slot]
+
+    def close(self):
+        "release the shared block, the owner also unlinks it"
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+
+        self.__table = None
+        self.__data = None
+        if self.__owner:
+            self.__shm.unlink()
+
+        # views may still be displayed, the mapping is released with the last of them
+        _pending.append(self.__shm)
+        _pending[:] = [shm for shm in _pending if not _release(shm)]
+
+    # endregion
@@ -0,0 +1,152 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+
+from .variables import FRAME_STORE_FORMAT
+from .image_processing import (
+    blend_fluid_colors,
+    depth_slice,
+    fluid_color_array,
+    open_results_file,
+    read_depth_range,
+    slice_depth_range,
+)
+
+
+class FrameSequence:
+    """
+    Lazy, frame-by-frame access to the colored frames of a run.
+
+    Accepts either a simulator output (`csave`) or a frame store. Frames are
+    read and colored on first access and kept in a small LRU cache, so a run
+    only costs the memory of the frames actually looked at. With a `roi`
+    (top, bottom) depth range only those rows are read.
+    """
+
+    def __init__(self, file: str, opts: dict = None):
+        if opts is None:
+            opts = {}
+
+        if not os.path.isfile(file):
+            raise FileNotFoundError(f"File not found: {file}")
+
+        self.__file = file
+        self.__section: int = opts.get("section", 1)
+        self.__cacheSize: int = opts.get("cache_size", 16)
+        self.__cache: OrderedDict[int, np.ndarray] = OrderedDict()
+        self.__lock = threading.Lock()
+
+        self.__h5 = open_results_file(file)
+        self.__isStore = self.__h5.attrs.get("format", "") == FRAME_STORE_FORMAT
+
+        if self.__isStore:
+            self.__dataset = self.__h5["rgb"]
+            n_frames, _, n_xi, n_zeta, _ = self.__dataset.shape
+            self.__header = {
+                "tmd": float(self.__h5.attrs["tmd"]),
+                "bmd": float(self.__h5.attrs["bmd"]),
+                "unit": str(self.__h5.attrs["unit"]),
+                "time_step": int(self.__h5.attrs["time_step"]),
+            }
+            self.__colors = None
+        else:
+            self.__dataset = self.__h5["csave"]
+            time_step, n_fluids, _, n_xi, n_zeta = self.__dataset.shape
+            tmd, bmd = read_depth_range(file, self.__section)
+            # the solver preallocates the last record, it is never written
+            n_frames = time_step - 1
+            self.__header = {
+                "tmd": tmd,
+                "bmd": bmd,
+                "unit": "m",
+                "time_step": time_step,
+            }
+            self.__colors = fluid_color_array(n_fluids)
+
+        roi = opts.get("roi", None)
+        tmd, bmd = self.__header["tmd"], self.__header["bmd"]
+        self.__xi = depth_slice(n_xi, tmd, bmd, roi)
+        if roi is not None:
+            self.__header["tmd"], self.__header["bmd"] = slice_depth_range(
+                self.__xi, n_xi, tmd, bmd
+            )
+
+        self.__length = n_frames
+        self.__header["nxi"] = self.__xi.stop - self.__xi.start
+        self.__header["nzeta"] = n_zeta
+
+    # region setters
+    def setCacheSize(self, size: int):
+        "frames kept, the least recently used are dropped first"
+        with self.__lock:
+            self.__cacheSize = max(int(size), 1)
+            while len(self.__cache) > self.__cacheSize:
+                self.__cache.popitem(last=False)
+
+    # endregion
+
+    # region getters
+    def file(self) -> str:
+        return self.__file
+
+    def header(self) -> dict:
+        "same keys as `load_frames` without the images"
+        return dict(self.__header)
+
+    def shape(self) -> tuple[int, int]:
+        return self.__header["nxi"], self.__header["nzeta"]
+
+    def cacheSize(self) -> int:
+        return self.__cacheSize
+
+    def cacheBytes(self) -> int:
+        with self.__lock:
+            return sum(frame.nbytes for frame in self.__cache.values())
+
+    # endregion
+
+    # region workers
+    def read(self, index: int) -> np.ndarray:
+        "read and color a frame, bypassing the cache"
+        if self.__isStore:
+            rgb = self.__dataset[index, self.__section, self.__xi]
+            return rgb.astype(np.float32) / 255.0
+
+        c_vals = self.__dataset[index, :, self.__section, self.__xi, :]
+        w_c_vals = blend_fluid_colors(c_vals, self.__colors)
+        w_c_vals = np.flip(w_c_vals, axis=1)  # for backwards flow
+        return np.clip(w_c_vals, 0.0, 1.0).astype(np.float32)
+
+    def close(self):
+        with self.__lock:
+            self.__cache.clear()
+        if self.__h5.id.valid:
+            self.__h5.close()
+
+    # endregion
+
+    # region override
+    def __len__(self) -> int:
+        return self.__length
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        if index < 0:
+            index += self.__length
+        if index not in range(self.__length):
+            raise IndexError(f"Frame <{index}> out of bounds <0, {self.__length - 1}>")
+
+        with self.__lock:
+            frame = self.__cache.get(index)
+            if frame is not None:
+                self.__cache.move_to_end(index)
+                return frame
+
+        frame = self.read(index)
+        with self.__lock:
+            self.__cache[index] = frame
+            if len(self.__cache) > self.__cacheSize:
+                self.__cache.popitem(last=False)
+        return frame
+
+    # endregion
@@ -0,0 +1,134 @@
+import os
+import json
+import numpy as np
+
+from .cache_files import (
+    is_stamp_current,
+    open_cache,
+    source_stamp,
+    write_cache,
+    write_source_stamp,
+)
+from .image_processing import (
+    blend_fluid_colors,
+    fluid_color_array,
+    is_frame_store,
+    open_results_file,
+    read_depth_range,
+)
+from .variables import FLUIDS, FRAME_STORE_FORMAT, FRAME_STORE_VERSION
+
+
+def default_store_path(file: str) -> str:
+    """
+    Returns the frame store path used for a simulator output file,
+    e.g. `results/csave.h5` -> `results/csave.frames.h5`.
+    """
+    root, ext = os.path.splitext(file)
+    return f"{root}.frames{ext}"
+
+
+def cached_store_path(file: str) -> str | None:
+    """
+    Returns the frame store of a simulator output when one is cached next to
+    it and still up to date, None otherwise. Frame stores resolve to themselves.
+    """
+    if is_frame_store(file):
+        return file
+
+    store = default_store_path(file)
+    with open_cache(store) as f:
+        if (
+            f is not None
+            and f.attrs.get("format", "") == FRAME_STORE_FORMAT
+            and is_stamp_current(store, f.attrs, file)
+        ):
+            return store
+    return None
+
+
+def transcode_results(file: str, out_file: str = None, opts: dict = None) -> dict:
+    """
+    Rewrites a simulator output (`csave`) into a viewer-optimized frame store.
+
+    The store holds a single uint8 dataset `rgb` of shape
+    (time_step, n_sections, n_xi, n_zeta, 3) chunked as one chunk per timestep
+    and section, already blended and oriented the way `load_frames` renders it.
+    The header (file attributes) carries the shape, fluids and depth range.
+
+    Parameters:
+        file (str): Path to the simulator output file.
+        out_file (str): Path of the frame store, defaults to `default_store_path`.
+        opts (dict): Optional settings
+            - section (int): the annulus section, flipped for backwards flow. Default 1.
+            - compression (str | None): h5py compression filter. Default None.
+            - on_progress (callable): called with (step, total) after each timestep.
+
+    Returns:
+        dict: The header written to the store.
+    """
+    if opts is None:
+        opts = {}
+
+    if not os.path.isfile(file):
+        raise FileNotFoundError(f"File not found: {file}")
+
+    if out_file is None:
+        out_file = default_store_path(file)
+
+    section: int = opts.get("section", 1)
+    compression: str = opts.get("compression", None)
+    on_progress = opts.get("on_progress", None)
+
+    # taken before reading, a write meanwhile leaves the store stale
+    stamp = source_stamp(file)
+    with open_results_file(file) as src:
+        csave = src["csave"]
+        time_step, n_fluids, n_sections, n_xi, n_zeta = csave.shape
+
+        # the solver preallocates the last record, it is never written
+        ts = time_step - 1
+        tmd, bmd = read_depth_range(file, section)
+        color_arr = fluid_color_array(n_fluids)
+
+        header = {
+            "format": FRAME_STORE_FORMAT,
+            "version": FRAME_STORE_VERSION,
+            "source": os.path.abspath(file),
+            "shape": [time_step, n_fluids, n_sections, n_xi, n_zeta],
+            "fluids": json.dumps(list(FLUIDS.values())[:n_fluids]),
+            "section": section,
+            "time_step": time_step,
+            "tmd": tmd,
+            "bmd": bmd,
+            "unit": "m",
+        }
+
+        with write_cache(out_file) as dst:
+            for k, v in header.items():
+                dst.attrs[k] = v
+            write_source_stamp(dst.attrs, stamp)
+
+            rgb = dst.create_dataset(
+                "rgb",
+                shape=(ts, n_sections, n_xi, n_zeta, 3),
+                dtype=np.uint8,
+                chunks=(1, 1, n_xi, n_zeta, 3),
+                compression=compression,
+            )
+
+            for j in range(ts):
+                # one read per timestep whatever the source chunking is
+                c_vals = csave[j]
+                for k in range(n_sections):
+                    w_c_vals = blend_fluid_colors(c_vals[:, k, :, :], color_arr)
+                    if k == section:
+                        w_c_vals = np.flip(w_c_vals, axis=1)  # for backwards flow
+
+                    w_c_vals = np.clip(w_c_vals, 0.0, 1.0)
+                    rgb[j, k] = np.round(w_c_vals * 255).astype(np.uint8)
+
+                if on_progress is not None:
+                    on_progress(j + 1, ts)
+
+    return header
@@ -1,10 +1,17 @@
 import os
 import numpy as np
-import scipy.ndimage as snd
 
 from PySide6.QtGui import QColor
-from PIL import Image
-from .variables import FLUIDS
+from .variables import FLUIDS, FRAME_STORE_FORMAT
+from .signal_bus import signalBus
+from .tracing import traced
+from .overview import (
+    build_overview,
+    default_overview_path,
+    read_overview,
+    read_timesave,
+    write_overview,
+)
 import h5py
 
 
@@ -14,6 +21,7 @@ def scale_with_pillow(
     """
     scales an image using pillow
     """
+    from PIL import Image  # deferred, only needed when scaling
 
     f_x, f_y = 1, 1
     if isinstance(factor, tuple):
@@ -42,6 +50,7 @@ def apply_gaussian_filter(
     dimensions: a list integers of values 0 and 1. 0 for dimensions to be omited during filtration.
     len(dimensions) == len(arr.shape)
     """
+    import scipy.ndimage as snd  # deferred, slow to import
     r = factor * multiplier
 
     # create the filter kernel
@@ -94,6 +103,8 @@ def read_image(image_path: str) -> np.ndarray:
     if not os.path.isfile(image_path):
         raise FileNotFoundError(f"Image file not found: {image_path}")
 
+    from PIL import Image  # deferred, only needed for image directories
+
     image = Image.open(image_path).convert("RGBA")  # ensures 4 channels
     return np.array(image) / 255.0  # normalize to [0, 1] float range
 
@@ -116,41 +127,316 @@ def load_images_from_directory(directory: str) -> list[np.ndarray]:
     return images
 
 
-def extract_conc_from_h5file(file: str) -> np.ndarray:
-    f = h5py.File(file, "r")
-    d = f["csave"][:]
+def read_depth_range(file: str, section: int = 1) -> tuple[float, float]:
+    """
+    Reads the depth range of a section from the `DTubelength.h5` file
+    written next to the simulator output. Falls back to (0, 800).
+
+    Parameters:
+        file (str): Path to the simulator output file.
+        section (int): Section whose length is used as the bottom depth.
+
+    Returns:
+        tuple[float, float]: (tmd, bmd)
+    """
+    length_file = os.path.join(os.path.dirname(file), "DTubelength.h5")
+    if not os.path.isfile(length_file):
+        return 0.0, 800.0
+
+    with h5py.File(length_file, "r") as f:
+        lengths = np.ravel(f["DTubelength"][()])
+    return 0.0, float(lengths[min(section, len(lengths) - 1)])
+
+
+def open_results_file(file: str) -> h5py.File:
+    """
+    Opens a simulator output read only, with SWMR access when the file
+    allows it so the handle sees timesteps appended by a running solver.
+
+    HDF5 shares one handle per file within a process and refuses to mix
+    SWMR and plain access, every handle kept open on a results file should
+    come from here.
+    """
+    try:
+        return h5py.File(file, "r", libver="latest", swmr=True)
+    except OSError:
+        return h5py.File(file, "r")
+
+
+def find_geometry_file(file: str) -> str | None:
+    "the `geometry.txt` of a run, next to the output or in `../params`"
+    directory = os.path.dirname(os.path.abspath(file))
+    for candidate in [
+        os.path.join(directory, "geometry.txt"),
+        os.path.join(directory, os.pardir, "params", "geometry.txt"),
+    ]:
+        if os.path.isfile(candidate):
+            return os.path.normpath(candidate)
+    return None
+
+
+def read_well_geometry(
+    file: str, n_xi: int, tmd: float, bmd: float, section: int = 1
+) -> dict:
+    """
+    Reads the well geometry of a run and interpolates it at every depth cell.
+
+    The `geometry.txt` input (MD, ID, OD, e, roughness, inclination in
+    degrees) is used when found, see `find_geometry_file`. Otherwise the
+    diameters of the section come from `DTubeID.h5` / `DTubeOD.h5` and the
+    well is concentric and vertical.
+
+    Parameters:
+        file (str): Path to the simulator output file or its frame store.
+        n_xi (int): Number of depth cells, spread evenly over [tmd, bmd].
+        tmd (float): Depth of the first cell.
+        bmd (float): Depth of the last cell.
+        section (int): Section whose diameters are used by the fallback.
+
+    Returns:
+        dict: md, inner_diameter, outer_diameter, eccentricity and
+        inclination (radians), each of shape (n_xi,).
+    """
+    md = np.linspace(tmd, bmd, n_xi)
+    geometry_file = find_geometry_file(file)
+
+    if geometry_file is not None:
+        table = np.loadtxt(geometry_file, delimiter=",", comments="#", ndmin=2)
+        table = table[np.argsort(table[:, 0])]
+        return {
+            "md": md,
+            "inner_diameter": np.interp(md, table[:, 0], table[:, 1]),
+            "outer_diameter": np.interp(md, table[:, 0], table[:, 2]),
+            "eccentricity": np.interp(md, table[:, 0], table[:, 3]),
+            "inclination": np.radians(np.interp(md, table[:, 0], table[:, 5])),
+        }
+
+    directory = os.path.dirname(file)
+    diameters = []
+    for name, default in [("DTubeID", 0.2), ("DTubeOD", 0.25)]:
+        path = os.path.join(directory, f"{name}.h5")
+        if not os.path.isfile(path):
+            diameters.append(default)
+            continue
+        with h5py.File(path, "r") as f:
+            values = np.ravel(f[name][()])
+        diameters.append(float(values[min(section, len(values) - 1)]))
+
+    return {
+        "md": md,
+        "inner_diameter": np.full(n_xi, diameters[0]),
+        "outer_diameter": np.full(n_xi, diameters[1]),
+        "eccentricity": np.zeros(n_xi),
+        "inclination": np.zeros(n_xi),
+    }
+
+
+def depth_slice(n_xi: int, tmd: float, bmd: float, roi: tuple = None) -> slice:
+    """
+    Returns the xi rows covering a depth range of interest.
+
+    Parameters:
+        n_xi (int): Number of depth cells, spread evenly over [tmd, bmd].
+        tmd (float): Top of the section.
+        bmd (float): Bottom of the section.
+        roi (tuple): (top, bottom) of the range of interest, either may be None.
+
+    Returns:
+        slice: Rows to read, the whole section when roi is None.
+    """
+    if roi is None:
+        return slice(0, n_xi)
+
+    top, bottom = roi
+    top = tmd if top is None else max(top, tmd)
+    bottom = bmd if bottom is None else min(bottom, bmd)
+    if bottom <= top:
+        raise ValueError(f"Empty depth range <{top}, {bottom}>")
+
+    dz = (bmd - tmd) / max(n_xi - 1, 1)
+    start = int(np.floor((top - tmd) / dz + 1e-9))
+    stop = int(np.ceil((bottom - tmd) / dz - 1e-9)) + 1
+    return slice(max(start, 0), min(stop, n_xi))
+
+
+def slice_depth_range(xi: slice, n_xi: int, tmd: float, bmd: float) -> tuple[float, float]:
+    "depth of the first and last row of a slice"
+    depths = np.linspace(tmd, bmd, n_xi)
+    return float(depths[xi.start]), float(depths[xi.stop - 1])
+
+
+def extract_conc_from_h5file(file: str, xi: slice = None) -> np.ndarray:
+    """
+    Reads the concentrations, only the rows in `xi` are read from disk.
+    """
+    if xi is None:
+        xi = slice(None)
+    f = open_results_file(file)
+    d = f["csave"][:, :, :, xi, :]
     f.close()
     return np.array(d)
 
 
-def load_frames(file: str) -> dict:
+def fluid_color_array(n_fluids: int) -> np.ndarray:
+    """
+    Returns the RGB colors of the first n_fluids entries of FLUIDS.
+
+    Parameters:
+        n_fluids (int): Number of fluids in the concentration tensor.
+
+    Returns:
+        np.ndarray: Array of shape (n_fluids, 3) with values in [0, 1].
+    """
+    fluids = list(FLUIDS.values())
+    color_arr = []
+    for i in range(n_fluids):
+        r, g, b, _ = QColor(fluids[i]["color"]).getRgbF()
+        color_arr.append([r, g, b])
+    return np.array(color_arr, dtype=float)
+
+
+def blend_fluid_colors(c_vals: np.ndarray, color_arr: np.ndarray) -> np.ndarray:
+    """
+    Blends the fluid colors using the concentrations as weights.
+
+    Parameters:
+        c_vals (np.ndarray): Concentrations of shape (n_fluids, n_xi, n_zeta).
+        color_arr (np.ndarray): Fluid colors of shape (n_fluids, 3).
+
+    Returns:
+        np.ndarray: RGB image of shape (n_xi, n_zeta, 3).
+    """
+    a_sum = np.sum(c_vals, axis=0)
+    a_sum[a_sum == 0] = 1  # replace all zero-sums with 1
+    return np.tensordot(c_vals, color_arr, axes=(0, 0)) / a_sum[..., np.newaxis]
+
+
+def is_frame_store(file: str) -> bool:
+    """
+    Checks whether a file is a viewer frame store written by `transcode_results`.
+
+    Parameters:
+        file (str): Path to the .h5 file.
+
+    Returns:
+        bool: True if the file carries the frame store header.
+    """
+    with open_results_file(file) as f:
+        return f.attrs.get("format", "") == FRAME_STORE_FORMAT
+
+
+def load_frame_store(file: str, section: int = 1, roi: tuple = None) -> dict:
+    """
+    Loads precomputed RGB frames from a frame store.
+
+    Each (timestep, section) pair is stored as a single uint8 chunk, so this
+    is one contiguous read per frame and no color blending.
+
+    Parameters:
+        file (str): Path to the frame store.
+        section (int): Section to load, defaults to the annulus.
+        roi (tuple): (top, bottom) depth range to load, see `depth_slice`.
+
+    Returns:
+        dict: Dictionary containing loaded frames, same keys as `load_frames`.
+    """
+    with h5py.File(file, "r") as f:
+        rgb = f["rgb"]
+        _, _, n_xi, n_zeta, _ = rgb.shape
+        tmd, bmd = float(f.attrs["tmd"]), float(f.attrs["bmd"])
+        xi = depth_slice(n_xi, tmd, bmd, roi)
+
+        images = rgb[:, section, xi, :, :].astype(np.float32) / 255.0
+        source = str(f.attrs.get("source", file))
+
+        overview = None
+        if roi is None:
+            overview = read_overview(default_overview_path(source), source)
+        else:
+            tmd, bmd = slice_depth_range(xi, n_xi, tmd, bmd)
+
+        return {
+            "images": images,
+            "tmd": tmd,
+            "bmd": bmd,
+            "unit": str(f.attrs["unit"]),
+            "nxi": images.shape[1],
+            "nzeta": n_zeta,
+            "time_step": int(f.attrs["time_step"]),
+            "overview": overview,
+        }
+
+
+def load_overview(file: str, data: np.ndarray, frames: np.ndarray, opts: dict) -> dict:
+    """
+    Reads the overview index stored next to the file, or builds and stores it
+    when it is missing or older than the file.
+
+    Parameters:
+        file (str): Path to the simulator output file.
+        data (np.ndarray): Concentrations of shape (time, fluid, section, xi, zeta).
+        frames (np.ndarray): Colored frames of shape (time, xi, zeta, 3).
+        opts (dict): Passed to `build_overview`.
+
+    Returns:
+        dict: The overview index.
+    """
+    overview_file = default_overview_path(file)
+    overview = read_overview(overview_file, file)
+    if overview is not None:
+        return overview
+
+    overview = build_overview(data, frames, {**opts, "time": read_timesave(file)})
+    try:
+        write_overview(overview_file, overview, file)
+    except OSError as e:
+        signalBus.onMessage.emit(
+            {"text": f"Cannot store overview index <{overview_file}>: {e}", "type": "warning"}
+        )
+    return overview
+
+
+@traced(cat="io")
+def load_frames(file: str, opts: dict = None) -> dict:
     """
     Loads frames from a specified file.
 
     Parameters:
         file (str): Path to the file containing frames.
+        opts (dict): Optional settings
+            - roi (tuple): (top, bottom) depth range to load. Only these rows
+              are read, colored and meshed. Default None, the whole section.
 
     Returns:
         dict: Dictionary containing loaded frames.
     """
+    if opts is None:
+        opts = {}
+
     if not os.path.isfile(file):
         raise FileNotFoundError(f"File not found: {file}")
 
-    data: np.ndarray = extract_conc_from_h5file(file)
-    tmd = 0
-    bmd = 800
-    unit = "m"
-
+    roi: tuple = opts.get("roi", None)
     section = 1
 
+    if is_frame_store(file):
+        return load_frame_store(file, section, roi)
+
+    with open_results_file(file) as f:
+        n_xi = f["csave"].shape[3]
+    tmd, bmd = read_depth_range(file, section)
+    xi = depth_slice(n_xi, tmd, bmd, roi)
+
+    # hyperslab selection, rows outside the range of interest are never read
+    data: np.ndarray = extract_conc_from_h5file(file, xi)
+    if roi is not None:
+        tmd, bmd = slice_depth_range(xi, n_xi, tmd, bmd)
+    unit = "m"
+
     time_step, n_fluids, n_sections, n_xi, n_zeta = data.shape
 
-    color_arr = []
-    fluids = list(FLUIDS.values())
+    color_arr = fluid_color_array(n_fluids)
     ch = 3  # RGB channels
-    for i in range(n_fluids):
-        r, g, b, _ = QColor(fluids[i]["color"]).getRgbF()
-        color_arr.append([r, g, b])
 
     base_colors = np.zeros((n_fluids, n_xi, n_zeta, ch))
     for i in range(n_fluids):
@@ -175,13 +461,7 @@ def load_frames(file: str) -> dict:
             c, _, n = c_vals.shape
 
             if k == section:  # only the annulus section
-                alphas = c_vals.copy()
-                a_sum = np.sum(alphas, axis=0)
-                a_sum[a_sum == 0] = 1  # replace all zero-sums with 1
-                w_c_vals: np.ndarray = (
-                    np.sum(base_colors * alphas[..., np.newaxis], axis=0)
-                    / a_sum[..., np.newaxis]
-                )
+                w_c_vals: np.ndarray = blend_fluid_colors(c_vals, color_arr)
                 if rotate:
                     w_c_vals = np.rot90(w_c_vals, k=1)  # k=1 => 90° counter-clockwise
                 else:
@@ -239,6 +519,12 @@ def load_frames(file: str) -> dict:
     frames[frames > 1] = 1.0
     frames[frames < 0] = 0.0
 
+    overview = None
+    if annlus_only and roi is None:
+        overview = load_overview(
+            file, data, frames, {"section": section, "tmd": tmd, "bmd": bmd}
+        )
+
     return {
         "images": frames,
         "tmd": tmd,
@@ -247,4 +533,5 @@ def load_frames(file: str) -> dict:
         "nxi": n_xi,
         "nzeta": n_zeta,
         "time_step": time_step,
+        "overview": overview,
     }
@@ -0,0 +1,92 @@
+import time
+from collections import deque
+from PySide6.QtCore import QObject, QTimer, Signal
+from .variables import LOG_LEVEL_RANKS
+
+
+class LogSink(QObject):
+    """
+    Buffers log records and hands them over in batches.
+
+    Records below the current level are dropped on arrival. Accepted records
+    are queued and flushed at most once per interval through `onFlush`, so a
+    burst of messages costs a single console update. Both the queue and the
+    history are ring buffers of `capacity` records.
+    """
+
+    onFlush = Signal(list)
+
+    def __init__(self, opts: dict = None):
+        super().__init__()
+        if opts is None:
+            opts = {}
+
+        self.__capacity: int = opts.get("capacity", 2000)
+        self.__level: str = opts.get("level", "event")
+        self.__pending: deque[dict] = deque(maxlen=self.__capacity)
+        self.__history: deque[dict] = deque(maxlen=self.__capacity)
+        self.__dropped = 0
+
+        self.__timer = QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.setInterval(opts.get("interval", 100))
+        self.__timer.timeout.connect(self.flush)
+
+    # region setters
+    def setLevel(self, level: str):
+        if level not in LOG_LEVEL_RANKS:
+            raise ValueError(f"Unknown log level <{level}>")
+        self.__level = level
+
+    # endregion
+
+    # region getters
+    def level(self) -> str:
+        return self.__level
+
+    def capacity(self) -> int:
+        return self.__capacity
+
+    def history(self) -> list[dict]:
+        return list(self.__history)
+
+    # endregion
+
+    # region workers
+    def accepts(self, level: str) -> bool:
+        rank = LOG_LEVEL_RANKS.get(level, LOG_LEVEL_RANKS["message"])
+        return rank >= LOG_LEVEL_RANKS[self.__level]
+
+    def push(self, text: str, level: str = "message"):
+        if not self.accepts(level):
+            return
+
+        if len(self.__pending) == self.__capacity:
+            self.__dropped += 1
+
+        self.__pending.append({"text": text, "type": level, "time": time.time()})
+        if not self.__timer.isActive():
+            self.__timer.start()
+
+    def flush(self):
+        self.__timer.stop()
+        if len(self.__pending) == 0:
+            return
+
+        records = list(self.__pending)
+        self.__pending.clear()
+        if self.__dropped > 0:
+            records.insert(
+                0,
+                {
+                    "text": f"{self.__dropped} messages dropped",
+                    "type": "warning",
+                    "time": records[0]["time"],
+                },
+            )
+            self.__dropped = 0
+
+        self.__history.extend(records)
+        self.onFlush.emit(records)
+
+    # endregion
@@ -0,0 +1,210 @@
+import os
+import tempfile
+import time
+import uuid
+import numpy as np
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from .signal_bus import signalBus
+from .variables import MEMORY_BUDGET_MB, MEMORY_REFRESH_INTERVAL
+
+
+def resident_bytes(*arrays) -> int:
+    "bytes held in RAM by arrays, memory mapped arrays live on disk"
+    total = 0
+    for array in arrays:
+        if isinstance(array, np.ndarray) and not isinstance(array, np.memmap):
+            total += array.nbytes
+    return total
+
+
+def downcast_frames(frames: np.ndarray) -> np.ndarray:
+    "half precision copy of colors in [0, 1], enough for 8 bit displays"
+    if frames.dtype == np.float16:
+        return frames
+    return frames.astype(np.float16)
+
+
+class MemoryBudget(QObject):
+    """
+    Accounts the memory held by the loaded artifacts and keeps it under a
+    budget.
+
+    Artifacts are registered with a `measure` callable returning the bytes
+    they hold, sizes are measured again every refresh so growing caches are
+    seen too. An artifact may come with `reducers`, callables that shrink it
+    (lower precision, spill to disk, smaller cache) in order of cost. Over
+    budget, the least recently used artifacts are reduced first, one step at
+    a time, until the total fits. Every refresh emits `onUsageChanged`.
+
+    Must be used from the GUI thread.
+    """
+
+    onUsageChanged = Signal(dict)
+
+    def __init__(self, opts: dict = None):
+        super().__init__()
+        if opts is None:
+            opts = {}
+
+        self.__budget: int = int(opts.get("budget_mb", MEMORY_BUDGET_MB) * 2**20)
+        self.__spillDir: str = opts.get(
+            "spill_dir", os.path.join(tempfile.gettempdir(), "gap-thickness-plot")
+        )
+        self.__artifacts: dict[str, dict] = {}
+        self.__warned = False
+
+        self.__timer = QTimer(self)
+        self.__timer.setInterval(opts.get("interval", MEMORY_REFRESH_INTERVAL))
+        self.__timer.timeout.connect(self.refresh)
+        self.__timer.start()
+
+    # region setters
+    def setBudget(self, budget_mb: float):
+        self.__budget = int(budget_mb * 2**20)
+        self.__warned = False
+        self.refresh()
+
+    # endregion
+
+    # region getters
+    def budget(self) -> int:
+        return self.__budget
+
+    def total(self) -> int:
+        return sum(a["bytes"] for a in self.__artifacts.values())
+
+    def usage(self) -> dict:
+        "total and budget in bytes, label, bytes and reduction level per artifact"
+        return {
+            "total": self.total(),
+            "budget": self.__budget,
+            "artifacts": {
+                key: {
+                    "label": a["label"],
+                    "bytes": a["bytes"],
+                    "level": a["level"],
+                }
+                for key, a in self.__artifacts.items()
+            },
+        }
+
+    # endregion
+
+    # region workers
+    def track(self, key: str, opts: dict):
+        """
+        Registers an artifact. Tracking a key again updates its measure,
+        reducers and label but keeps how far it was reduced and its spill
+        files, `reset` or `release` it when its data was replaced.
+
+        Parameters:
+            key (str): Unique name of the artifact.
+            opts (dict):
+                - measure (callable): () -> bytes held in RAM.
+                - reducers (list[callable]): steps that shrink the artifact.
+                - label (str): shown in the usage summary. Default key.
+        """
+        artifact = self.__artifacts.setdefault(
+            key, {"level": 0, "bytes": 0, "used": time.monotonic(), "files": []}
+        )
+        artifact.update(
+            {
+                "label": opts.get("label", key),
+                "measure": opts["measure"],
+                "reducers": list(opts.get("reducers", [])),
+            }
+        )
+        self.refresh()
+
+    def touch(self, key: str):
+        "mark an artifact as used, it is reduced after the idle ones"
+        artifact = self.__artifacts.get(key)
+        if artifact is not None:
+            artifact["used"] = time.monotonic()
+
+    def reset(self, key: str):
+        """
+        The artifact was rebuilt in RAM, e.g. grown out of its spill file, so
+        its reducers may run again. Its old spill files are deleted.
+        """
+        artifact = self.__artifacts.get(key)
+        if artifact is None:
+            return
+        self.__removeFiles(artifact)
+        artifact["level"] = 0
+        self.__warned = False
+
+    def release(self, key: str):
+        "forget an artifact and delete its spill files"
+        artifact = self.__artifacts.pop(key, None)
+        if artifact is not None:
+            self.__removeFiles(artifact)
+
+    def spill(self, key: str, array: np.ndarray) -> np.memmap:
+        """
+        Writes an array to a file owned by the artifact and maps it back read
+        only. The pages are then backed by the file, the OS can drop them.
+        """
+        os.makedirs(self.__spillDir, exist_ok=True)
+        file = os.path.join(self.__spillDir, f"{uuid.uuid4().hex}.npy")
+        out = np.lib.format.open_memmap(
+            file, mode="w+", dtype=array.dtype, shape=array.shape
+        )
+        out[:] = array
+        out.flush()
+        del out
+
+        artifact = self.__artifacts.get(key)
+        if artifact is not None:
+            artifact["files"].append(file)
+        return np.load(file, mmap_mode="r")
+
+    def refresh(self) -> dict:
+        "measure every artifact, reduce them while over budget"
+        for artifact in self.__artifacts.values():
+            artifact["bytes"] = int(artifact["measure"]())
+
+        while self.total() > self.__budget:
+            reducible = [
+                (key, a)
+                for key, a in self.__artifacts.items()
+                if a["level"] < len(a["reducers"])
+            ]
+            if len(reducible) == 0:
+                if not self.__warned:
+                    self.__warned = True
+                    total, budget = self.total() / 2**20, self.__budget / 2**20
+                    signalBus.onMessage.emit(
+                        {
+                            "text": f"Memory use {total:.0f} MB is over the {budget:.0f}"
+                            " MB budget, nothing left to reduce",
+                            "type": "warning",
+                        }
+                    )
+                break
+
+            key, artifact = min(reducible, key=lambda item: item[1]["used"])
+            reducer = artifact["reducers"][artifact["level"]]
+            artifact["level"] += 1
+            reducer()
+            artifact["bytes"] = int(artifact["measure"]())
+
+        usage = self.usage()
+        self.onUsageChanged.emit(usage)
+        return usage
+
+    def close(self):
+        self.__timer.stop()
+        for key in list(self.__artifacts):
+            self.release(key)
+
+    def __removeFiles(self, artifact: dict):
+        for file in artifact["files"]:
+            try:
+                os.remove(file)
+            except OSError:
+                pass  # still mapped on some platforms, left to the temp dir
+        artifact["files"] = []
+
+    # endregion
@@ -2,6 +2,7 @@ import pyqtgraph.opengl as gl
 import numpy as np
 from PySide6.QtGui import QColor, QFont
 from .signal_bus import signalBus
+from .tracing import traced
 
 def apply_rotations(mesh_item: gl.GLMeshItem, rotations: list[tuple] | tuple):
     _rotations = []
@@ -21,14 +22,19 @@ def apply_rotations(mesh_item: gl.GLMeshItem, rotations: list[tuple] | tuple):
         
 
 def create_mesh_item(opts: dict) -> gl.GLMeshItem:
+    # utils does not depend on components at import time
+    from components.gl_mesh_item import VMeshItem
+
     data = opts.get("meshdata", None)
     empty = opts.get("empty", False)
     rotations = opts.get("rotations", (0, 0, 0, 0, False))
     drawFaces = opts.get("draw_faces", True)
     drawEdges = opts.get("draw_edges", True)
+    normals = opts.get("normals", None)
+    staticGeometry = opts.get("static_geometry", False)
 
     cc: object | tuple = QColor(opts.get("color", "#B2713D")).getRgbF()
-    mesh_item:gl.GLMeshItem = gl.GLMeshItem(
+    mesh_item:gl.GLMeshItem = VMeshItem(
         smooth=True,
         drawFaces=drawFaces,
         drawEdges=drawEdges,
@@ -36,6 +42,8 @@ def create_mesh_item(opts: dict) -> gl.GLMeshItem:
         edgeColor=(cc[0], cc[1], cc[2], 1),
         shader="shaded",
         glOptions="opaque",
+        normals=normals,
+        staticGeometry=staticGeometry,
     )
 
     # apply the rotation
@@ -54,6 +62,363 @@ def create_mesh_item(opts: dict) -> gl.GLMeshItem:
     return mesh_item
 
 
+GEOMETRY_CACHE_SIZE = 8
+_geometry_cache: dict[tuple, dict] = {}
+
+
+def _grid_faces(idx: np.ndarray) -> np.ndarray:
+    "two triangles per cell of a (m, n) grid of vertex indices"
+    v0 = idx[:-1, :-1].ravel()
+    v1 = idx[:-1, 1:].ravel()
+    v2 = idx[1:, 1:].ravel()
+    v3 = idx[1:, :-1].ravel()
+    quads = np.stack(
+        [np.stack([v0, v1, v2], axis=1), np.stack([v0, v2, v3], axis=1)], axis=1
+    )
+    return quads.reshape(-1, 3)
+
+
+def compute_vertex_normals(vertexes: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """
+    Smooth shading normals, the normalized sum of the normals of the faces
+    around each vertex, same as `MeshData.vertexNormals` without the
+    per-vertex loop.
+
+    Returns:
+        np.ndarray: (V, 3) float32, zero for vertices without a face.
+    """
+    v = vertexes[faces]  # (F, 3, 3)
+    face_normals = np.cross(v[:, 1] - v[:, 0], v[:, 2] - v[:, 0])
+
+    # scatter every face normal onto its three corners
+    n = vertexes.shape[0]
+    corners = faces.ravel()
+    normals = np.column_stack(
+        [
+            np.bincount(corners, np.repeat(face_normals[:, i], 3), minlength=n)
+            for i in range(3)
+        ]
+    )
+
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, length, out=normals, where=length > 0)
+    return normals.astype(np.float32)
+
+
+@traced(cat="mesh")
+def create_slab_geometry(opts: dict) -> dict:
+    """
+    Builds the vertex and face arrays of a slab with a variable thickness
+    along Z, in vectorized form.
+
+    The left (X = -t/2) and right (X = +t/2) faces are (nz, ny) grids whose
+    vertices map onto the image pixels (k, j). The front, back, bottom and top
+    faces close the slab with `x_points` points across the thickness.
+
+    The result is cached, slabs with identical dimensions and thickness
+    profile share the same arrays. Callers must not modify them.
+
+    Returns:
+        dict: vertexes (V, 3) float32, faces (F, 3) uint32, normals (V, 3)
+        float32, image_vertices and image_pixels (vertex -> flat pixel index
+        of the (nz, ny) image), depth_index and x_coefficients (see
+        `reshape_slab_geometry`).
+    """
+    width: float = opts.get("width", 1)
+    height: float = opts.get("height", 1)
+    nx: int = opts.get("x_points", 2)
+    ny: int = opts.get("y_points", 20)
+    thickness_profile: np.ndarray = np.asarray(opts["thickness_profile"], dtype=float)
+    nz: int = thickness_profile.shape[0]
+
+    key = (width, height, nx, ny, nz, thickness_profile.tobytes())
+    if key in _geometry_cache:
+        return _geometry_cache[key]
+
+    y: np.ndarray = np.linspace(-width / 2, width / 2, ny)
+    z: np.ndarray = np.linspace(-height / 2, height / 2, nz)
+    t: np.ndarray = thickness_profile / 2
+
+    # X across the thickness at every depth, shape (nz, nx)
+    x: np.ndarray = t[:, np.newaxis] * np.linspace(-1, 1, nx)[np.newaxis, :]
+    ni = nx - 2  # interior points across the thickness
+
+    zz, yy = np.meshgrid(z, y, indexing="ij")
+    blocks = [
+        # left and right faces, (nz, ny)
+        np.stack([np.broadcast_to(-t[:, np.newaxis], zz.shape), yy, zz], axis=-1),
+        np.stack([np.broadcast_to(t[:, np.newaxis], zz.shape), yy, zz], axis=-1),
+        # front and back interiors, (nz, ni)
+        np.stack(
+            [x[:, 1:-1], np.full((nz, ni), -width / 2), np.repeat(z[:, None], ni, 1)],
+            axis=-1,
+        ),
+        np.stack(
+            [x[:, 1:-1], np.full((nz, ni), width / 2), np.repeat(z[:, None], ni, 1)],
+            axis=-1,
+        ),
+        # bottom and top interiors, (ny, ni)
+        np.stack(
+            [
+                np.broadcast_to(x[0, 1:-1], (ny, ni)),
+                np.repeat(y[:, None], ni, 1),
+                np.full((ny, ni), z[0]),
+            ],
+            axis=-1,
+        ),
+        np.stack(
+            [
+                np.broadcast_to(x[-1, 1:-1], (ny, ni)),
+                np.repeat(y[:, None], ni, 1),
+                np.full((ny, ni), z[-1]),
+            ],
+            axis=-1,
+        ),
+    ]
+
+    # vertex indices of every block
+    indices = []
+    offset = 0
+    for block in blocks:
+        n = block.shape[0] * block.shape[1]
+        indices.append(np.arange(offset, offset + n).reshape(block.shape[:2]))
+        offset += n
+    left, right, front, back, bottom, top = indices
+
+    faces = np.concatenate(
+        [
+            _grid_faces(left),
+            _grid_faces(right),
+            _grid_faces(np.column_stack([left[:, 0], front, right[:, 0]])),
+            _grid_faces(np.column_stack([left[:, -1], back, right[:, -1]])),
+            _grid_faces(np.column_stack([left[0, :], bottom, right[0, :]])),
+            _grid_faces(np.column_stack([left[-1, :], top, right[-1, :]])),
+        ]
+    )
+
+    # X = t[depth_index] * x_coefficients, a new profile only moves X
+    s = np.linspace(-1, 1, nx)[1:-1]
+    depth_index = np.concatenate(
+        [
+            np.repeat(np.arange(nz), ny),
+            np.repeat(np.arange(nz), ny),
+            np.repeat(np.arange(nz), ni),
+            np.repeat(np.arange(nz), ni),
+            np.zeros(ny * ni, dtype=int),
+            np.full(ny * ni, nz - 1),
+        ]
+    )
+    x_coefficients = np.concatenate(
+        [
+            np.full(nz * ny, -1.0),
+            np.full(nz * ny, 1.0),
+            np.tile(s, nz),
+            np.tile(s, nz),
+            np.tile(s, ny),
+            np.tile(s, ny),
+        ]
+    ).astype(np.float32)
+
+    # the left and right faces are colored by the image, indexed as (z, y)
+    image_vertices = np.concatenate([left.ravel(), right.ravel()])
+    image_pixels = np.tile(np.arange(nz * ny), 2)
+
+    vertexes = np.concatenate([b.reshape(-1, 3) for b in blocks]).astype(np.float32)
+    faces = faces.astype(np.uint32)
+    geometry = {
+        "kind": "slab",
+        "vertexes": vertexes,
+        "faces": faces,
+        "normals": compute_vertex_normals(vertexes, faces),
+        "image_vertices": image_vertices,
+        "image_pixels": image_pixels,
+        "depth_index": depth_index,
+        "x_coefficients": x_coefficients,
+        "shape": (nz, ny),
+    }
+
+    if len(_geometry_cache) >= GEOMETRY_CACHE_SIZE:
+        _geometry_cache.pop(next(iter(_geometry_cache)))
+    _geometry_cache[key] = geometry
+    return geometry
+
+
+def reshape_slab_geometry(geometry: dict, thickness_profile: np.ndarray) -> dict:
+    """
+    Applies a new thickness profile to a slab geometry. Only the X coordinate
+    of the vertices moves, the faces and the image mapping, hence every
+    frame color array, stay valid.
+
+    A cached geometry is never modified: its vertex array is copied once into
+    a new geometry, which later calls then update in place.
+
+    Parameters:
+        geometry (dict): Built by `create_slab_geometry`.
+        thickness_profile (np.ndarray): New thickness at every depth (nz,).
+
+    Returns:
+        dict: The reshaped geometry, new normals included.
+    """
+    t = np.asarray(thickness_profile, dtype=np.float32) / 2
+    if t.shape[0] != geometry["shape"][0]:
+        raise ValueError(
+            f"thickness_profile must have {geometry['shape'][0]} points: {t.shape[0]}"
+        )
+
+    if any(geometry is cached for cached in _geometry_cache.values()):
+        geometry = {**geometry, "vertexes": geometry["vertexes"].copy()}
+
+    vertexes = geometry["vertexes"]
+    np.multiply(t[geometry["depth_index"]], geometry["x_coefficients"], out=vertexes[:, 0])
+    geometry["normals"] = compute_vertex_normals(vertexes, geometry["faces"])
+    return geometry
+
+
+@traced(cat="mesh")
+def create_annulus_geometry(opts: dict) -> dict:
+    """
+    Builds the vertex and face arrays of the annulus wrapped around the
+    casing, in vectorized form.
+
+    The inner (pipe) and outer (hole) walls are (nz, nθ) grids whose vertices
+    map onto the image pixels (k, j) like the sides of the slab, rings at the
+    top and the bottom close the annulus. The axis follows the inclination of
+    the well, depth increasing along +Z, and the pipe is shifted by
+    e * (Ro - Ri) towards the low side. Radii are exaggerated so the widest
+    hole is `width` across.
+
+    With `symmetric` (the solver models half of the annulus) zeta spans the
+    half turn from the high side (j = ny - 1) to the low side (j = 0) and is
+    mirrored to close the circle.
+
+    The result is cached like `create_slab_geometry`. Callers must not
+    modify it.
+
+    Returns:
+        dict: vertexes, faces, normals, image_vertices, image_pixels and
+        shape as `create_slab_geometry`, label_anchors (nz, 3) points on the
+        side of the hole for the depth labels.
+    """
+    width: float = opts.get("width", 1)
+    height: float = opts.get("height", 1)
+    ny: int = opts.get("y_points", 20)
+    symmetric: bool = opts.get("symmetric", True)
+    well: dict = opts["well"]
+
+    md = np.asarray(well["md"], dtype=float)
+    ri = np.asarray(well["inner_diameter"], dtype=float) / 2
+    ro = np.asarray(well["outer_diameter"], dtype=float) / 2
+    e = np.asarray(well["eccentricity"], dtype=float)
+    inclination = np.asarray(well["inclination"], dtype=float)
+    nz = md.shape[0]
+
+    key = ("annulus", width, height, ny, symmetric) + tuple(
+        a.tobytes() for a in (md, ri, ro, e, inclination)
+    )
+    if key in _geometry_cache:
+        return _geometry_cache[key]
+
+    # angle of every column from the high side, and the pixel it shows
+    if symmetric:
+        half = np.pi * (1 - np.arange(ny) / max(ny - 1, 1))
+        theta = np.concatenate([half, 2 * np.pi - half[-2:0:-1]])
+        columns = np.concatenate([np.arange(ny), np.arange(ny - 2, 0, -1)])
+    else:
+        theta = 2 * np.pi * (1 - np.arange(ny) / ny)
+        columns = np.arange(ny)
+
+    r_scale = (width / 2) / max(ro.max(), 1e-12)
+    z_scale = height / max(md[-1] - md[0], 1e-12)
+    ri, ro = ri * r_scale, ro * r_scale
+    offset = np.clip(e, 0, 1) * (ro - ri)
+
+    # well path, centered on the origin
+    ds = np.diff(md) * z_scale
+    mid = (inclination[:-1] + inclination[1:]) / 2
+    axis = np.zeros((nz, 3))
+    axis[1:, 0] = np.cumsum(ds * np.sin(mid))
+    axis[1:, 2] = np.cumsum(ds * np.cos(mid))
+    axis -= (axis.min(axis=0) + axis.max(axis=0)) / 2
+
+    # cross section frame: n1 towards the high side, n2 horizontal
+    n1 = np.stack([np.cos(inclination), np.zeros(nz), -np.sin(inclination)], axis=-1)
+    n2 = np.array([0.0, 1.0, 0.0])
+    cos, sin = np.cos(theta), np.sin(theta)
+    u = cos[None, :, None] * n1[:, None, :] + sin[None, :, None] * n2  # (nz, nθ, 3)
+
+    # the wall points of a column lie on the ray from the pipe center
+    center = axis - offset[:, None] * n1
+    along = -offset[:, None] * cos[None, :]  # pipe center projected on the ray
+    reach = -along + np.sqrt(along**2 - offset[:, None] ** 2 + ro[:, None] ** 2)
+    blocks = [
+        center[:, None, :] + ri[:, None, None] * u,
+        center[:, None, :] + reach[..., None] * u,
+    ]
+
+    nt = theta.shape[0]
+    inner = np.arange(nz * nt).reshape(nz, nt)
+    outer = inner + nz * nt
+
+    def wrap(idx: np.ndarray) -> np.ndarray:
+        return np.column_stack([idx, idx[:, 0]])
+
+    faces = np.concatenate(
+        [
+            _grid_faces(wrap(inner)),
+            _grid_faces(wrap(outer)[:, ::-1]),
+            _grid_faces(wrap(np.stack([inner[0], outer[0]]))),
+            _grid_faces(wrap(np.stack([outer[-1], inner[-1]]))),
+        ]
+    )
+
+    pixels = (np.arange(nz)[:, None] * ny + columns[None, :]).ravel()
+    side = int(np.argmin(np.abs(theta - np.pi / 2)))
+
+    vertexes = np.concatenate([b.reshape(-1, 3) for b in blocks]).astype(np.float32)
+    faces = faces.astype(np.uint32)
+    geometry = {
+        "kind": "annulus",
+        "vertexes": vertexes,
+        "faces": faces,
+        "normals": compute_vertex_normals(vertexes, faces),
+        "image_vertices": np.concatenate([inner.ravel(), outer.ravel()]),
+        "image_pixels": np.tile(pixels, 2),
+        "label_anchors": blocks[1][:, side].astype(np.float32),
+        "shape": (nz, ny),
+        "symmetric": symmetric,
+    }
+
+    if len(_geometry_cache) >= GEOMETRY_CACHE_SIZE:
+        _geometry_cache.pop(next(iter(_geometry_cache)))
+    _geometry_cache[key] = geometry
+    return geometry
+
+
+@traced(cat="mesh")
+def create_frame_colors(
+    geometry: dict,
+    image: np.ndarray = None,
+    color: str = "#B2713D",
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Maps an image of shape (nz, ny, 3|4) onto the vertices of a geometry
+    built by `create_slab_geometry` or `create_annulus_geometry`. Vertices without a pixel get `color`.
+    The colors are written into `out` (V, 4) when given, e.g. a frame ring slot.
+    """
+    n = geometry["vertexes"].shape[0]
+    colors = np.empty((n, 4), dtype=np.float32) if out is None else out
+    colors[:] = QColor(color).getRgbF()
+
+    if image is not None:
+        pixels = image.reshape(-1, image.shape[-1])
+        colors[geometry["image_vertices"], : pixels.shape[1]] = pixels[
+            geometry["image_pixels"]
+        ]
+    return colors
+
+
+@traced(cat="mesh")
 def create_slab_mesh(opts: dict = None) -> dict:
     if opts is None:
         opts = {}
@@ -82,15 +447,6 @@ def create_slab_mesh(opts: dict = None) -> dict:
     nz: int = _opts["z_points"]
     images: np.ndarray = _opts["images"]  # arr of shape (ny, nz, 4)
     use_image_color = images is not None and images.ndim == 4 and images.shape[1:3] == (nz, ny)
-    print("images is not None", images is not None)
-    print("images.ndim == 4", images.ndim == 4)
-    print("images.shape[1:3] == (nz, ny)", images.shape[1:3] == (nz, ny))
-    print("images.shape[1:3]", images.shape[1:3], "== (nz, ny)", (nz, ny))
-    print("use_image_color", use_image_color)
-
-    # Y and Z coordinates
-    y: np.ndarray = np.linspace(-width / 2, width / 2, ny)
-    z: np.ndarray = np.linspace(-height / 2, height / 2, nz)
 
     # Variable thickness profile along Z (height)
     if _opts["thickness_profile"] is not None:
@@ -102,111 +458,30 @@ def create_slab_mesh(opts: dict = None) -> dict:
         thickness_profile: np.ndarray = (
             np.ones(shape=(nz,), dtype=float) * base_thickness
         )
-    frames = []
 
+    geometry = create_slab_geometry(
+        {
+            "width": width,
+            "height": height,
+            "thickness_profile": thickness_profile,
+            "x_points": nx,
+            "y_points": ny,
+        }
+    )
+
+    # every frame shares the vertex and face arrays, only the colors differ
+    frames = []
     for image in images:
-        vertices = []
-        faces = []
-        vertex_map = {}
-        vertex_colors = []
-
-        def add_vertex(v, j=None, k=None):
-            key = tuple(np.round(v, 5))
-            if key not in vertex_map:
-                index = len(vertices)
-                vertex_map[key] = index
-                vertices.append(v)
-                # Add default or texture color
-                if use_image_color and j is not None and k is not None:
-                    color = image[k, j]  # image indexed as (z, y)
-                else:
-                    color = QColor(_opts["color"]).getRgbF()
-                vertex_colors.append(color)
-            return vertex_map[key]
-
-        def add_face(v0, v1, v2, v3):
-            faces.append([v0, v1, v2])
-            faces.append([v0, v2, v3])
-
-        # Build faces along Y-Z plane (variable X thickness)
-        for k in range(nz - 1):
-            for j in range(ny - 1):
-                z0, z1 = z[k], z[k + 1]
-                t0 = thickness_profile[k] / 2
-                t1 = thickness_profile[k + 1] / 2
-                y0, y1 = y[j], y[j + 1]
-
-                # Left face (X = -thickness/2)
-                v0 = add_vertex([-t0, y0, z0], j=j, k=k)
-                v1 = add_vertex([-t0, y1, z0], j=j + 1, k=k)
-                v2 = add_vertex([-t1, y1, z1], j=j + 1, k=k + 1)
-                v3 = add_vertex([-t1, y0, z1], j=j, k=k + 1)
-                add_face(v0, v1, v2, v3)
-
-                # Right face (X = +thickness/2)
-                v0 = add_vertex([t0, y0, z0], j=j, k=k)
-                v1 = add_vertex([t0, y1, z0], j=j + 1, k=k)
-                v2 = add_vertex([t1, y1, z1], j=j + 1, k=k + 1)
-                v3 = add_vertex([t1, y0, z1], j=j, k=k + 1)
-                add_face(v0, v1, v2, v3)
-
-        # Front and back faces (Y-constant), interpolated thickness
-        for k in range(nz - 1):
-            z0, z1 = z[k], z[k + 1]
-            t0 = thickness_profile[k] / 2
-            t1 = thickness_profile[k + 1] / 2
-            for i in range(nx - 1):
-                x0 = np.linspace(-t0, t0, nx)[i]
-                x1 = np.linspace(-t0, t0, nx)[i + 1]
-                x2 = np.linspace(-t1, t1, nx)[i + 1]
-                x3 = np.linspace(-t1, t1, nx)[i]
-
-                # Front face (Y = -width/2)
-                y_front = -width / 2
-                v0 = add_vertex([x0, y_front, z0])
-                v1 = add_vertex([x1, y_front, z0])
-                v2 = add_vertex([x2, y_front, z1])
-                v3 = add_vertex([x3, y_front, z1])
-                add_face(v0, v1, v2, v3)
-
-                # Back face (Y = +width/2)
-                y_back = width / 2
-                v0 = add_vertex([x0, y_back, z0])
-                v1 = add_vertex([x1, y_back, z0])
-                v2 = add_vertex([x2, y_back, z1])
-                v3 = add_vertex([x3, y_back, z1])
-                add_face(v0, v1, v2, v3)
-
-        # Top and bottom faces (Z = constant)
-        for j in range(ny - 1):
-            y0 = y[j]
-            y1 = y[j + 1]
-            for k in [0, nz - 1]:
-                zc = z[k]
-                tzc = thickness_profile[k] / 2
-                for i in range(nx - 1):
-                    x0 = np.linspace(-tzc, tzc, nx)[i]
-                    x1 = np.linspace(-tzc, tzc, nx)[i + 1]
-
-                    # Bottom face (Z = z[0])
-                    if k == 0:
-                        v0 = add_vertex([x0, y0, zc])
-                        v1 = add_vertex([x1, y0, zc])
-                        v2 = add_vertex([x1, y1, zc])
-                        v3 = add_vertex([x0, y1, zc])
-                    # Top face (Z = z[-1])
-                    else:
-                        v0 = add_vertex([x0, y0, zc])
-                        v1 = add_vertex([x1, y0, zc])
-                        v2 = add_vertex([x1, y1, zc])
-                        v3 = add_vertex([x0, y1, zc])
-
-                    add_face(v0, v1, v2, v3)
-
-        v = np.array(vertices)
-        f = np.array(faces)
-        c = np.array(vertex_colors)
-        frames.append(gl.MeshData(vertexes=v, faces=f, vertexColors=c))
+        c = create_frame_colors(
+            geometry, image if use_image_color else None, _opts["color"]
+        )
+        frames.append(
+            gl.MeshData(
+                vertexes=geometry["vertexes"],
+                faces=geometry["faces"],
+                vertexColors=c,
+            )
+        )
     return {"meshdata": frames}
 
 
@@ -276,22 +551,20 @@ def create_depth_vertex_array(opts: dict) -> np.ndarray:
         raise ValueError("Support 2d thickness profile not implemented yet")
 
 
-def create_text_items(opts: dict) -> list[gl.GLTextItem]:
+def create_depth_labels(opts: dict) -> tuple[np.ndarray, list[str]]:
     if not isinstance(opts, dict):
         raise TypeError("opts must be of type dict")
 
     tmd: float = opts.get("tmd", 0)
     bmd: float = opts.get("bmd", 100)
     unit: str = opts.get("unit", "m")
-    color: str = opts.get("text_color", "#FFFFFF")
-    font: QFont = opts.get("font", QFont("Helvetica", 10))
     detail_level: int = opts.get(
         "detail_level", 0.25
     )  # exists between 0 and 1. 0 = no detail, 1 = full detail
     positions: np.ndarray = opts.get("text_positions", None)
 
     if tmd == 0 and bmd == 0:
-        return []
+        return np.zeros((0, 3), dtype=float), []
 
     if not isinstance(tmd, (int, float)):
         raise TypeError("tmd must be of type int or float")
@@ -308,21 +581,31 @@ def create_text_items(opts: dict) -> list[gl.GLTextItem]:
     depths = np.round(np.linspace(tmd, bmd, positions.shape[0], dtype=float), 2)
 
     if detail_level == 0:
-        return []
+        return np.zeros((0, 3), dtype=float), []
 
     keep_n = int(np.round(positions.shape[0] * detail_level))
     idx = np.linspace(0, positions.shape[0] - 1, keep_n, dtype=int)
     filtered_positions = positions[idx, :]
     filtered_depths = depths[idx]
 
+    labels = [f"{depth} {unit}" for depth in filtered_depths]
+    return filtered_positions, labels
+
+
+def create_text_items(opts: dict) -> list[gl.GLTextItem]:
+    color: str = opts.get("text_color", "#FFFFFF")
+    font: QFont = opts.get("font", QFont("Helvetica", 10))
+
+    positions, labels = create_depth_labels(opts)
+
     items = [
         gl.GLTextItem(
-            pos=filtered_positions[i, :],
-            text=f"{filtered_depths[i]} {unit}",
+            pos=positions[i, :],
+            text=labels[i],
             color=QColor(color),
             font=font,
         )
-        for i in range(filtered_positions.shape[0])
+        for i in range(positions.shape[0])
     ]
 
     return items
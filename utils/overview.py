@@ -0,0 +1,190 @@
+import os
+import numpy as np
+import h5py
+
+from .cache_files import (
+    is_stamp_current,
+    open_cache,
+    source_stamp,
+    write_cache,
+    write_source_stamp,
+)
+from .variables import OVERVIEW_VERSION
+
+
+def default_overview_path(file: str) -> str:
+    """
+    Returns the overview index path used for a simulator output file,
+    e.g. `results/csave.h5` -> `results/csave.overview.h5`.
+    """
+    root, ext = os.path.splitext(file)
+    return f"{root}.overview{ext}"
+
+
+def downsample(arr: np.ndarray, size: int, axis: int) -> np.ndarray:
+    """
+    Averages an array down to `size` bins along an axis.
+
+    Parameters:
+        arr (np.ndarray): Array to reduce.
+        size (int): Number of bins, clipped to the length of the axis.
+        axis (int): Axis to reduce.
+
+    Returns:
+        np.ndarray: The binned array.
+    """
+    n = arr.shape[axis]
+    size = max(1, min(size, n))
+    starts = np.linspace(0, n, size, endpoint=False).astype(int)
+    counts = np.diff(np.append(starts, n))
+    sums = np.add.reduceat(arr, starts, axis=axis)
+    shape = [1] * arr.ndim
+    shape[axis] = size
+    return sums / counts.reshape(shape)
+
+
+def build_overview(data: np.ndarray, images: np.ndarray, opts: dict = None) -> dict:
+    """
+    Builds the overview index of a run.
+
+    Parameters:
+        data (np.ndarray): Concentrations of shape (time, fluid, section, xi, zeta).
+        images (np.ndarray): Colored frames of shape (time, xi, zeta, 3).
+        opts (dict): Optional settings
+            - section (int): section the stats are computed on. Default 1.
+            - tmd, bmd (float): depth range of the section. Default 0, 800.
+            - tolerance (float): concentration at which a fluid is signalled. Default 0.01.
+            - rows, cols (int): thumbnail size along xi and zeta. Default 64, 8.
+            - time (np.ndarray): simulation time of each frame.
+
+    Returns:
+        dict: thumbnails, strips (timeline pyramid), fractions, front, mixing, time.
+    """
+    if opts is None:
+        opts = {}
+
+    ts = images.shape[0]
+    section: int = opts.get("section", 1)
+    return build_overview_chunks([(data[:ts, :, section, :, :], images)], opts)
+
+
+def build_overview_chunks(chunks, opts: dict = None) -> dict:
+    """
+    Builds the overview index of a run from consecutive blocks of timesteps,
+    so a run is indexed without holding all of it in memory.
+
+    Parameters:
+        chunks (iterable): (c_vals, images) pairs in time order, the
+            concentrations of the section of shape (time, fluid, xi, zeta)
+            and the colored frames of shape (time, xi, zeta, 3).
+        opts (dict): Same as `build_overview`, `section` is ignored.
+
+    Returns:
+        dict: See `build_overview`.
+    """
+    if opts is None:
+        opts = {}
+
+    tmd: float = opts.get("tmd", 0.0)
+    bmd: float = opts.get("bmd", 800.0)
+    tolerance: float = opts.get("tolerance", 0.01)
+    rows: int = opts.get("rows", 64)
+    cols: int = opts.get("cols", 8)
+
+    parts = {"fractions": [], "front": [], "mixing": [], "thumbnails": []}
+    n_fluids = 0
+    for c_vals, images in chunks:
+        _, n_fluids, n_xi, _ = c_vals.shape
+        depths = np.linspace(tmd, bmd, n_xi)
+
+        # mean fluid fractions over the section
+        parts["fractions"].append(c_vals.mean(axis=(2, 3)))
+
+        # deepest cell reached by each fluid
+        profile = c_vals.mean(axis=3)  # (time, fluid, xi)
+        present = profile > tolerance
+        deepest = n_xi - 1 - np.argmax(present[:, :, ::-1], axis=2)
+        parts["front"].append(np.where(present.any(axis=2), depths[deepest], np.nan))
+
+        # length of the section where no fluid dominates
+        mixed = profile.max(axis=1) < 1 - tolerance  # (time, xi)
+        parts["mixing"].append(mixed.sum(axis=1) * (bmd - tmd) / max(n_xi - 1, 1))
+
+        # low resolution frames
+        thumbnails = downsample(downsample(images, rows, axis=1), cols, axis=2)
+        parts["thumbnails"].append(thumbnails)
+
+    fractions, front, mixing, thumbnails = (
+        np.concatenate(parts[key])
+        for key in ["fractions", "front", "mixing", "thumbnails"]
+    )
+    ts = len(thumbnails)
+
+    # the depth-vs-time strip
+    strip = np.transpose(thumbnails.mean(axis=2), (1, 0, 2))  # (rows, time, 3)
+    strips = [strip]
+    while strips[-1].shape[1] > 1:
+        strips.append(downsample(strips[-1], (strips[-1].shape[1] + 1) // 2, axis=1))
+
+    time = opts.get("time", None)
+    if time is None or len(time) < ts:
+        time = np.arange(ts, dtype=float)
+
+    return {
+        "thumbnails": np.round(np.clip(thumbnails, 0, 1) * 255).astype(np.uint8),
+        "strips": [np.round(np.clip(s, 0, 1) * 255).astype(np.uint8) for s in strips],
+        "fractions": fractions,
+        "front": front,
+        "mixing": mixing,
+        "time": np.asarray(time, dtype=float)[:ts],
+        "n_fluids": n_fluids,
+        "tmd": tmd,
+        "bmd": bmd,
+    }
+
+
+def write_overview(file: str, overview: dict, source: str = None):
+    "write an overview index, the `source` stamp is recorded to detect stale indexes"
+    with write_cache(file) as f:
+        f.attrs["version"] = OVERVIEW_VERSION
+        f.attrs["tmd"] = overview["tmd"]
+        f.attrs["bmd"] = overview["bmd"]
+        f.attrs["n_fluids"] = overview["n_fluids"]
+        if source is not None:
+            write_source_stamp(f.attrs, source_stamp(source))
+
+        for key in ["thumbnails", "fractions", "front", "mixing", "time"]:
+            f.create_dataset(key, data=overview[key])
+        for level, strip in enumerate(overview["strips"]):
+            f.create_dataset(f"strips/{level}", data=strip)
+
+
+def read_overview(file: str, source: str = None) -> dict | None:
+    "read an overview index, None if missing, unreadable, outdated or stale"
+    with open_cache(file) as f:
+        if f is None or f.attrs.get("version", 0) != OVERVIEW_VERSION:
+            return None
+        if source is not None and os.path.isfile(source):
+            if not is_stamp_current(file, f.attrs, source):
+                return None
+
+        try:
+            overview = {
+                key: f[key][()] for key in ["thumbnails", "fractions", "front", "mixing", "time"]
+            }
+            overview["strips"] = [f[f"strips/{i}"][()] for i in range(len(f["strips"]))]
+            overview["n_fluids"] = int(f.attrs["n_fluids"])
+            overview["tmd"] = float(f.attrs["tmd"])
+            overview["bmd"] = float(f.attrs["bmd"])
+        except (OSError, KeyError):
+            return None  # damaged, rebuilt like a stale one
+    return overview
+
+
+def read_timesave(file: str) -> np.ndarray | None:
+    "simulation time of each record from the `timesave.h5` written next to the output"
+    time_file = os.path.join(os.path.dirname(file), "timesave.h5")
+    if not os.path.isfile(time_file):
+        return None
+    with h5py.File(time_file, "r") as f:
+        return np.ravel(f["timesave"][()])
@@ -0,0 +1,268 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import h5py
+
+from .variables import FRAME_STORE_FORMAT
+from .image_processing import depth_slice, open_results_file, read_depth_range
+
+
+class PickIndex:
+    """
+    Uniform grid over the image-mapped triangles of a geometry, built once
+    in vectorized form.
+
+    A ray only tests the triangles of the cells it crosses, walked front to
+    back (3D DDA), so the first hit ends the search and the cost depends on
+    the grid resolution, not on the number of vertices.
+    """
+
+    def __init__(self, geometry: dict, opts: dict = None):
+        if opts is None:
+            opts = {}
+
+        # triangles per cell the grid resolution aims for
+        density: float = opts.get("density", 2.0)
+
+        vertexes = np.asarray(geometry["vertexes"], dtype=np.float64)
+        self.__shape: tuple[int, int] = geometry["shape"]
+        self.__pixels = np.full(vertexes.shape[0], -1, dtype=np.int64)
+        self.__pixels[geometry["image_vertices"]] = geometry["image_pixels"]
+
+        faces = np.asarray(geometry["faces"], dtype=np.int64)
+        faces = faces[(self.__pixels[faces] >= 0).all(axis=1)]
+        self.__faces = faces
+        triangles = vertexes[faces]  # (F, 3, 3)
+        self.__v0 = triangles[:, 0]
+        self.__e1 = triangles[:, 1] - triangles[:, 0]
+        self.__e2 = triangles[:, 2] - triangles[:, 0]
+
+        lo, hi = vertexes.min(axis=0), vertexes.max(axis=0)
+        extent = np.maximum(hi - lo, 1e-6 * max(float((hi - lo).max()), 1e-9))
+        self.__lo = lo - 1e-6 * extent
+        self.__hi = self.__lo + extent * (1 + 2e-6)
+
+        # cubic cells, about `density` triangles each
+        volume = float(np.prod(self.__hi - self.__lo))
+        n_cells = max(faces.shape[0] / density, 1.0)
+        edge = (volume / n_cells) ** (1 / 3)
+        self.__dims = np.clip(
+            np.ceil((self.__hi - self.__lo) / edge), 1, 256
+        ).astype(np.int64)
+        self.__cell = (self.__hi - self.__lo) / self.__dims
+
+        # every triangle is listed in each cell its bounding box overlaps
+        first = self.__cellOf(triangles.min(axis=1))
+        last = self.__cellOf(triangles.max(axis=1))
+        span = last - first + 1
+        counts = np.prod(span, axis=1)
+        owner = np.repeat(np.arange(faces.shape[0]), counts)
+        local = np.arange(owner.shape[0]) - np.repeat(np.cumsum(counts) - counts, counts)
+        sx, sy = span[owner, 0], span[owner, 1]
+        ix = first[owner, 0] + local % sx
+        iy = first[owner, 1] + (local // sx) % sy
+        iz = first[owner, 2] + local // (sx * sy)
+        cells = (iz * self.__dims[1] + iy) * self.__dims[0] + ix
+
+        order = np.argsort(cells, kind="stable")
+        self.__cellFaces = owner[order]
+        self.__cellStart = np.searchsorted(
+            cells[order], np.arange(int(np.prod(self.__dims)) + 1)
+        )
+
+    # region getters
+    def dims(self) -> tuple[int, int, int]:
+        return tuple(int(d) for d in self.__dims)
+
+    def faceCount(self) -> int:
+        return self.__faces.shape[0]
+
+    def nbytes(self) -> int:
+        arrays = [self.__pixels, self.__faces, self.__v0, self.__e1, self.__e2]
+        arrays += [self.__cellFaces, self.__cellStart]
+        return sum(a.nbytes for a in arrays)
+
+    # endregion
+
+    # region workers
+    def __cellOf(self, points: np.ndarray) -> np.ndarray:
+        cells = np.floor((points - self.__lo) / self.__cell).astype(np.int64)
+        return np.clip(cells, 0, self.__dims - 1)
+
+    def __hit(self, candidates: np.ndarray, origin: np.ndarray, direction: np.ndarray):
+        "Möller-Trumbore against a few triangles, (distance, u, v) of each"
+        e1, e2 = self.__e1[candidates], self.__e2[candidates]
+        p = np.cross(direction, e2)
+        det = np.einsum("ij,ij->i", e1, p)
+        valid = np.abs(det) > 1e-12
+        inv = np.divide(1.0, det, out=np.zeros_like(det), where=valid)
+
+        s = origin - self.__v0[candidates]
+        u = np.einsum("ij,ij->i", s, p) * inv
+        q = np.cross(s, e1)
+        v = (q @ direction) * inv
+        t = np.einsum("ij,ij->i", e2, q) * inv
+
+        valid &= (u >= 0) & (v >= 0) & (u + v <= 1) & (t > 0)
+        return np.where(valid, t, np.inf), u, v
+
+    def intersect(self, origin, direction) -> dict | None:
+        """
+        First hit of a ray with the indexed surface.
+
+        Parameters:
+            origin: (3,) start of the ray, in the coordinates of the geometry.
+            direction: (3,) direction of the ray, need not be normalized.
+
+        Returns:
+            dict | None: distance (along the normalized direction), point and
+            pixel (k, j) of the image shown at the hit, None on a miss.
+        """
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        direction = direction / np.linalg.norm(direction)
+
+        # clip the ray to the bounding box
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t0 = (self.__lo - origin) / direction
+            t1 = (self.__hi - origin) / direction
+        t_near = np.nan_to_num(np.minimum(t0, t1), nan=-np.inf)
+        t_far = np.nan_to_num(np.maximum(t0, t1), nan=np.inf)
+        t_enter, t_exit = max(t_near.max(), 0.0), t_far.min()
+        if t_enter > t_exit:
+            return None
+
+        cell = self.__cellOf(origin + t_enter * direction)
+        step = np.where(direction >= 0, 1, -1)
+        with np.errstate(divide="ignore"):
+            t_delta = np.abs(self.__cell / direction)
+            boundary = self.__lo + (cell + (step > 0)) * self.__cell
+            t_max = np.where(direction != 0, (boundary - origin) / direction, np.inf)
+
+        while True:
+            t_leave = min(t_max.min(), t_exit)
+            index = (cell[2] * self.__dims[1] + cell[1]) * self.__dims[0] + cell[0]
+            start, stop = self.__cellStart[index], self.__cellStart[index + 1]
+            if stop > start:
+                candidates = self.__cellFaces[start:stop]
+                t, u, v = self.__hit(candidates, origin, direction)
+                best = int(np.argmin(t))
+                # a hit beyond this cell may hide behind one in the next cells
+                if t[best] <= t_leave + 1e-9:
+                    hit = (candidates[best], t[best], u[best], v[best])
+                    return self.__result(*hit, origin, direction)
+
+            if t_leave >= t_exit:
+                return None
+            axis = int(np.argmin(t_max))
+            cell[axis] += step[axis]
+            if cell[axis] < 0 or cell[axis] >= self.__dims[axis]:
+                return None
+            t_max[axis] += t_delta[axis]
+
+    def __result(self, face, t, u, v, origin, direction) -> dict:
+        # the pixel of the corner closest to the hit colors it
+        corner = int(np.argmax([1 - u - v, u, v]))
+        pixel = int(self.__pixels[self.__faces[face, corner]])
+        return {
+            "distance": float(t),
+            "point": origin + t * direction,
+            "pixel": divmod(pixel, self.__shape[1]),
+        }
+
+    # endregion
+
+
+class ConcentrationProbe:
+    """
+    Reads the per-fluid concentrations of a single cell of a run, one small
+    hyperslab per call. For hover readouts, `load` reads all the cells of a
+    frame once, on a worker, and `cached` answers from it without I/O.
+
+    Frame stores only hold colors, their `source` simulator output is read
+    instead. Pixels are indexed like the loaded frames: rows of the depth
+    range of interest, zeta flipped.
+    """
+
+    def __init__(self, file: str, opts: dict = None):
+        if opts is None:
+            opts = {}
+
+        self.__section: int = opts.get("section", 1)
+        self.__lock = threading.Lock()
+        self.__h5: h5py.File | None = None
+        self.__source: str | None = None
+        # (n_fluids, xi, zeta) of the last frames loaded
+        self.__slices: OrderedDict[int, np.ndarray] = OrderedDict()
+        self.__slicesSize: int = opts.get("slices", 4)
+
+        with open_results_file(file) as f:
+            if f.attrs.get("format", "") == FRAME_STORE_FORMAT:
+                file = str(f.attrs.get("source", ""))
+        if not os.path.isfile(file):
+            return  # colors only, nothing to read
+
+        self.__source = file
+        # the dataset is opened per read, a run being watched is refreshed
+        # through another handle and HDF5 mixes up the chunk index of two
+        # SWMR handles on the same dataset
+        self.__h5 = open_results_file(file)
+        _, _, _, n_xi, self.__nZeta = self.__h5["csave"].shape
+        tmd, bmd = read_depth_range(file, self.__section)
+        self.__xi = depth_slice(n_xi, tmd, bmd, opts.get("roi", None))
+
+    def isAvailable(self) -> bool:
+        return self.__h5 is not None
+
+    def source(self) -> str | None:
+        "the simulator output read, None for a frame store without it"
+        return self.__source
+
+    def section(self) -> int:
+        return self.__section
+
+    def cell(self, pixel: tuple[int, int]) -> tuple[int, int]:
+        "(xi, zeta) of the source shown at an image pixel (k, j)"
+        k, j = pixel
+        # the frames are flipped for backwards flow
+        return self.__xi.start + k, self.__nZeta - 1 - j
+
+    def read(self, frame_index: int, pixel: tuple[int, int]) -> np.ndarray | None:
+        "(n_fluids,) concentrations at an image pixel (k, j) of a frame"
+        if self.__h5 is None:
+            return None
+
+        xi, zeta = self.cell(pixel)
+        with self.__lock:
+            if not self.__h5.id.valid:
+                return None
+            return self.__h5["csave"][frame_index, :, self.__section, xi, zeta]
+
+    def cached(self, frame_index: int, pixel: tuple[int, int]) -> np.ndarray | None:
+        "(n_fluids,) concentrations from a frame read by `load`, None otherwise"
+        with self.__lock:
+            data = self.__slices.get(frame_index)
+        if data is None:
+            return None
+        k, j = pixel
+        return data[:, k, self.__nZeta - 1 - j]
+
+    def load(self, frame_index: int):
+        "read the concentrations of every cell of a frame for `cached`, blocking"
+        with self.__lock:
+            if frame_index in self.__slices:
+                self.__slices.move_to_end(frame_index)
+                return
+            if self.__h5 is None or not self.__h5.id.valid:
+                return
+            data = self.__h5["csave"][frame_index, :, self.__section, self.__xi, :]
+            self.__slices[frame_index] = data
+            while len(self.__slices) > self.__slicesSize:
+                self.__slices.popitem(last=False)
+
+    def close(self):
+        with self.__lock:
+            self.__slices.clear()
+            if self.__h5 is not None and self.__h5.id.valid:
+                self.__h5.close()
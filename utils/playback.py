@@ -0,0 +1,164 @@
+import time
+import numpy as np
+
+from .variables import (
+    PLAYBACK_BLEND_STEP,
+    PLAYBACK_FALLBACK_STEP,
+    PLAYBACK_SPEED,
+    PLAYBACK_SPEED_RANGE,
+)
+
+
+class PlaybackClock:
+    """
+    Maps wall time to a position in the run, in simulation time.
+
+    Playback advances `speed` simulation seconds per wall second, using the
+    time of every record (`timesave.h5`), so the speed no longer depends on
+    how often the solver saved. The position is a record index and a blend
+    factor towards the next record: fast playback skips the records it
+    passed, slow playback blends between them. Without record times, records
+    are `PLAYBACK_FALLBACK_STEP` simulation seconds apart.
+
+    The clock is only read, by whoever draws, when a new frame can be
+    presented. It never schedules anything itself.
+    """
+
+    def __init__(self, opts: dict = None):
+        if opts is None:
+            opts = {}
+
+        self.__speed: float = self.__clamp(opts.get("speed", PLAYBACK_SPEED))
+        self.__interpolate: bool = opts.get("interpolate", True)
+        self.__times = np.zeros(0)
+
+        # simulation time at the wall time playback (re)started
+        self.__anchorTime = 0.0
+        self.__anchorWall: float | None = None
+
+    # region setters
+    def setTimes(self, times: np.ndarray | None, count: int):
+        """
+        Sets the simulation time of the `count` records, keeping the position.
+
+        Parameters:
+            times (np.ndarray | None): Time of each record, e.g. `read_timesave`.
+            count (int): Number of records played, times are cut or extended to it.
+        """
+        position = self.time()
+        self.__times = self.__recordTimes(times, count)
+        self.__anchor(position, self.isRunning())
+
+    def setSpeed(self, speed: float):
+        "simulation seconds per wall second, clamped to `PLAYBACK_SPEED_RANGE`"
+        position = self.time()
+        self.__speed = self.__clamp(speed)
+        self.__anchor(position, self.isRunning())
+
+    def setInterpolate(self, interpolate: bool):
+        self.__interpolate = interpolate
+
+    # endregion
+
+    # region getters
+    def speed(self) -> float:
+        return self.__speed
+
+    def count(self) -> int:
+        return len(self.__times)
+
+    def duration(self) -> float:
+        "wall seconds to play the whole run at the current speed"
+        if len(self.__times) < 2:
+            return 0.0
+        return float(self.__times[-1] - self.__times[0]) / self.__speed
+
+    def isRunning(self) -> bool:
+        return self.__anchorWall is not None
+
+    def time(self, now: float = None) -> float:
+        "simulation time of the position"
+        if self.__anchorWall is None:
+            return self.__anchorTime
+        if now is None:
+            now = time.monotonic()
+        return self.__anchorTime + (now - self.__anchorWall) * self.__speed
+
+    def position(self, now: float = None) -> tuple[int, float, bool]:
+        """
+        The record and the blend towards the next one at wall time `now`.
+
+        Returns:
+            tuple[int, float, bool]: Record index, blend in [0, 1) quantized
+                to `PLAYBACK_BLEND_STEP` (0 unless interpolating), and whether
+                the end of the run was reached.
+        """
+        n = len(self.__times)
+        if n == 0:
+            return 0, 0.0, True
+
+        t = self.time(now)
+        if t >= self.__times[-1]:
+            return n - 1, 0.0, True
+
+        index = int(np.searchsorted(self.__times, t, side="right")) - 1
+        index = min(max(index, 0), n - 1)
+        if not self.__interpolate or index == n - 1:
+            return index, 0.0, False
+
+        span = self.__times[index + 1] - self.__times[index]
+        blend = (t - self.__times[index]) / span if span > 0 else 0.0
+        # redrawing for changes nobody can see is wasted work
+        blend = np.floor(blend / PLAYBACK_BLEND_STEP) * PLAYBACK_BLEND_STEP
+        return index, float(min(max(blend, 0.0), 1.0)), False
+
+    # endregion
+
+    # region workers
+    def start(self, index: int = None):
+        "play from a record, or from the current position"
+        if index is not None:
+            self.seek(index)
+        self.__anchor(self.time(), True)
+
+    def pause(self):
+        self.__anchor(self.time(), False)
+
+    def seek(self, index: int):
+        "jump to a record, playback carries on from it when running"
+        if len(self.__times) == 0:
+            return
+        index = min(max(int(index), 0), len(self.__times) - 1)
+        self.__anchor(float(self.__times[index]), self.isRunning())
+
+    def __anchor(self, position: float, running: bool):
+        "restart the wall clock from a simulation time"
+        self.__anchorTime = position
+        self.__anchorWall = time.monotonic() if running else None
+
+    @staticmethod
+    def __clamp(speed: float) -> float:
+        low, high = PLAYBACK_SPEED_RANGE
+        return min(max(float(speed), low), high)
+
+    @staticmethod
+    def __recordTimes(times: np.ndarray | None, count: int) -> np.ndarray:
+        "increasing time of `count` records"
+        if count <= 0:
+            return np.zeros(0)
+
+        fallback = np.arange(count, dtype=np.float64) * PLAYBACK_FALLBACK_STEP
+        if times is None or len(times) < 2:
+            return fallback
+
+        # the solver preallocates a last record it never writes, as zero
+        times = np.asarray(times[:count], dtype=np.float64)
+        times = np.maximum.accumulate(times)
+        if len(times) < count:
+            # runs compared against a shorter one, keep the last spacing
+            step = float(np.median(np.diff(times))) or PLAYBACK_FALLBACK_STEP
+            extra = times[-1] + step * np.arange(1, count - len(times) + 1)
+            times = np.concatenate([times, extra])
+        return times
+
+    # endregion
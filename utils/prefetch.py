@@ -0,0 +1,212 @@
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+from .tracing import trace_span
+from .variables import PREFETCH_CAPACITY, PREFETCH_DEPTH, PREFETCH_IDLE_S
+
+
+class FramePrefetcher:
+    """
+    Prepares the frames playback is about to reach.
+
+    Every frame request is observed to follow the direction, the step and
+    the rate of navigation, whether from playback or a slider drag. The next
+    `depth` frames along that path are loaded for every source on the task
+    scheduler, at background priority, into a bounded LRU cache. Prefetches
+    that left the path are cancelled before they start. While navigation is
+    idle, the neighbours on both sides are kept instead.
+
+    Sources are loader callables, index -> array, keyed like the layers of
+    the scene. Hits and misses are counted by `get` to size `depth`.
+    """
+
+    def __init__(self, scheduler, opts: dict = None):
+        if opts is None:
+            opts = {}
+
+        self.__scheduler = scheduler
+        self.__depth: int = opts.get("depth", PREFETCH_DEPTH)
+        self.__capacity: int = opts.get("capacity", PREFETCH_CAPACITY)
+
+        self.__lock = threading.Lock()
+        self.__cache: OrderedDict[tuple, np.ndarray] = OrderedDict()
+        self.__sources: dict[str, dict] = {}
+        self.__pending: dict[tuple, object] = {}
+        self.__generation = 0
+
+        # navigation state
+        self.__last: int | None = None
+        self.__lastTime = 0.0
+        self.__direction = 1
+        self.__step = 1
+        self.__rate = 0.0  # frames per second, smoothed
+
+        self.__hits = 0
+        self.__misses = 0
+
+    # region setters
+    def setSources(self, sources: dict[str, dict]):
+        """
+        Replaces the sources, dropping everything cached for the old ones.
+
+        Parameters:
+            sources (dict): key -> {load: index -> array, length: int}.
+        """
+        self.cancel()
+        with self.__lock:
+            self.__sources = dict(sources)
+            self.__cache.clear()
+            self.__generation += 1
+
+    def setLength(self, key: str, length: int):
+        "a source grew, e.g. a watched run, what is cached and pending stays valid"
+        with self.__lock:
+            if key in self.__sources:
+                self.__sources[key] = {**self.__sources[key], "length": length}
+
+    def setDepth(self, depth: int):
+        self.__depth = max(int(depth), 0)
+
+    def setCapacity(self, capacity: int):
+        "frames kept across sources, the least recently used are dropped first"
+        with self.__lock:
+            self.__capacity = max(int(capacity), 1)
+            while len(self.__cache) > self.__capacity:
+                self.__cache.popitem(last=False)
+
+    # endregion
+
+    # region getters
+    def depth(self) -> int:
+        return self.__depth
+
+    def capacity(self) -> int:
+        return self.__capacity
+
+    def nbytes(self) -> int:
+        with self.__lock:
+            return sum(array.nbytes for array in self.__cache.values())
+
+    def stats(self) -> dict:
+        "hit rate of `get`, cache fill, pending loads and the tracked motion"
+        requests = self.__hits + self.__misses
+        return {
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "hit_rate": self.__hits / requests if requests > 0 else 0.0,
+            "cached": len(self.__cache),
+            "pending": len(self.__pending),
+            "direction": self.__direction,
+            "step": self.__step,
+            "rate": self.__rate,
+        }
+
+    # endregion
+
+    # region workers
+    def get(self, key: str, index: int) -> np.ndarray | None:
+        "the prefetched frame, None on a miss. Safe from any thread"
+        with self.__lock:
+            array = self.__cache.get((key, index))
+            if array is None:
+                self.__misses += 1
+                return None
+            self.__cache.move_to_end((key, index))
+            self.__hits += 1
+            return array
+
+    def resetStats(self):
+        self.__hits = 0
+        self.__misses = 0
+
+    def observe(self, index: int):
+        "a frame was requested, update the motion and refill the path ahead"
+        now = time.monotonic()
+        if self.__last is not None and index != self.__last:
+            delta = index - self.__last
+            elapsed = max(now - self.__lastTime, 1e-3)
+            self.__direction = 1 if delta > 0 else -1
+            self.__step = min(abs(delta), max(self.__depth, 1))
+            rate = abs(delta) / elapsed
+            self.__rate = rate if self.__rate == 0 else 0.7 * self.__rate + 0.3 * rate
+        self.__last, self.__lastTime = index, now
+
+        self.__schedule(self.__path(index))
+
+    def cancel(self):
+        "cancel the prefetches that did not start yet"
+        for future in list(self.__pending.values()):
+            future.cancel()
+
+    def clear(self):
+        self.cancel()
+        with self.__lock:
+            self.__cache.clear()
+
+    def __path(self, index: int) -> list[int]:
+        "the frames expected next, nearest first"
+        idle = time.monotonic() - self.__lastTime > PREFETCH_IDLE_S
+        if self.__rate == 0 or idle:
+            around = []
+            for k in range(1, self.__depth // 2 + 1):
+                around += [index + k, index - k]
+            return around
+        return [index + self.__direction * self.__step * k for k in range(1, self.__depth + 1)]
+
+    def __schedule(self, path: list[int]):
+        with self.__lock:
+            sources = dict(self.__sources)
+            generation = self.__generation
+
+        wanted = []
+        for key, source in sources.items():
+            for index in path:
+                # shorter runs hold their last frame
+                index = min(max(index, 0), source["length"] - 1)
+                if (key, index) not in wanted:
+                    wanted.append((key, index))
+
+        # left the path, never started
+        for item, future in list(self.__pending.items()):
+            if item not in wanted:
+                future.cancel()
+
+        for key, index in wanted:
+            item = (key, index)
+            if item in self.__cache or item in self.__pending:
+                continue
+
+            future = self.__scheduler.submit(
+                f"PREFETCH_{key}_{index}",
+                self.__load,
+                {
+                    "params": (item, sources[key]["load"], generation),
+                    "priority": "background",
+                    "group": "prefetch",
+                },
+            )
+            self.__pending[item] = future
+            future.add_done_callback(
+                lambda _, item=item, future=future: self.__settle(item, future)
+            )
+
+    def __settle(self, item: tuple, future):
+        if self.__pending.get(item) is future:
+            self.__pending.pop(item, None)
+
+    def __load(self, params: tuple):
+        item, load, generation = params
+        with trace_span(f"prefetch {item[1]}", "prefetch"):
+            array = load(item[1])
+
+        with self.__lock:
+            if generation != self.__generation:
+                return  # the sources changed meanwhile
+            self.__cache[item] = array
+            self.__cache.move_to_end(item)
+            while len(self.__cache) > self.__capacity:
+                self.__cache.popitem(last=False)
+
+    # endregion
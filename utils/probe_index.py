@@ -0,0 +1,130 @@
+import os
+import numpy as np
+import h5py
+
+from .cache_files import (
+    is_stamp_current,
+    open_cache,
+    source_stamp,
+    write_cache,
+    write_source_stamp,
+)
+from .image_processing import open_results_file
+from .overview import read_timesave
+from .variables import PROBE_INDEX_VERSION
+
+
+def default_probe_path(file: str) -> str:
+    """
+    Returns the probe index path used for a simulator output file,
+    e.g. `results/csave.h5` -> `results/csave.probe.h5`.
+    """
+    root, ext = os.path.splitext(file)
+    return f"{root}.probe{ext}"
+
+
+def cached_probe_index(file: str, section: int = 1) -> str | None:
+    "the probe index of a simulator output when it is cached and up to date"
+    index = default_probe_path(file)
+    with open_cache(index) as f:
+        if (
+            f is not None
+            and f.attrs.get("version", 0) == PROBE_INDEX_VERSION
+            and f.attrs.get("section", None) == section
+            and is_stamp_current(index, f.attrs, file)
+        ):
+            return index
+    return None
+
+
+def build_probe_index(file: str, out_file: str = None, opts: dict = None) -> str:
+    """
+    Writes a depth-major copy of the concentrations of a section.
+
+    The `series` dataset has shape (xi, zeta, fluid, time) and is stored
+    contiguously, so the whole time series of a cell is a single contiguous
+    read instead of one strided read per timestep. The source is read once,
+    a block of xi rows at a time.
+
+    Parameters:
+        file (str): Path to the simulator output file.
+        out_file (str): Path of the index, defaults to `default_probe_path`.
+        opts (dict): Optional settings
+            - section (int): section to index. Default 1.
+            - block_size (int): bytes read from the source at once. Default 64 MB.
+            - on_progress (callable): called with (rows, total) after each block.
+
+    Returns:
+        str: Path of the index.
+    """
+    if opts is None:
+        opts = {}
+
+    if not os.path.isfile(file):
+        raise FileNotFoundError(f"File not found: {file}")
+
+    if out_file is None:
+        out_file = default_probe_path(file)
+
+    section: int = opts.get("section", 1)
+    block_size: int = opts.get("block_size", 64 * 2**20)
+    on_progress = opts.get("on_progress", None)
+
+    # taken before reading, a write meanwhile leaves the index stale
+    stamp = source_stamp(file)
+    with open_results_file(file) as src:
+        csave = src["csave"]
+        time_step, n_fluids, _, n_xi, n_zeta = csave.shape
+        ts = time_step - 1  # the last record is never written
+
+        time = read_timesave(file)
+        if time is None or len(time) < ts:
+            time = np.arange(ts, dtype=float)
+
+        with write_cache(out_file) as dst:
+            dst.attrs["version"] = PROBE_INDEX_VERSION
+            write_source_stamp(dst.attrs, stamp)
+            dst.attrs["section"] = section
+            dst.create_dataset("time", data=np.asarray(time[:ts], dtype=float))
+            series = dst.create_dataset(
+                "series", shape=(n_xi, n_zeta, n_fluids, ts), dtype=np.float32
+            )
+
+            rows = max(1, block_size // max(ts * n_fluids * n_zeta * 4, 1))
+            for start in range(0, n_xi, rows):
+                stop = min(start + rows, n_xi)
+                block = csave[:ts, :, section, start:stop, :]  # (time, fluid, xi, zeta)
+                series[start:stop] = np.transpose(block, (2, 3, 1, 0))
+                if on_progress is not None:
+                    on_progress(stop, n_xi)
+
+    return out_file
+
+
+def read_probe_series(file: str, xi: int, zeta: int, opts: dict = None) -> dict:
+    """
+    Returns the concentration history of a cell, the probe index is built
+    on first use and whenever the file is newer.
+
+    Parameters:
+        file (str): Path to the simulator output file.
+        xi (int): Depth cell.
+        zeta (int): Azimuthal cell, in the orientation of the file.
+        opts (dict): Passed to `build_probe_index`.
+
+    Returns:
+        dict: time (T,) and concentrations (fluid, T).
+    """
+    if opts is None:
+        opts = {}
+
+    section: int = opts.get("section", 1)
+    index = cached_probe_index(file, section)
+    if index is None:
+        index = build_probe_index(file, opts=opts)
+
+    with h5py.File(index, "r") as f:
+        return {
+            "time": f["time"][()],
+            "concentrations": f["series"][xi, zeta],
+        }
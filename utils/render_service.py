@@ -0,0 +1,568 @@
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import os
+import socket
+import struct
+import threading
+import zlib
+from urllib.parse import parse_qs, urlsplit
+import numpy as np
+from PIL import Image
+
+from .batch import find_runs
+from .frame_sequence import FrameSequence
+from .frame_store import cached_store_path
+from .variables import RENDER_SERVICE_PORT, RENDER_FRAME_ENCODINGS
+
+# RFC 6455
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_WS_TEXT, _WS_BINARY, _WS_CLOSE, _WS_PING, _WS_PONG = 0x1, 0x2, 0x8, 0x9, 0xA
+_HTTP_STATUS = {
+    200: "OK",
+    101: "Switching Protocols",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+def frame_to_uint8(frame: np.ndarray) -> np.ndarray:
+    "(xi, zeta, 3) colors in [0, 1] to 8 bit RGB"
+    return (np.clip(frame[..., :3], 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+
+def encode_frame(
+    frame: np.ndarray, encoding: str, previous: np.ndarray = None
+) -> tuple[dict, bytes]:
+    """
+    Compresses an 8 bit frame for the wire.
+
+    Parameters:
+        frame (np.ndarray): (xi, zeta, 3) uint8.
+        encoding (str): "png", "webp" or "delta".
+        previous (np.ndarray): last frame the client holds, deltas are taken
+            against it. Without it, or on a shape change, a key frame is sent.
+
+    Returns:
+        tuple[dict, bytes]: header (encoding, shape, key) and the payload.
+    """
+    header = {"encoding": encoding, "shape": list(frame.shape), "key": True}
+    if encoding in ("png", "webp"):
+        buffer = io.BytesIO()
+        Image.fromarray(frame, "RGB").save(buffer, format=encoding.upper(), lossless=True)
+        return header, buffer.getvalue()
+
+    if encoding != "delta":
+        raise ValueError(f"Unknown encoding <{encoding}>")
+
+    if previous is not None and previous.shape == frame.shape:
+        # wrapping difference, consecutive frames are mostly zeros
+        header["key"] = False
+        return header, zlib.compress((frame - previous).tobytes(), 1)
+    return header, zlib.compress(frame.tobytes(), 1)
+
+
+def decode_frame(header: dict, payload: bytes, previous: np.ndarray = None) -> np.ndarray:
+    "inverse of `encode_frame`, the client side of the stream"
+    shape = tuple(header["shape"])
+    if header["encoding"] in ("png", "webp"):
+        return np.asarray(Image.open(io.BytesIO(payload)).convert("RGB"))
+
+    data = np.frombuffer(zlib.decompress(payload), dtype=np.uint8).reshape(shape)
+    if header["key"]:
+        return data.copy()
+    if previous is None:
+        raise ValueError("A delta frame needs the previous frame")
+    return previous + data  # wraps like the encoder
+
+
+class RenderService:
+    """
+    Serves the colored frames of the runs under a directory to thin clients.
+
+    Frames are read through `FrameSequence`, from the frame store when one
+    is cached, and kept in its LRU cache shared by every client. Each
+    client connection remembers the last frame it was sent per run, so the
+    delta encoding only ships what changed.
+
+    HTTP:
+        GET /runs                          list of runs and their ids
+        GET /runs/<id>                     header of a run
+        GET /runs/<id>/frames/<i>?encoding=png&rows=a:b
+
+    WebSocket on /ws, JSON requests
+        {"run": id, "frame": i, "encoding": "delta", "rows": [a, b]}
+    answered by binary messages: a 4 byte big endian header length, the
+    JSON header (run, frame, encoding, shape, key) and the payload, or by a
+    JSON text message {"error": ...}.
+    """
+
+    def __init__(self, directory: str, opts: dict = None):
+        if opts is None:
+            opts = {}
+
+        if not os.path.isdir(directory):
+            raise NotADirectoryError(f"Directory not found: {directory}")
+
+        self.__directory = directory
+        self.__host: str = opts.get("host", "127.0.0.1")
+        self.__port: int = opts.get("port", RENDER_SERVICE_PORT)
+        self.__name: str = opts.get("name", "csave.h5")
+        self.__roi: tuple | None = opts.get("roi", None)
+        self.__cacheSize: int = opts.get("cache_size", 32)
+
+        self.__runs: list[str] = find_runs(directory, self.__name)
+        self.__sequences: dict[int, FrameSequence] = {}
+        self.__lock = threading.Lock()
+
+        self.__loop: asyncio.AbstractEventLoop | None = None
+        self.__server: asyncio.Server | None = None
+        self.__thread: threading.Thread | None = None
+        # open connections, cancelled on shutdown
+        self.__handlers: set[asyncio.Task] = set()
+
+    # region getters
+    def address(self) -> tuple[str, int]:
+        "host and port listened on, the port is resolved once started"
+        return self.__host, self.__port
+
+    def runs(self) -> list[dict]:
+        return [
+            {"id": i, "name": os.path.relpath(os.path.dirname(file), self.__directory)}
+            for i, file in enumerate(self.__runs)
+        ]
+
+    # endregion
+
+    # region workers
+    def start(self) -> tuple[str, int]:
+        "serve on a background thread, returns the address once listening"
+        ready = threading.Event()
+
+        def run():
+            self.__loop = asyncio.new_event_loop()
+            self.__loop.run_until_complete(self.__listen())
+            ready.set()
+            self.__loop.run_forever()
+            self.__loop.close()
+
+        self.__thread = threading.Thread(target=run, name="render-service", daemon=True)
+        self.__thread.start()
+        ready.wait()
+        return self.address()
+
+    def serve_forever(self):
+        "serve on the calling thread until interrupted"
+        self.__loop = asyncio.new_event_loop()
+        try:
+            self.__loop.run_until_complete(self.__listen())
+            self.__loop.run_forever()
+        finally:
+            self.__loop.run_until_complete(self.__shutdown())
+            self.__loop.close()
+            self.close()
+
+    def stop(self):
+        "stop serving from another thread, once the open connections are closed"
+        if self.__loop is not None and self.__thread is not None:
+            asyncio.run_coroutine_threadsafe(self.__shutdown(), self.__loop).result()
+            self.__loop.call_soon_threadsafe(self.__loop.stop)
+            self.__thread.join()
+            self.__thread = None
+        self.close()
+
+    def close(self):
+        "release the runs, the server is shut down by `stop` or `serve_forever`"
+        with self.__lock:
+            for sequence in self.__sequences.values():
+                sequence.close()
+            self.__sequences.clear()
+
+    def frame(self, run_id: int, index: int, rows: tuple = None) -> np.ndarray:
+        """
+        (xi, zeta, 3) uint8 frame of a run, optionally a tile of xi rows.
+        Raises ValueError for a frame or rows outside the run.
+        """
+        sequence = self.__sequence(run_id)
+        if not 0 <= index < len(sequence):
+            raise ValueError(
+                f"Frame <{index}> out of range, the run has {len(sequence)} frames"
+            )
+        if rows is not None:
+            n_xi = sequence.shape()[0]
+            if len(rows) != 2 or not 0 <= rows[0] < rows[1] <= n_xi:
+                raise ValueError(f"Rows <{rows}> must be a:b with 0 <= a < b <= {n_xi}")
+
+        frame = frame_to_uint8(sequence[index])
+        if rows is not None:
+            frame = np.ascontiguousarray(frame[rows[0] : rows[1]])
+        return frame
+
+    def __sequence(self, run_id: int) -> FrameSequence:
+        if run_id not in range(len(self.__runs)):
+            raise KeyError(f"Unknown run <{run_id}>")
+
+        with self.__lock:
+            sequence = self.__sequences.get(run_id)
+            if sequence is None:
+                file = self.__runs[run_id]
+                sequence = FrameSequence(
+                    cached_store_path(file) or file,
+                    {"roi": self.__roi, "cache_size": self.__cacheSize},
+                )
+                self.__sequences[run_id] = sequence
+            return sequence
+
+    def __header(self, run_id: int) -> dict:
+        sequence = self.__sequence(run_id)
+        return {
+            "id": run_id,
+            "file": self.__runs[run_id],
+            "frames": len(sequence),
+            **sequence.header(),
+        }
+
+    async def __listen(self):
+        self.__server = await asyncio.start_server(
+            self.__onConnection, self.__host, self.__port, family=socket.AF_INET
+        )
+        self.__port = self.__server.sockets[0].getsockname()[1]
+
+    async def __shutdown(self):
+        "on the loop: stop listening, cancel the open connections and wait for them"
+        if self.__server is not None:
+            self.__server.close()
+        # connections accepted just before start their handler on the next step
+        await asyncio.sleep(0)
+        for task in list(self.__handlers):
+            task.cancel()
+        await asyncio.gather(*self.__handlers, return_exceptions=True)
+        if self.__server is not None:
+            await self.__server.wait_closed()
+            self.__server = None
+
+    async def __onConnection(self, reader, writer):
+        task = asyncio.current_task()
+        self.__handlers.add(task)
+        try:
+            request = await _read_http_request(reader)
+            if request is None:
+                return
+            method, target, headers = request
+            url = urlsplit(target)
+
+            if headers.get("upgrade", "").lower() == "websocket" and url.path == "/ws":
+                await self.__serveWebSocket(reader, writer, headers)
+            elif method != "GET":
+                await _write_http_response(writer, 405, {"error": "Only GET is served"})
+            else:
+                await self.__serveHttp(writer, url)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # the client went away
+        except asyncio.CancelledError:
+            pass  # shutting down, the handler ends like a closed connection
+        except ValueError as e:
+            await _write_http_error(writer, 400, f"Malformed request: {e}")
+        except Exception as e:
+            await _write_http_error(writer, 500, f"{type(e).__name__}: {e}")
+        finally:
+            self.__handlers.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def __serveHttp(self, writer, url):
+        parts = [p for p in url.path.split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            if parts == ["runs"]:
+                return await _write_http_response(writer, 200, self.runs())
+
+            if len(parts) == 2 and parts[0] == "runs":
+                header = await asyncio.to_thread(self.__header, int(parts[1]))
+                return await _write_http_response(writer, 200, header)
+
+            if len(parts) == 4 and parts[0] == "runs" and parts[2] == "frames":
+                encoding = query.get("encoding", "png")
+                if encoding not in ("png", "webp"):
+                    raise ValueError("HTTP frames are png or webp, deltas need /ws")
+                rows = _parse_rows(query.get("rows", None))
+                frame = await asyncio.to_thread(
+                    self.frame, int(parts[1]), int(parts[3].split(".")[0]), rows
+                )
+                _, payload = await asyncio.to_thread(encode_frame, frame, encoding)
+                return await _write_http_response(
+                    writer, 200, payload, f"image/{encoding}"
+                )
+
+            await _write_http_response(writer, 404, {"error": f"No route {url.path}"})
+        except (KeyError, IndexError) as e:
+            await _write_http_response(writer, 404, {"error": str(e)})
+        except ValueError as e:
+            await _write_http_response(writer, 400, {"error": str(e)})
+        except OSError as e:
+            await _write_http_response(writer, 500, {"error": f"Cannot read the run: {e}"})
+
+    async def __serveWebSocket(self, reader, writer, headers: dict):
+        key = headers.get("sec-websocket-key", "")
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest())
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept.decode()}\r\n\r\n"
+            ).encode()
+        )
+        await writer.drain()
+
+        # per client cache, the last frame sent of each run (and tile)
+        sent: dict[tuple, np.ndarray] = {}
+        while True:
+            opcode, payload = await _read_ws_message(reader)
+            if opcode == _WS_CLOSE:
+                await _write_ws_frame(writer, _WS_CLOSE, payload[:2])
+                return
+            if opcode == _WS_PING:
+                await _write_ws_frame(writer, _WS_PONG, payload)
+                continue
+            if opcode != _WS_TEXT:
+                continue
+
+            try:
+                request = json.loads(payload)
+                run_id, index = int(request["run"]), int(request["frame"])
+                encoding = request.get("encoding", "delta")
+                if encoding not in RENDER_FRAME_ENCODINGS:
+                    raise ValueError(f"Unknown encoding <{encoding}>")
+                rows = None
+                if request.get("rows") is not None:
+                    rows = tuple(int(row) for row in request["rows"])
+
+                frame = await asyncio.to_thread(self.frame, run_id, index, rows)
+                previous = sent.get((run_id, rows))
+                header, body = await asyncio.to_thread(
+                    encode_frame, frame, encoding, previous
+                )
+                sent[(run_id, rows)] = frame
+            except (KeyError, IndexError, ValueError, TypeError, OSError) as e:
+                message = json.dumps({"error": str(e), "request": payload.decode()})
+                await _write_ws_frame(writer, _WS_TEXT, message.encode())
+                continue
+
+            header.update({"run": run_id, "frame": index})
+            head = json.dumps(header).encode()
+            await _write_ws_frame(
+                writer, _WS_BINARY, struct.pack(">I", len(head)) + head + body
+            )
+
+    # endregion
+
+
+class RenderClient:
+    """
+    Minimal WebSocket client of a `RenderService`, keeps the last frame of
+    each run to apply the deltas to.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = RENDER_SERVICE_PORT):
+        self.__socket = socket.create_connection((host, port))
+        self.__file = self.__socket.makefile("rb")
+        self.__frames: dict[tuple, np.ndarray] = {}
+
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.__socket.sendall(
+            (
+                f"GET /ws HTTP/1.1\r\nHost: {host}:{port}\r\n"
+                "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+            ).encode()
+        )
+        status = self.__file.readline()
+        if b" 101 " not in status:
+            raise ConnectionError(f"WebSocket upgrade refused: {status!r}")
+        while self.__file.readline() not in (b"\r\n", b""):
+            pass
+
+    def request(self, run_id: int, index: int, opts: dict = None) -> tuple[dict, np.ndarray]:
+        """
+        Parameters:
+            opts (dict): encoding (default "delta") and rows (a, b).
+
+        Returns:
+            tuple[dict, np.ndarray]: header and the decoded uint8 frame.
+        """
+        if opts is None:
+            opts = {}
+
+        rows = opts.get("rows", None)
+        request = {"run": run_id, "frame": index, "encoding": opts.get("encoding", "delta")}
+        if rows is not None:
+            request["rows"] = list(rows)
+        self.__send(_WS_TEXT, json.dumps(request).encode())
+
+        opcode, payload = self.__receive()
+        if opcode == _WS_TEXT:
+            raise ValueError(json.loads(payload)["error"])
+
+        (length,) = struct.unpack(">I", payload[:4])
+        header = json.loads(payload[4 : 4 + length])
+        key = (run_id, tuple(rows) if rows is not None else None)
+        frame = decode_frame(header, payload[4 + length :], self.__frames.get(key))
+        self.__frames[key] = frame
+        return header, frame
+
+    def close(self):
+        try:
+            self.__send(_WS_CLOSE, struct.pack(">H", 1000))
+        except OSError:
+            pass
+        self.__file.close()
+        self.__socket.close()
+
+    def __send(self, opcode: int, payload: bytes):
+        # clients mask every frame
+        mask = os.urandom(4)
+        self.__socket.sendall(_ws_frame_header(opcode, len(payload), mask) + _mask(payload, mask))
+
+    def __receive(self) -> tuple[int, bytes]:
+        read = self.__file.read
+        return _parse_ws_message(lambda n: _read_exact(read, n))
+
+
+# region protocol
+def _parse_rows(value: str | None) -> tuple[int, int] | None:
+    if value is None:
+        return None
+    bounds = value.split(":")
+    if len(bounds) != 2:
+        raise ValueError(f"Rows <{value}> must be a:b")
+    return int(bounds[0]), int(bounds[1])
+
+
+async def _read_http_request(reader) -> tuple[str, str, dict] | None:
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode("latin-1").split(" ", 2)
+    if len(parts) != 3:
+        raise ValueError(f"bad request line {line[:80]!r}")
+    method, target, _ = parts
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return method, target, headers
+
+
+async def _write_http_response(writer, status: int, body, content_type: str = None):
+    if not isinstance(body, bytes):
+        body = json.dumps(body).encode()
+        content_type = "application/json"
+    writer.write(
+        (
+            f"HTTP/1.1 {status} {_HTTP_STATUS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode()
+        + body
+    )
+    await writer.drain()
+
+
+async def _write_http_error(writer, status: int, error: str):
+    "best effort, the connection may be unusable already"
+    try:
+        await _write_http_response(writer, status, {"error": error})
+    except (ConnectionError, RuntimeError):
+        pass
+
+
+def _mask(payload: bytes, mask: bytes) -> bytes:
+    data = np.frombuffer(payload, dtype=np.uint8)
+    return (data ^ np.resize(np.frombuffer(mask, dtype=np.uint8), data.shape)).tobytes()
+
+
+def _ws_frame_header(opcode: int, length: int, mask: bytes = None) -> bytes:
+    masked = 0x80 if mask is not None else 0
+    if length < 126:
+        head = struct.pack(">BB", 0x80 | opcode, masked | length)
+    elif length < 2**16:
+        head = struct.pack(">BBH", 0x80 | opcode, masked | 126, length)
+    else:
+        head = struct.pack(">BBQ", 0x80 | opcode, masked | 127, length)
+    return head + (mask or b"")
+
+
+def _read_exact(read, n: int) -> bytes:
+    data = read(n)
+    if len(data) < n:
+        raise ConnectionError("Connection closed")
+    return data
+
+
+def _parse_ws_message(read) -> tuple[int, bytes]:
+    "blocking side, `read(n)` returns exactly n bytes"
+    chunks, opcode = [], None
+    while True:
+        first, second = read(2)
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack(">H", read(2))
+        elif length == 127:
+            (length,) = struct.unpack(">Q", read(8))
+        mask = read(4) if second & 0x80 else None
+        payload = read(length) if length else b""
+        if mask is not None:
+            payload = _mask(payload, mask)
+
+        frame_opcode = first & 0x0F
+        if frame_opcode >= 0x8:
+            return frame_opcode, payload  # control frames are never fragmented
+        if frame_opcode != 0:
+            opcode = frame_opcode
+        chunks.append(payload)
+        if first & 0x80:
+            return opcode, b"".join(chunks)
+
+
+async def _read_ws_message(reader) -> tuple[int, bytes]:
+    "asyncio side of `_parse_ws_message`"
+    chunks, opcode = [], None
+    while True:
+        first, second = await reader.readexactly(2)
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack(">H", await reader.readexactly(2))
+        elif length == 127:
+            (length,) = struct.unpack(">Q", await reader.readexactly(8))
+        mask = await reader.readexactly(4) if second & 0x80 else None
+        payload = await reader.readexactly(length) if length else b""
+        if mask is not None:
+            payload = _mask(payload, mask)
+
+        frame_opcode = first & 0x0F
+        if frame_opcode >= 0x8:
+            return frame_opcode, payload
+        if frame_opcode != 0:
+            opcode = frame_opcode
+        chunks.append(payload)
+        if first & 0x80:
+            return opcode, b"".join(chunks)
+
+
+async def _write_ws_frame(writer, opcode: int, payload: bytes):
+    # servers never mask
+    writer.write(_ws_frame_header(opcode, len(payload)) + payload)
+    await writer.drain()
+
+
+# endregion
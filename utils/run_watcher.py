@@ -0,0 +1,177 @@
+import os
+import threading
+import traceback
+import numpy as np
+import h5py
+from PySide6.QtCore import QObject, Signal
+
+from .image_processing import (
+    blend_fluid_colors,
+    depth_slice,
+    fluid_color_array,
+    open_results_file,
+    read_depth_range,
+)
+from .signal_bus import signalBus
+from .variables import WATCH_INTERVAL
+
+
+def append_frames(frames: np.ndarray, new: np.ndarray) -> np.ndarray:
+    """
+    Returns `frames` followed by `new`, in place when possible.
+
+    The result is a view on a buffer with room to spare, capacity doubles
+    when it runs out, so appending costs the new frames only (amortized).
+    Frames that are not such a view, or read only like a spilled memory
+    map, are copied into a new buffer once.
+    """
+    n, m = len(frames), len(new)
+    base = frames.base
+    if (
+        isinstance(base, np.ndarray)
+        and not isinstance(base, np.memmap)
+        and base.flags.writeable
+        and base.dtype == frames.dtype
+        and base.shape[1:] == frames.shape[1:]
+        and base.shape[0] >= n + m
+        and frames.__array_interface__["data"][0] == base.__array_interface__["data"][0]
+        and frames.flags.c_contiguous
+    ):
+        base[n : n + m] = new
+        return base[: n + m]
+
+    buffer = np.empty((max(n + m, 2 * n),) + frames.shape[1:], dtype=frames.dtype)
+    buffer[:n] = frames
+    buffer[n : n + m] = new
+    return buffer[: n + m]
+
+
+class RunWatcher(QObject):
+    """
+    Polls a simulator output that is still being written for new timesteps.
+
+    Only the appended time range is read and colored, with SWMR access when
+    the file allows it (reopened on every poll otherwise), so following a
+    live run costs time proportional to the new data. The solver only
+    appends along time, the shape of a record never changes.
+
+    `onFramesAppended` is emitted from the polling thread with the start
+    index, the colored frames (like `load_frames`) and the new frame count.
+    """
+
+    onFramesAppended = Signal(dict)
+    onError = Signal(str)
+
+    def __init__(self, file: str, opts: dict = None):
+        super().__init__()
+        if opts is None:
+            opts = {}
+
+        if not os.path.isfile(file):
+            raise FileNotFoundError(f"File not found: {file}")
+
+        self.__file = file
+        self.__section: int = opts.get("section", 1)
+        self.__interval: float = opts.get("interval", WATCH_INTERVAL) / 1000
+        # frames already handed over, the next read starts there
+        self.__count: int = opts.get("start", 0)
+        self.__roi = opts.get("roi", None)
+
+        self.__h5: h5py.File | None = None
+        self.__stop = threading.Event()
+        self.__thread: threading.Thread | None = None
+
+    # region getters
+    def file(self) -> str:
+        return self.__file
+
+    def count(self) -> int:
+        return self.__count
+
+    def isRunning(self) -> bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    # endregion
+
+    # region workers
+    def start(self):
+        if self.isRunning():
+            return
+        self.__stop.clear()
+        self.__thread = threading.Thread(
+            target=self.__run, name="run-watcher", daemon=True
+        )
+        self.__thread.start()
+
+    def close(self):
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        self.__closeFile()
+
+    def poll(self) -> dict | None:
+        "read the timesteps appended since the last poll, None when there are none"
+        dataset = self.__dataset()  # dropped after the poll, see ConcentrationProbe
+        # the solver preallocates the last record, it is never written
+        n_frames = dataset.shape[0] - 1
+        if n_frames <= self.__count:
+            return None
+
+        n_fluids, n_xi = dataset.shape[1], dataset.shape[3]
+        tmd, bmd = read_depth_range(self.__file, self.__section)
+        xi = depth_slice(n_xi, tmd, bmd, self.__roi)
+        colors = fluid_color_array(n_fluids)
+
+        # one hyperslab of the new time range
+        start = self.__count
+        c_vals = dataset[start:n_frames, :, self.__section, xi, :]
+        frames = np.empty(
+            (n_frames - start, c_vals.shape[2], c_vals.shape[3], 3), dtype=np.float32
+        )
+        for i in range(frames.shape[0]):
+            # flipped for backwards flow, like the loaded frames
+            frames[i] = np.flip(blend_fluid_colors(c_vals[i], colors), axis=1)
+        np.clip(frames, 0.0, 1.0, out=frames)
+
+        self.__count = n_frames
+        return {"start": start, "frames": frames, "count": n_frames}
+
+    def __run(self):
+        while not self.__stop.wait(self.__interval):
+            try:
+                res = self.poll()
+            except (OSError, KeyError) as e:
+                # caught mid write, the next poll reopens the file
+                self.__closeFile()
+                self.onError.emit(f"Cannot read {self.__file}: {e}")
+                continue
+            except Exception as e:
+                # a bad poll must not end the watch silently, the next one retries
+                signalBus.onMessage.emit(
+                    {"text": f"Watching {self.__file} failed: {e}", "type": "error"}
+                )
+                signalBus.onMessage.emit(
+                    {"text": traceback.format_exc(), "type": "debug"}
+                )
+                continue
+            if res is not None:
+                self.onFramesAppended.emit(res)
+
+    def __dataset(self) -> h5py.Dataset:
+        if self.__h5 is not None and self.__h5.swmr_mode:
+            dataset = self.__h5["csave"]
+            dataset.refresh()
+            return dataset
+
+        # without SWMR, a fresh handle sees the new extent
+        self.__closeFile()
+        self.__h5 = open_results_file(self.__file)
+        return self.__h5["csave"]
+
+    def __closeFile(self):
+        if self.__h5 is not None and self.__h5.id.valid:
+            self.__h5.close()
+        self.__h5 = None
+
+    # endregion
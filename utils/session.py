@@ -0,0 +1,48 @@
+import os
+import json
+
+from .variables import SESSION_VERSION
+
+
+def default_session_path() -> str:
+    "session file kept in the user home, shared by every working directory"
+    return os.path.join(os.path.expanduser("~"), ".gap-thickness-plot", "session.json")
+
+
+def read_session(file: str = None) -> dict:
+    """
+    Reads the state saved by the previous session.
+
+    Parameters:
+        file (str): Path to the session file, defaults to `default_session_path`.
+
+    Returns:
+        dict: The saved state, empty if missing, unreadable or outdated.
+    """
+    if file is None:
+        file = default_session_path()
+
+    if not os.path.isfile(file):
+        return {}
+
+    try:
+        with open(file, "r", encoding="utf-8") as f:
+            session = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(session, dict) or session.get("version", 0) != SESSION_VERSION:
+        return {}
+    return session
+
+
+def write_session(session: dict, file: str = None):
+    "write the session state, replacing the previous file atomically"
+    if file is None:
+        file = default_session_path()
+
+    os.makedirs(os.path.dirname(file), exist_ok=True)
+    tmp_file = f"{file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump({**session, "version": SESSION_VERSION}, f, indent=2)
+    os.replace(tmp_file, file)
@@ -0,0 +1,277 @@
+import asyncio
+import collections
+import itertools
+import math
+import queue
+import threading
+import traceback
+from concurrent.futures import Executor, Future
+from PySide6.QtCore import QObject, Signal
+
+from .tracing import trace_span
+from .variables import TASK_HISTORY, TASK_WORKERS, TASK_LIMITS, TASK_PRIORITIES
+
+
+class PriorityExecutor(Executor):
+    """
+    Thread pool serving the queued calls by priority, lower first, then in
+    submission order. A call cancelled before a worker picks it up never runs.
+    """
+
+    def __init__(self, workers: int = TASK_WORKERS):
+        self.__queue = queue.PriorityQueue()
+        self.__counter = itertools.count()
+        self.__workers = [
+            threading.Thread(target=self.__work, name=f"task-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self.__workers:
+            worker.start()
+
+    def submit(self, fn, /, *args, priority: int = 0, **kwargs) -> Future:
+        future = Future()
+        self.__queue.put((priority, next(self.__counter), future, fn, args, kwargs))
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        if cancel_futures:
+            while True:
+                try:
+                    item = self.__queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item[2] is not None:
+                    item[2].cancel()
+
+        # sentinels sort after every queued call
+        for _ in self.__workers:
+            self.__queue.put((math.inf, next(self.__counter), None, None, None, None))
+        if wait:
+            for worker in self.__workers:
+                worker.join()
+
+    def __work(self):
+        while True:
+            _, _, future, fn, args, kwargs = self.__queue.get()
+            if future is None:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+class TaskScheduler(QObject):
+    """
+    Runs stages on an asyncio event loop owned by a background thread.
+
+    A stage is either a plain callable, run on a priority thread pool, or a
+    coroutine function, run on the loop, that may offload blocking work with
+    `run`. Stages name the stages they wait for with `after` and receive
+    their results, so a chain (load -> build mesh -> upload) is submitted at
+    once. Groups cap how many stages of a kind run at the same time, and the
+    pool serves interactive work before background work.
+
+    `on_started` and `on_complete` are called on the GUI thread, the latter
+    with the same `failed`, `error` and `results` dict as `ThreadManager`.
+    """
+
+    # callback and its argument, queued to the GUI thread
+    __delivered = Signal(object, object)
+
+    def __init__(self, opts: dict = None):
+        super().__init__()
+        if opts is None:
+            opts = {}
+
+        workers: int = opts.get("workers", TASK_WORKERS)
+        self.__limits: dict[str, int] = {**TASK_LIMITS, **opts.get("limits", {})}
+        self.__semaphores: dict[str, asyncio.Semaphore] = {}
+        self.__stages: dict[str, Future] = {}
+        # error of each forgotten stage, None when it succeeded, oldest first
+        self.__finished: collections.OrderedDict[str, str | None] = (
+            collections.OrderedDict()
+        )
+
+        self.__executor = PriorityExecutor(workers)
+        self.__loop = asyncio.new_event_loop()
+        self.__thread = threading.Thread(
+            target=self.__loop.run_forever, name="task-loop", daemon=True
+        )
+        self.__thread.start()
+
+        self.__delivered.connect(self.__onDelivered)
+
+    # region getters
+    def isRunning(self, stage_id: str) -> bool:
+        future = self.__stages.get(stage_id)
+        return future is not None and not future.done()
+
+    def pending(self) -> list[str]:
+        return [key for key, future in self.__stages.items() if not future.done()]
+
+    # endregion
+
+    # region workers
+    def submit(self, stage_id: str, task, opts: dict = None) -> Future:
+        """
+        Schedules a stage. An earlier stage with the same id keeps running,
+        stages submitted afterwards wait for the new one.
+
+        Parameters:
+            stage_id (str): Unique name of the stage, used by `after`.
+            task (callable): Called with `params` when given, followed by the
+                results of the stages in `after`, in order.
+            opts (dict): Optional settings
+                - params: first argument of the task.
+                - after (list[str]): stages to wait for, a failed one fails
+                  this stage too. A stage that already finished and was
+                  forgotten is not waited for, its result is passed as None,
+                  its failure or cancellation still carries over. Raises
+                  KeyError for a stage that was never submitted.
+                - priority (str | int): key of TASK_PRIORITIES or a number,
+                  lower runs first. Default "load".
+                - group (str): stages of a group share its TASK_LIMITS cap.
+                - on_started (callable): () on the GUI thread.
+                - on_complete (callable): (dict) on the GUI thread, not
+                  called for cancelled stages.
+
+        Returns:
+            Future: the result of the task.
+        """
+        if opts is None:
+            opts = {}
+
+        # resolved now, a stage finishing meanwhile cannot be forgotten yet
+        after = [self.__stage(key) for key in opts.get("after", [])]
+        priority = opts.get("priority", "load")
+        if isinstance(priority, str):
+            priority = TASK_PRIORITIES[priority]
+
+        coroutine = self.__run(stage_id, task, after, priority, opts)
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.__loop)
+        future.add_done_callback(
+            lambda f: self.__delivered.emit(self.__forget, (stage_id, f))
+        )
+        self.__stages[stage_id] = future
+        return future
+
+    async def run(self, fn, *args, priority: str | int = "load"):
+        "awaits a blocking call on the pool, for coroutine stages"
+        if isinstance(priority, str):
+            priority = TASK_PRIORITIES[priority]
+        return await asyncio.wrap_future(
+            self.__executor.submit(fn, *args, priority=priority)
+        )
+
+    def cancel(self, stage_id: str) -> bool:
+        "cancel a stage that has not finished, its dependents are cancelled too"
+        future = self.__stages.get(stage_id)
+        return future is not None and future.cancel()
+
+    def close(self):
+        for future in self.__stages.values():
+            future.cancel()
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __run(self, stage_id: str, task, after, priority: int, opts: dict):
+        on_started = opts.get("on_started", None)
+        on_complete = opts.get("on_complete", None)
+        res = {"failed": False, "error": None, "results": None}
+        try:
+            args = [] if opts.get("params") is None else [opts["params"]]
+            for dependency in after:
+                args.append(await asyncio.wrap_future(dependency))
+
+            async with self.__semaphore(opts.get("group", None)):
+                if on_started is not None:
+                    self.__delivered.emit(on_started, None)
+
+                if asyncio.iscoroutinefunction(task):
+                    res["results"] = await task(*args)
+                else:
+                    res["results"] = await self.run(
+                        self.__traced, stage_id, task, *args, priority=priority
+                    )
+        except Exception:
+            res["failed"] = True
+            res["error"] = f"Stage <{stage_id}> failed\n{traceback.format_exc()}"
+
+        if on_complete is not None:
+            self.__delivered.emit(on_complete, res)
+
+        if res["failed"]:
+            raise RuntimeError(res["error"])
+        return res["results"]
+
+    def __stage(self, stage_id: str) -> Future:
+        "the future of a stage, a done one with its outcome when it was forgotten"
+        future = self.__stages.get(stage_id)
+        if future is not None:
+            return future
+        if stage_id not in self.__finished:
+            raise KeyError(f"Unknown stage <{stage_id}>")
+
+        future = Future()
+        error = self.__finished[stage_id]
+        if error is None:
+            future.set_result(None)
+        elif error == _CANCELLED:
+            future.cancel()
+        else:
+            future.set_exception(RuntimeError(error))
+        return future
+
+    def __semaphore(self, group: str | None):
+        "created on the loop thread, groups without a limit share no cap"
+        if group is None or group not in self.__limits:
+            return _Unlimited()
+        if group not in self.__semaphores:
+            self.__semaphores[group] = asyncio.Semaphore(self.__limits[group])
+        return self.__semaphores[group]
+
+    def __forget(self, stage: tuple[str, Future]):
+        # finished stages do not keep their results alive
+        stage_id, future = stage
+        if self.__stages.get(stage_id) is not future:
+            return
+        self.__stages.pop(stage_id)
+
+        # only the outcome is kept, for stages naming this one in `after` later
+        if future.cancelled():
+            error = _CANCELLED
+        else:
+            exception = future.exception()
+            error = None if exception is None else str(exception)
+        self.__finished.pop(stage_id, None)
+        self.__finished[stage_id] = error
+        while len(self.__finished) > TASK_HISTORY:
+            self.__finished.popitem(last=False)
+
+    def __traced(self, stage_id: str, task, *args):
+        with trace_span(stage_id, "stage"):
+            return task(*args)
+
+    def __onDelivered(self, callback, arg):
+        with trace_span(getattr(callback, "__qualname__", "callback"), "gui"):
+            if arg is None:
+                callback()
+            else:
+                callback(arg)
+
+    # endregion
+
+
+# outcome recorded for a forgotten stage that was cancelled
+_CANCELLED = "cancelled"
+
+
+class _Unlimited:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        return False
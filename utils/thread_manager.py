@@ -1,5 +1,6 @@
 import models as models
 from .signal_bus import signalBus
+from .tracing import trace_span
 
 class ThreadManager:
     def __init__(self):
@@ -37,7 +38,8 @@ class ThreadManager:
                 "error": m.opts()["error"],
                 "results": m.opts()["results"],
             }
-            c_task(opts)
+            with trace_span(f"{pid} on_complete", "gui"):
+                c_task(opts)
 
         self.__unstage(pid)
 
@@ -58,7 +60,14 @@ class ThreadManager:
         """
         remove the thread from the active list
         """
-        self.__gc.append(self.__models.pop(id))
+        model = self.__models.pop(id)
+
+        # the results were handed over, do not keep them alive with the thread
+        model.setOpts({"results": None, "params": None})
+
+        # finished threads can be deleted, keep the ones still winding down
+        self.__gc = [m for m in self.__gc if m.isRunning()]
+        self.__gc.append(model)
 
     def kill(self, id:str):
         m = self.__models.get(id)
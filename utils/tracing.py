@@ -0,0 +1,147 @@
+import functools
+import json
+import os
+import threading
+import time
+
+# spans are only recorded while enabled, the checks below are all a disabled
+# trace costs
+_enabled = False
+_events: list[tuple] = []
+_threads: dict[int, str] = {}
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name: str, cat: str, args: dict | None):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_):
+        end = time.perf_counter_ns()
+        if _enabled:
+            _record("X", self.name, self.cat, self.start, end - self.start, self.args)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def _record(phase: str, name: str, cat: str, start: int, duration: int, args):
+    tid = threading.get_native_id()
+    if tid not in _threads:
+        _threads[tid] = threading.current_thread().name
+    # list.append is atomic, workers record without a lock
+    _events.append((phase, name, cat, start, duration, tid, args))
+
+
+def is_tracing() -> bool:
+    return _enabled
+
+
+def start_tracing():
+    "forget the previous recording and record spans from now on"
+    global _enabled
+    _events.clear()
+    _threads.clear()
+    _enabled = True
+
+
+def stop_tracing() -> int:
+    "stop recording, returns the number of events recorded"
+    global _enabled
+    _enabled = False
+    return len(_events)
+
+
+def trace_span(name: str, cat: str = "app", args: dict = None):
+    """
+    Context manager recording the time spent in its block on the calling
+    thread, a shared no-op when tracing is disabled.
+
+    Parameters:
+        name (str): Shown on the span.
+        cat (str): Category, trace viewers filter on it.
+        args (dict): Shown in the details of the span.
+    """
+    if not _enabled:
+        return _NO_SPAN
+    return _Span(name, cat, args)
+
+
+def trace_instant(name: str, cat: str = "app", args: dict = None):
+    "a zero length marker, e.g. a timer tick"
+    if _enabled:
+        _record("i", name, cat, time.perf_counter_ns(), 0, args)
+
+
+def traced(name: str = None, cat: str = "app"):
+    "decorator recording every call of a function as a span"
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, cat, None):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def write_chrome_trace(file: str) -> int:
+    """
+    Writes the recorded spans in the Chrome trace event format, opened by
+    chrome://tracing and Perfetto.
+
+    Returns:
+        int: Number of events written.
+    """
+    pid = os.getpid()
+    events = list(_events)
+    origin = min((e[3] for e in events), default=0)
+
+    trace = [
+        {"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": name}}
+        for tid, name in list(_threads.items())
+    ]
+    for phase, name, cat, start, duration, tid, args in events:
+        event = {
+            "ph": phase,
+            "name": name,
+            "cat": cat,
+            "ts": (start - origin) / 1000,  # microseconds
+            "pid": pid,
+            "tid": tid,
+        }
+        if phase == "X":
+            event["dur"] = duration / 1000
+        else:
+            event["s"] = "t"  # instant scoped to its thread
+        if args:
+            event["args"] = args
+        trace.append(event)
+
+    with open(file, "w") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+    return len(events)
@@ -91,6 +91,18 @@ DEPTH_DETAIL_LEVELS = [
     },
 ]
 
+# geometry the frames are mapped onto
+GEOMETRY_VIEWS = [
+    {
+        "name": "Slab",
+        "value": "slab",
+    },
+    {
+        "name": "Annulus",
+        "value": "annulus",
+    },
+]
+
 FLUIDS = {
     "mud": {
         "name": "Mud",
@@ -121,4 +133,132 @@ PROGESS_BAR_STYLE = """
         background-color: orange;
     }
 
-"""
\ No newline at end of file
+"""
+FRAME_STORE_FORMAT = "gap-thickness-plot/frame-store"
+FRAME_STORE_VERSION = 1
+
+LOG_LEVEL_RANKS = {
+    "debug": 0,
+    "message": 1,
+    "info": 1,
+    "event": 1,
+    "success": 2,
+    "warning": 3,
+    "error": 4,
+}
+
+LOG_LEVELS = [
+    {
+        "name": "Debug",
+        "value": "debug",
+    },
+    {
+        "name": "Info",
+        "value": "event",
+    },
+    {
+        "name": "Warning",
+        "value": "warning",
+    },
+    {
+        "name": "Error",
+        "value": "error",
+    },
+]
+
+# distance along Y between the slabs of runs compared side by side
+COMPARISON_SPACING = 1.5
+
+OVERVIEW_VERSION = 1
+
+STATISTICS_VERSION = 1
+
+PROBE_INDEX_VERSION = 2
+
+SESSION_VERSION = 1
+
+# configuration keys restored from the previous session
+SESSION_KEYS = [
+    "data_file",
+    "thickness_profile",
+    "base_thickness",
+    "depth_detail_level",
+    "view",
+    "roi_tmd",
+    "roi_bmd",
+    "draw_edges",
+    "draw_faces",
+    "frame_index",
+    "memory_budget_mb",
+    "playback_speed",
+]
+
+# video export, keyed by file extension
+EXPORT_FORMATS = {
+    ".mp4": {
+        "name": "MP4 video",
+        "encoder": "ffmpeg",
+        "args": ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-preset", "fast", "-crf", "18"],
+    },
+    ".webm": {
+        "name": "WebM video",
+        "encoder": "ffmpeg",
+        "args": ["-c:v", "libvpx-vp9", "-pix_fmt", "yuv420p", "-b:v", "0", "-crf", "32"],
+    },
+    ".png": {
+        "name": "Animated PNG",
+        "encoder": "png",
+        "args": [],
+    },
+    ".gif": {
+        "name": "GIF",
+        "encoder": "gif",
+        "args": [],
+    },
+}
+
+EXPORT_FPS = 30
+EXPORT_QUEUE_SIZE = 4  # frames read back ahead of the encoder
+
+# remote viewing, see serve.py
+RENDER_SERVICE_PORT = 8765
+RENDER_FRAME_ENCODINGS = ["delta", "png", "webp"]
+
+# polling interval of a run still being written
+WATCH_INTERVAL = 2000  # ms
+
+# a Chrome trace of the session is written to this path when set
+TRACE_ENV = "GAP_TRACE"
+
+# memory budget of the loaded runs
+MEMORY_BUDGET_MB = 2048
+MEMORY_REFRESH_INTERVAL = 1000  # ms
+
+# task scheduler, lower priorities are served first
+TASK_WORKERS = 4
+TASK_PRIORITIES = {
+    "interactive": 0,
+    "load": 1,
+    "background": 2,
+}
+# stages of a group running at the same time
+TASK_LIMITS = {
+    "draw": 2,
+    "load": 1,
+    "background": 1,
+    "prefetch": 2,
+    "export": 1,
+}
+# outcomes of finished stages remembered for later `after` references
+TASK_HISTORY = 256
+
+# frames prepared ahead of playback
+PREFETCH_DEPTH = 8
+PREFETCH_CAPACITY = 64
+PREFETCH_IDLE_S = 1.0  # navigation pauses longer than this prefetch both ways
+
+# playback, in simulation seconds per wall second
+PLAYBACK_SPEED = 1.0
+PLAYBACK_SPEED_RANGE = (0.1, 50.0)
+PLAYBACK_FALLBACK_STEP = 1.0  # simulation seconds between records without timesave.h5
+PLAYBACK_BLEND_STEP = 1 / 32  # smallest blend change worth a redraw
@@ -0,0 +1,193 @@
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+import numpy as np
+
+from .variables import EXPORT_FORMATS
+
+
+class VideoWriter:
+    """
+    Writes (h, w, 3) uint8 frames to a video file, the format follows the
+    extension (see `EXPORT_FORMATS`).
+
+    MP4 and WebM are streamed to an `ffmpeg` process found on the PATH.
+    Animated PNG and GIF are written with Pillow when the writer is closed.
+    """
+
+    def __init__(self, file: str, opts: dict = None):
+        if opts is None:
+            opts = {}
+
+        ext = os.path.splitext(file)[1].lower()
+        if ext not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Unsupported export format <{ext}>, expected one of {list(EXPORT_FORMATS)}"
+            )
+
+        self.__file = file
+        self.__format = EXPORT_FORMATS[ext]
+        self.__fps: float = opts.get("fps", 30)
+        self.__size: tuple[int, int] | None = None
+        self.__process: subprocess.Popen | None = None
+        self.__images = []
+        self.__frames = 0
+
+        if self.__format["encoder"] == "ffmpeg" and shutil.which("ffmpeg") is None:
+            raise RuntimeError(
+                f"ffmpeg was not found on the PATH, it is required for {ext} exports"
+            )
+
+    # region getters
+    def file(self) -> str:
+        return self.__file
+
+    def frames(self) -> int:
+        return self.__frames
+
+    # endregion
+
+    # region workers
+    def __open(self, width: int, height: int):
+        "start ffmpeg once the frame size is known"
+        self.__process = subprocess.Popen(
+            [
+                "ffmpeg",
+                "-y",
+                "-loglevel",
+                "error",
+                "-f",
+                "rawvideo",
+                "-pix_fmt",
+                "rgb24",
+                "-s",
+                f"{width}x{height}",
+                "-r",
+                str(self.__fps),
+                "-i",
+                "-",
+                *self.__format["args"],
+                self.__file,
+            ],
+            stdin=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+    def write(self, frame: np.ndarray):
+        if self.__size is None:
+            # yuv420p needs even dimensions
+            h, w = frame.shape[:2]
+            self.__size = (w - w % 2, h - h % 2)
+            if self.__format["encoder"] == "ffmpeg":
+                self.__open(*self.__size)
+
+        w, h = self.__size
+        frame = np.ascontiguousarray(frame[:h, :w, :3], dtype=np.uint8)
+
+        if self.__format["encoder"] == "ffmpeg":
+            self.__process.stdin.write(frame.data)
+        else:
+            from PIL import Image  # deferred, only needed for image exports
+
+            image = Image.fromarray(frame)
+            if self.__format["encoder"] == "gif":
+                image = image.quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+            self.__images.append(image)
+
+        self.__frames += 1
+
+    def close(self):
+        "finish the file, blocks until the encoder is done"
+        if self.__process is not None:
+            self.__process.stdin.close()
+            error = self.__process.stderr.read().decode(errors="replace")
+            if self.__process.wait() != 0:
+                raise RuntimeError(f"ffmpeg failed: {error.strip()}")
+            self.__process = None
+
+        elif len(self.__images) > 0:
+            images = self.__images
+            self.__images = []
+            images[0].save(
+                self.__file,
+                format=self.__format["encoder"].upper(),
+                save_all=True,
+                append_images=images[1:],
+                duration=int(round(1000 / self.__fps)),
+                loop=0,
+            )
+
+    # endregion
+
+
+class FrameEncoder:
+    """
+    Feeds a `VideoWriter` from a background thread through a bounded queue.
+
+    `put` only blocks while the queue is full, so the producer runs ahead of
+    the encoder by at most `queue_size` frames and the export runs at the
+    pace of the encoder.
+    """
+
+    def __init__(self, writer: VideoWriter, opts: dict = None):
+        if opts is None:
+            opts = {}
+
+        self.__writer = writer
+        self.__queue: queue.Queue = queue.Queue(maxsize=opts.get("queue_size", 4))
+        self.__error: BaseException | None = None
+        self.__stats = {"frames": 0, "encode_s": 0.0, "wait_s": 0.0}
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    # region getters
+    def stats(self) -> dict:
+        "frames, encode_s (encoder busy) and wait_s (producer blocked on a full queue)"
+        return dict(self.__stats)
+
+    def error(self) -> BaseException | None:
+        return self.__error
+
+    # endregion
+
+    # region workers
+    def __run(self):
+        while True:
+            frame = self.__queue.get()
+            if frame is None:
+                break
+            if self.__error is not None:
+                continue  # drain, the export already failed
+
+            start = time.perf_counter()
+            try:
+                self.__writer.write(frame)
+                self.__stats["frames"] += 1
+            except BaseException as e:
+                self.__error = e
+            self.__stats["encode_s"] += time.perf_counter() - start
+
+    def put(self, frame: np.ndarray):
+        if self.__error is not None:
+            raise self.__error
+
+        start = time.perf_counter()
+        self.__queue.put(frame)
+        self.__stats["wait_s"] += time.perf_counter() - start
+
+    def close(self) -> dict:
+        "encode the queued frames and finish the file, returns the stats"
+        self.__queue.put(None)
+        self.__thread.join()
+        if self.__error is not None:
+            raise self.__error
+
+        start = time.perf_counter()
+        self.__writer.close()
+        self.__stats["encode_s"] += time.perf_counter() - start
+        return self.stats()
+
+    # endregion